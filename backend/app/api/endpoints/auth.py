@@ -5,8 +5,10 @@ from fastapi import APIRouter, HTTPException, Request, Depends
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel, EmailStr
 from typing import Dict, Optional
+from uuid import UUID
 import os
 import sys
+import asyncpg
 
 # Add the project root to the path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -14,13 +16,36 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from app.models.user_model.postgres_auth_service import (
     PostgreSQLAuthService, UserRegistration, UserLogin, get_auth_service, postgres_auth_service
 )
-from app.core.config import settings
+from app.models.user_model.password_hasher import password_hasher
 
 router = APIRouter()
 
 # Global auth service instance
 auth_service = postgres_auth_service
 
+# Retries when a concurrent signup grabs the username we picked
+USERNAME_ALLOCATION_ATTEMPTS = 3
+
+
+async def _allocate_username(conn, base: str) -> str:
+    """
+    Pick a free username in one query: the base itself if unused, otherwise
+    base followed by one more than the highest numeric suffix in use.
+    """
+    escaped = base.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    row = await conn.fetchrow(r"""
+        SELECT COALESCE(bool_or(username = $1), FALSE) AS base_taken,
+               COALESCE(MAX(NULLIF(substring(username FROM char_length($1) + 1), '')::bigint), 0) AS max_suffix
+        FROM users
+        WHERE username LIKE $2 ESCAPE '\'
+          AND substring(username FROM char_length($1) + 1) ~ '^[0-9]{0,18}$'
+    """, base, escaped + '%')
+
+    if not row['base_taken']:
+        return base
+    return f"{base}{row['max_suffix'] + 1}"
+
+
 class LoginRequest(BaseModel):
     email: EmailStr
     password: str
@@ -36,68 +61,65 @@ class APIKeysRequest(BaseModel):
     anthropic: Optional[str] = None
     google: Optional[str] = None
 
-def get_user_from_request(request: Request) -> Optional[Dict]:
+def _client_host(request: Request) -> Optional[str]:
+    return request.client.host if request.client else None
+
+
+async def get_user_from_request(request: Request) -> Optional[Dict]:
     """Extract user from request token"""
     auth_header = request.headers.get("Authorization")
     if not auth_header or not auth_header.startswith("Bearer "):
         return None
     
     token = auth_header.split(" ")[1]
-    return auth_service.get_user_by_token(token)
+    return await auth_service.get_user_by_token(token)
 
 @router.post("/register")
-async def register(request: RegisterRequest):
+async def register(request: RegisterRequest, http_request: Request):
     """Register a new user - simplified for existing schema"""
     try:
-        import bcrypt
-        import jwt
-        from datetime import datetime, timedelta
-        import asyncpg
-
-        # Connect to database using environment variables
-        conn = await asyncpg.connect(
-            host=settings.DATABASE_HOST,
-            port=int(settings.DATABASE_PORT),
-            user=settings.DATABASE_USER,
-            password=settings.DATABASE_PASSWORD,
-            database=settings.DATABASE_NAME,
-            ssl='require'
-        )
+        from datetime import datetime
 
-        try:
+        # Borrow a connection from the auth service's shared pool
+        pool = await auth_service.get_connection_pool()
+        async with pool.acquire() as conn:
             # Check if email exists
             existing = await conn.fetchval("SELECT id FROM users WHERE email = $1", request.email)
             if existing:
                 raise HTTPException(status_code=400, detail="Email already registered")
 
             # Hash password
-            password_hash = bcrypt.hashpw(request.password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
-
-            # Generate username from email
-            username = request.email.split('@')[0]
-            # Make username unique if needed
-            counter = 1
-            while await conn.fetchval("SELECT id FROM users WHERE username = $1", username):
-                username = f"{request.email.split('@')[0]}{counter}"
-                counter += 1
-
-            # Insert user
-            user_id = await conn.fetchval("""
-                INSERT INTO users (
-                    username, email, password_hash, full_name,
-                    role, is_active, is_verified, is_superuser,
-                    failed_login_attempts, created_at, updated_at
-                ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
-                RETURNING id
-            """, username, request.email, password_hash, request.full_name,
-                'STUDENT', True, False, False, 0, datetime.utcnow(), datetime.utcnow())
-
-            # Create JWT token
-            token = jwt.encode({
-                'user_id': user_id,
-                'email': request.email,
-                'exp': datetime.utcnow() + timedelta(hours=24)
-            }, settings.JWT_SECRET_KEY, algorithm='HS256')
+            password_hash = await password_hasher.hash(request.password)
+
+            # Generate a unique username from the email; a concurrent signup
+            # can still take the same name, so retry on the unique violation
+            base_username = request.email.split('@')[0]
+            user_id = auth_service.generate_user_id()
+            for attempt in range(USERNAME_ALLOCATION_ATTEMPTS):
+                username = await _allocate_username(conn, base_username)
+                try:
+                    # Insert user
+                    await conn.execute("""
+                        INSERT INTO users (
+                            user_id, username, email, password_hash, full_name,
+                            role, is_active, is_verified, is_superuser,
+                            failed_login_attempts, created_at, updated_at
+                        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
+                    """, UUID(user_id), username, request.email, password_hash, request.full_name,
+                        'STUDENT', True, False, False, 0, datetime.utcnow(), datetime.utcnow())
+                    break
+                except asyncpg.UniqueViolationError as e:
+                    if 'email' in (e.constraint_name or '') or 'email' in str(e):
+                        raise HTTPException(status_code=400, detail="Email already registered")
+                    if attempt == USERNAME_ALLOCATION_ATTEMPTS - 1:
+                        raise
+
+            # Issue the token with its server-side session (keyed by the
+            # UUID user_id, which is what get_user_by_token resolves)
+            token, _ = await auth_service.create_session(
+                conn, user_id, request.email,
+                _client_host(http_request), http_request.headers.get("user-agent")
+            )
 
             return JSONResponse(
                 status_code=201,
@@ -105,7 +127,7 @@ async def register(request: RegisterRequest):
                     "success": True,
                     "message": "Registration successful",
                     "user": {
-                        "user_id": str(user_id),
+                        "user_id": user_id,
                         "email": request.email,
                         "full_name": request.full_name,
                         "username": username
@@ -114,9 +136,6 @@ async def register(request: RegisterRequest):
                 }
             )
 
-        finally:
-            await conn.close()
-
     except HTTPException:
         raise
     except Exception as e:
@@ -126,28 +145,17 @@ async def register(request: RegisterRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/login")
-async def login(request: LoginRequest):
+async def login(request: LoginRequest, http_request: Request):
     """Authenticate user - simplified for existing schema"""
     try:
-        import bcrypt
-        import jwt
-        from datetime import datetime, timedelta
-        import asyncpg
-
-        # Connect to database using environment variables
-        conn = await asyncpg.connect(
-            host=settings.DATABASE_HOST,
-            port=int(settings.DATABASE_PORT),
-            user=settings.DATABASE_USER,
-            password=settings.DATABASE_PASSWORD,
-            database=settings.DATABASE_NAME,
-            ssl='require'
-        )
+        from datetime import datetime
 
-        try:
+        # Borrow a connection from the auth service's shared pool
+        pool = await auth_service.get_connection_pool()
+        async with pool.acquire() as conn:
             # Get user by email
             user = await conn.fetchrow("""
-                SELECT id, email, password_hash, full_name, username, role
+                SELECT id, user_id, email, password_hash, full_name, username, role
                 FROM users
                 WHERE email = $1 AND is_active = TRUE
             """, request.email)
@@ -155,21 +163,30 @@ async def login(request: LoginRequest):
             if not user:
                 raise HTTPException(status_code=401, detail="Invalid email or password")
 
-            # Verify password
-            if not bcrypt.checkpw(request.password.encode('utf-8'), user['password_hash'].encode('utf-8')):
+            # Verify password (and upgrade the hash if the work factor changed)
+            valid, new_hash = await password_hasher.verify_and_update(
+                request.password, user['password_hash']
+            )
+            if not valid:
                 raise HTTPException(status_code=401, detail="Invalid email or password")
 
             # Update last login
-            await conn.execute("""
-                UPDATE users SET last_login = $1 WHERE id = $2
-            """, datetime.utcnow(), user['id'])
-
-            # Create JWT token
-            token = jwt.encode({
-                'user_id': user['id'],
-                'email': user['email'],
-                'exp': datetime.utcnow() + timedelta(hours=24)
-            }, settings.JWT_SECRET_KEY, algorithm='HS256')
+            if new_hash:
+                await conn.execute("""
+                    UPDATE users SET last_login = $1, password_hash = $2 WHERE id = $3
+                """, datetime.utcnow(), new_hash, user['id'])
+            else:
+                await conn.execute("""
+                    UPDATE users SET last_login = $1 WHERE id = $2
+                """, datetime.utcnow(), user['id'])
+
+            # Issue the token with its server-side session
+            user_id = str(user['user_id'])
+            auth_service.invalidate_user(user_id)
+            token, _ = await auth_service.create_session(
+                conn, user_id, user['email'],
+                _client_host(http_request), http_request.headers.get("user-agent")
+            )
 
             return JSONResponse(
                 status_code=200,
@@ -177,7 +194,7 @@ async def login(request: LoginRequest):
                     "success": True,
                     "message": "Login successful",
                     "user": {
-                        "user_id": str(user['id']),
+                        "user_id": user_id,
                         "email": user['email'],
                         "full_name": user['full_name'],
                         "username": user['username']
@@ -186,9 +203,6 @@ async def login(request: LoginRequest):
                 }
             )
 
-        finally:
-            await conn.close()
-
     except HTTPException:
         raise
     except Exception as e:
@@ -200,13 +214,13 @@ async def login(request: LoginRequest):
 @router.get("/profile")
 async def get_profile(request: Request):
     """Get current user profile"""
-    user = get_user_from_request(request)
+    user = await get_user_from_request(request)
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
     try:
         # Get additional user info
-        full_user = auth_service.get_user_by_token(
+        full_user = await auth_service.get_user_by_token(
             request.headers.get("Authorization", "").replace("Bearer ", "")
         )
         
@@ -214,7 +228,7 @@ async def get_profile(request: Request):
             raise HTTPException(status_code=401, detail="Invalid token")
         
         # Get API keys status
-        api_keys = auth_service.get_user_api_keys(full_user['user_id'])
+        api_keys = await auth_service.get_user_api_keys(full_user['user_id'])
         api_status = {
             "openai": bool(api_keys.get('openai')),
             "anthropic": bool(api_keys.get('anthropic')),
@@ -222,7 +236,7 @@ async def get_profile(request: Request):
         }
         
         # Get user courses
-        courses = auth_service.get_user_courses(full_user['user_id'], limit=10)
+        courses = await auth_service.get_user_courses(str(full_user['user_id']), limit=10)
         
         return {
             "user_id": full_user['user_id'],
@@ -243,7 +257,7 @@ async def get_profile(request: Request):
 @router.post("/api-keys")
 async def update_api_keys(request: Request, api_keys: APIKeysRequest):
     """Update user's API keys"""
-    user = get_user_from_request(request)
+    user = await get_user_from_request(request)
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
@@ -256,7 +270,7 @@ async def update_api_keys(request: Request, api_keys: APIKeysRequest):
         if api_keys.google:
             keys_to_update['google'] = api_keys.google
         
-        success = auth_service.update_user_api_keys(user['user_id'], keys_to_update)
+        success = await auth_service.update_user_api_keys(user['user_id'], keys_to_update)
         
         if success:
             return {"success": True, "message": "API keys updated successfully"}
@@ -269,12 +283,12 @@ async def update_api_keys(request: Request, api_keys: APIKeysRequest):
 @router.get("/api-keys")
 async def get_api_keys(request: Request):
     """Get user's API keys (masked for security)"""
-    user = get_user_from_request(request)
+    user = await get_user_from_request(request)
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
     try:
-        api_keys = auth_service.get_user_api_keys(user['user_id'])
+        api_keys = await auth_service.get_user_api_keys(user['user_id'])
         
         # Mask the keys for security (show only first 8 chars)
         masked_keys = {}
@@ -297,12 +311,12 @@ async def get_api_keys(request: Request):
 @router.get("/courses")
 async def get_user_courses(request: Request, limit: int = 20):
     """Get user's courses"""
-    user = get_user_from_request(request)
+    user = await get_user_from_request(request)
     if not user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
     try:
-        courses = auth_service.get_user_courses(user['user_id'], limit)
+        courses = await auth_service.get_user_courses(str(user['user_id']), limit)
         return {"courses": courses}
         
     except Exception as e:
@@ -312,10 +326,12 @@ async def get_user_courses(request: Request, limit: int = 20):
 async def logout(request: Request):
     """Logout user"""
     try:
-        # For JWT tokens, we can't really "logout" server-side
-        # In a production app, you'd want to maintain a blacklist
-        # For now, we'll just return success and let the client clear the token
-        
+        # Revoke the server-side session so the token stops validating;
+        # the client still clears its copy
+        auth_header = request.headers.get("Authorization")
+        if auth_header and auth_header.startswith("Bearer "):
+            await auth_service.revoke_token(auth_header.split(" ")[1])
+
         return {"success": True, "message": "Logged out successfully"}
         
     except Exception as e:
@@ -324,7 +340,7 @@ async def logout(request: Request):
 @router.get("/verify")
 async def verify_token(request: Request):
     """Verify if token is valid"""
-    user = get_user_from_request(request)
+    user = await get_user_from_request(request)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
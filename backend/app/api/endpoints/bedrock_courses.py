@@ -4,9 +4,10 @@ FastAPI routes for AI-powered course generation using AWS Bedrock
 """
 import sys
 import os
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import JSONResponse
-from typing import List, Dict, Optional
+import json
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Dict, Optional, AsyncGenerator
 from pydantic import BaseModel, Field
 
 # Import course generation models
@@ -17,10 +18,23 @@ from app.models.course_model.course_models import (
     CourseStatus, AccessType
 )
 from app.models.course_model.course_repository import CourseRepository
+from app.models.course_model.course_jobs import course_job_runner, JobStatus
 
 router = APIRouter()
 
 
+@router.on_event("startup")
+async def start_course_job_runner():
+    """Start background generation workers and resume unfinished jobs"""
+    await course_job_runner.start()
+
+
+@router.on_event("shutdown")
+async def stop_course_job_runner():
+    """Stop workers; in-flight jobs go back to the queue for the next start"""
+    await course_job_runner.stop()
+
+
 # Response models
 class CourseGenerationResponse(BaseModel):
     """Response model for course generation"""
@@ -140,6 +154,130 @@ async def generate_bedrock_course(
         )
 
 
+async def _stream_course_events(
+    http_request: Request,
+    generator: BedrockCourseGenerator,
+    request: CourseRequest
+) -> AsyncGenerator[str, None]:
+    """Relay generator progress events to the client as Server-Sent Events"""
+    events = generator.generate_course_stream(request)
+    try:
+        async for event in events:
+            if await http_request.is_disconnected():
+                print(f"🔌 Client disconnected, cancelling generation for: {request.topic}")
+                return
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+
+        yield f"data: {json.dumps({'type': 'done'})}\n\n"
+
+    except Exception as e:
+        print(f"Streamed course generation error: {e}")
+        import traceback
+        traceback.print_exc()
+        yield f"data: {json.dumps({'type': 'error', 'message': str(e)})}\n\n"
+
+    finally:
+        # Closing the generator cancels any module still being generated
+        await events.aclose()
+
+
+@router.post("/generate/stream")
+async def generate_bedrock_course_stream(request: CourseRequest, http_request: Request):
+    """
+    Generate a new course and stream progress as Server-Sent Events
+
+    Emits the outline first, then each module as soon as it is ready, then the
+    synthesis result (if enabled) and finally the saved course id. Accepts the
+    same body as `/generate`.
+    """
+    print(f"🎬 Streamed course generation started for: {request.topic}")
+
+    generator = BedrockCourseGenerator()
+
+    return StreamingResponse(
+        _stream_course_events(http_request, generator, request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
+
+
+# Background generation jobs
+@router.post("/jobs", status_code=202)
+async def create_generation_job(request: CourseRequest):
+    """
+    Queue a course for background generation
+
+    Returns immediately with a job id. Each finished stage is checkpointed,
+    so the job survives client disconnects and server restarts. Poll
+    `/jobs/{job_id}` for progress and `/jobs/{job_id}/result` for the course.
+    """
+    try:
+        job = await course_job_runner.submit(request)
+        print(f"📥 Queued course generation job {job['job_id']} for: {request.topic}")
+
+        return {
+            **job,
+            "status_url": f"/courses/bedrock/jobs/{job['job_id']}",
+            "result_url": f"/courses/bedrock/jobs/{job['job_id']}/result"
+        }
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to queue generation job: {str(e)}")
+
+
+@router.get("/jobs/{job_id}")
+async def get_generation_job(job_id: str):
+    """Get status and stage progress of a generation job"""
+    job = await course_job_runner.store.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return {
+        "job_id": job['job_id'],
+        "course_id": job['course_id'],
+        "status": job['status'],
+        "stage": job['stage'],
+        "modules_total": job['modules_total'],
+        "modules_completed": job['modules_completed'],
+        "outline_ready": job.get('outline') is not None,
+        "attempts": job['attempts'],
+        "error": job['error'],
+        "created_at": job['created_at'],
+        "updated_at": job['updated_at'],
+        "completed_at": job['completed_at']
+    }
+
+
+@router.get("/jobs/{job_id}/result")
+async def get_generation_job_result(job_id: str):
+    """Get the generated course of a completed job"""
+    job = await course_job_runner.store.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    if job['status'] == JobStatus.FAILED:
+        raise HTTPException(status_code=500, detail=f"Job failed: {job['error']}")
+
+    if job['status'] != JobStatus.COMPLETED:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Job is {job['status']} (stage: {job['stage']}), result not ready yet"
+        )
+
+    course = await CourseRepository().get_course(job['course_id'])
+    if not course:
+        raise HTTPException(status_code=404, detail="Course for this job not found")
+
+    return {
+        "success": True,
+        "job_id": job_id,
+        "course": course
+    }
+
+
 @router.post("/generate-test", response_model=CourseGenerationResponse)
 async def generate_test_course():
     """
@@ -429,30 +567,30 @@ async def bedrock_health_check():
 async def search_bedrock_courses(
     query: str,
     level: Optional[str] = None,
-    limit: int = 20
+    limit: int = 20,
+    offset: int = 0
 ):
     """
-    Search Bedrock-generated courses
+    Ranked full-text search over Bedrock-generated courses
+
+    Supports web-search syntax ("quoted phrases", OR, -exclusions). Results
+    are ordered by relevance and paginated with `limit` (max 100) and `offset`.
     """
     try:
         repo = CourseRepository()
 
-        filters = {}
+        filters = {'uses_bedrock': True}
         if level:
             filters['level'] = level
 
-        courses = await repo.search_courses(query, filters)
-
-        # Filter for Bedrock-generated courses
-        bedrock_courses = [
-            course for course in courses
-            if course.get('metadata', {}).get('uses_bedrock', False)
-        ][:limit]
+        bedrock_courses = await repo.search_courses(query, filters, limit=limit, offset=offset)
 
         return {
             "query": query,
             "results": bedrock_courses,
-            "count": len(bedrock_courses)
+            "count": len(bedrock_courses),
+            "limit": limit,
+            "offset": offset
         }
 
     except Exception as e:
@@ -474,20 +612,15 @@ async def list_bedrock_courses(
         repo = CourseRepository()
         skip = (page - 1) * limit
 
-        # Get courses from repository
-        courses = await repo.list_courses(
+        # Get Bedrock-generated course summaries from repository
+        bedrock_courses = await repo.list_courses(
             skip=skip,
             limit=limit,
             status=status,
-            level=level
+            level=level,
+            uses_bedrock=True
         )
 
-        # Filter for Bedrock-generated courses
-        bedrock_courses = [
-            course for course in courses
-            if course.get('metadata', {}).get('uses_bedrock', False)
-        ]
-
         return CourseListResponse(
             courses=bedrock_courses,
             total_count=len(bedrock_courses),
@@ -1,14 +1,14 @@
 """Content Items API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi.responses import FileResponse, RedirectResponse, Response
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from pathlib import Path
 import boto3
 from botocore.exceptions import ClientError
 import os
 
-from app.core.database import get_db
+from app.core.database import get_async_db
 from app.core.config import settings
 from app.crud.content_items import (
     get_content_items, 
@@ -29,16 +29,16 @@ router = APIRouter()
 
 
 @router.get("/stats", response_model=ContentItemStatsResponse)
-async def get_stats(db: Session = Depends(get_db)):
+async def get_stats(db: AsyncSession = Depends(get_async_db)):
     """Get content items statistics"""
-    stats = get_content_items_stats(db)
+    stats = await get_content_items_stats(db)
     return ContentItemStatsResponse(**stats)
 
 
 @router.get("/formats", response_model=ContentItemFormatsResponse)
-async def get_formats(db: Session = Depends(get_db)):
+async def get_formats(db: AsyncSession = Depends(get_async_db)):
     """Get available formats and categories"""
-    data = get_available_formats_and_categories(db)
+    data = await get_available_formats_and_categories(db)
     return ContentItemFormatsResponse(**data)
 
 
@@ -49,7 +49,7 @@ async def get_resources(
     category: Optional[str] = Query(None),
     format: Optional[str] = Query(None),  # Maps to content_type
     resource_type: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get paginated list of content items"""
     skip = (page - 1) * limit
@@ -57,7 +57,7 @@ async def get_resources(
     # Map format to content_type
     content_type = format.lower() if format and format != "URL" else None
     
-    items = get_content_items(
+    items = await get_content_items(
         db, 
         skip=skip, 
         limit=limit, 
@@ -99,10 +99,10 @@ async def get_resources(
 @router.post("/resources/search", response_model=ContentItemsListResponse)
 async def search_resources(
     search_request: ContentItemSearchRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Search content items with filters"""
-    items, total = search_content_items(db, search_request)
+    items, total = await search_content_items(db, search_request)
     
     # Convert to response format with computed properties
     resources = []
@@ -134,9 +134,9 @@ async def search_resources(
 
 
 @router.get("/resources/{item_id}", response_model=ContentItemResponse)
-async def get_resource(item_id: int, db: Session = Depends(get_db)):
+async def get_resource(item_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a single content item by ID"""
-    item = get_content_item_by_id(db, item_id)
+    item = await get_content_item_by_id(db, item_id)
     if not item:
         raise HTTPException(status_code=404, detail="Content item not found")
     
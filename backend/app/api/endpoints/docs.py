@@ -1,10 +1,13 @@
 """API endpoints for docs content management."""
 
 import io
+import tempfile
 import zipfile
-from fastapi import APIRouter, HTTPException, Depends
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from typing import List
+from typing import List, Literal, Optional
 
 from app.models.docs_model import (
     DocSection,
@@ -15,8 +18,16 @@ from app.models.docs_model import (
     CreateDocRequest,
     UpdateDocRequest,
     SyncResponse,
-    DocsService
+    DocReferencesResponse,
+    ImportResponse,
+    DocsService,
+    ConflictError,
+    ArchiveError,
+    ArchiveTooLargeError,
+    iter_export,
+    import_archive
 )
+from app.models.docs_model.vault_archive import MEDIA_TYPES
 from app.core.config import settings
 
 router = APIRouter(prefix="/docs", tags=["docs"])
@@ -26,7 +37,8 @@ def get_docs_service() -> DocsService:
     """Dependency injection for DocsService."""
     return DocsService(
         vault_path=settings.VAULT_WEB_PATH,
-        public_path=settings.FRONTEND_PUBLIC_CONTENT_PATH
+        public_path=settings.FRONTEND_PUBLIC_CONTENT_PATH,
+        extra_vault_paths=settings.VAULT_EXTRA_PATHS
     )
 
 
@@ -36,15 +48,18 @@ def get_docs_service() -> DocsService:
 
 @router.post("/sync", response_model=SyncResponse)
 async def sync_all_docs(
+    dry_run: bool = Query(False, description="Only report what would change"),
     service: DocsService = Depends(get_docs_service)
 ):
     """
     Sync all sections to frontend/public.
 
-    Regenerates manifests and copies files.
+    Copies changed files, removes deleted entries and updates manifests.
+    With dry_run=true, returns the added/updated/removed entries without
+    writing anything.
     """
     try:
-        return service.sync_all()
+        return service.sync_all(dry_run=dry_run)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -52,19 +67,145 @@ async def sync_all_docs(
 @router.post("/sync/{section}", response_model=SyncResponse)
 async def sync_section(
     section: DocSection,
+    dry_run: bool = Query(False, description="Only report what would change"),
     service: DocsService = Depends(get_docs_service)
 ):
     """
     Sync a specific section to frontend/public.
 
-    Regenerates manifest and copies files for one section.
+    Copies changed files and updates the manifest for one section.
     """
     try:
-        return service.sync_section(section)
+        return service.sync_section(section, dry_run=dry_run)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# ================================================================
+# BULK Endpoints (must come before parameterized routes)
+# ================================================================
+
+@router.get("/export")
+async def export_docs(
+    sections: Optional[List[DocSection]] = Query(None, description="Sections to export (default: all)"),
+    format: Literal["tar.gz", "tar.zst"] = "tar.gz",
+    service: DocsService = Depends(get_docs_service)
+):
+    """
+    Download whole sections (or the whole vault) as one archive.
+
+    The archive is streamed as it is built, one file at a time.
+    """
+    selected = sections or list(DocSection)
+    label = selected[0].value if len(selected) == 1 else "vault"
+    filename = f"{label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{format}"
+
+    try:
+        chunks = iter_export(service, selected, format)
+    except ArchiveError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return StreamingResponse(
+        chunks,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+@router.post("/import", response_model=ImportResponse)
+async def import_docs(
+    request: Request,
+    dry_run: bool = Query(False, description="Validate and diff without applying"),
+    service: DocsService = Depends(get_docs_service)
+):
+    """
+    Import a tar.gz/tar.zst archive of `<section>/<doc_id>/...` entries.
+
+    Send the archive as the raw request body. Every entry is validated
+    first; if any is invalid nothing is applied. Entries in the archive
+    replace the vault copy as a whole; others are left alone.
+    """
+    max_bytes = settings.VAULT_IMPORT_MAX_BYTES
+
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as upload:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise HTTPException(status_code=413, detail=f"Archive larger than {max_bytes} bytes")
+            upload.write(chunk)
+        upload.seek(0)
+
+        try:
+            return await run_in_threadpool(
+                import_archive, service, upload,
+                dry_run=dry_run, workers=settings.VAULT_IMPORT_WORKERS,
+                max_extracted_bytes=settings.VAULT_IMPORT_MAX_EXTRACTED_BYTES,
+                max_members=settings.VAULT_IMPORT_MAX_MEMBERS
+            )
+        except ArchiveTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        except ArchiveError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+
+# ================================================================
+# DEPENDENCY GRAPH Endpoints (must come before parameterized routes)
+# ================================================================
+
+@router.get("/graph/broken", response_model=DocReferencesResponse)
+async def broken_references(
+    service: DocsService = Depends(get_docs_service)
+):
+    """
+    List references that don't resolve to any doc.
+
+    E.g. a workflow naming a skill that isn't in the vault.
+    """
+    references = service.dependency_graph.broken_references()
+    return DocReferencesResponse(count=len(references), references=references)
+
+
+@router.get("/graph/{section}/{doc_id}/depends-on", response_model=DocReferencesResponse)
+async def doc_depends_on(
+    section: DocSection,
+    doc_id: str,
+    service: DocsService = Depends(get_docs_service)
+):
+    """
+    List the skills, tools and subagents a doc references.
+
+    Unresolved references are included with a null target.
+    """
+    graph = service.dependency_graph
+    doc = graph.node(section, doc_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Doc not found: {section.value}/{doc_id}")
+
+    references = graph.depends_on(section, doc_id)
+    return DocReferencesResponse(doc=doc, count=len(references), references=references)
+
+
+@router.get("/graph/{section}/{doc_id}/used-by", response_model=DocReferencesResponse)
+async def doc_used_by(
+    section: DocSection,
+    doc_id: str,
+    service: DocsService = Depends(get_docs_service)
+):
+    """
+    List the docs that reference this one.
+
+    E.g. every workflow that uses a skill.
+    """
+    graph = service.dependency_graph
+    doc = graph.node(section, doc_id)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"Doc not found: {section.value}/{doc_id}")
+
+    references = graph.used_by(section, doc_id)
+    return DocReferencesResponse(doc=doc, count=len(references), references=references)
+
+
 # ================================================================
 # READ Endpoints
 # ================================================================
@@ -89,15 +230,19 @@ async def list_docs(
 async def get_doc(
     section: DocSection,
     doc_id: str,
+    response: Response,
     service: DocsService = Depends(get_docs_service)
 ):
     """
     Get a single document with full content.
 
-    Returns frontmatter metadata and markdown content.
+    Returns frontmatter metadata and markdown content. The ETag header (also
+    in the body) is what to send as If-Match when updating.
     """
     try:
-        return service.get_entry(section, doc_id)
+        entry = service.get_entry(section, doc_id)
+        response.headers["ETag"] = entry.etag
+        return entry
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -208,17 +353,24 @@ async def update_doc(
     section: DocSection,
     doc_id: str,
     request: UpdateDocRequest,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     service: DocsService = Depends(get_docs_service)
 ):
     """
     Update an existing document.
 
-    Supports partial updates - only provided fields are changed.
+    Supports partial updates - only provided fields are changed. With an
+    If-Match header the update fails with 409 if someone else saved first.
     """
     try:
-        return service.update_entry(section, doc_id, request)
+        entry = service.update_entry(section, doc_id, request, if_match=if_match)
+        response.headers["ETag"] = entry.etag
+        return entry
     except FileNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except ConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
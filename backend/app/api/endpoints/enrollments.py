@@ -0,0 +1,44 @@
+"""
+Course enrollment API endpoints
+"""
+from fastapi import APIRouter, HTTPException, Request
+
+from app.api.endpoints.auth import get_user_from_request
+from app.models.course_model.course_models import (
+    BulkProgressUpdate, BulkProgressUpdateResponse, DashboardStats
+)
+from app.models.course_model.course_repository import CourseRepository
+
+router = APIRouter()
+
+
+@router.post("/progress", response_model=BulkProgressUpdateResponse)
+async def bulk_update_progress(payload: BulkProgressUpdate, request: Request):
+    """
+    Apply a batch of progress events (one per module viewed) in a single
+    statement. Clients should buffer events and send them together.
+    """
+    user = await get_user_from_request(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    updated = await CourseRepository().bulk_update_progress(user['email'], payload.updates)
+
+    updated_ids = {row['course_id'] for row in updated}
+    not_found = list(dict.fromkeys(
+        event.course_id for event in payload.updates
+        if event.course_id not in updated_ids
+    ))
+
+    return BulkProgressUpdateResponse(updated=updated, not_found=not_found)
+
+
+@router.get("/stats", response_model=DashboardStats)
+async def get_dashboard_stats(request: Request):
+    """The current user's dashboard counters, read from maintained totals"""
+    user = await get_user_from_request(request)
+    if not user:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    stats = await CourseRepository().get_dashboard_stats(user['email'])
+    return DashboardStats(courses_created=user.get('courses_created') or 0, **stats)
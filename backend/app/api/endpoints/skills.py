@@ -8,11 +8,12 @@ from pathlib import Path
 import yaml
 import re
 
+from app.core.config import settings
+
 router = APIRouter()
 
-# Path to skills directory (in vault-web)
-# Go from endpoints/ -> api/ -> app/ -> backend/ -> web/
-SKILLS_DIR = Path(__file__).parent.parent.parent.parent.parent / "vault-web" / "skills"
+# Path to skills directory (in the vault, see settings.VAULT_WEB_DIR)
+SKILLS_DIR = Path(settings.VAULT_WEB_PATH) / "skills"
 
 def parse_markdown_frontmatter(file_path: Path):
     """
@@ -8,11 +8,12 @@ from pathlib import Path
 import yaml
 import re
 
+from app.core.config import settings
+
 router = APIRouter()
 
-# Path to subagents directory (in vault-web)
-# Go from endpoints/ -> api/ -> app/ -> backend/ -> web/
-SUBAGENTS_DIR = Path(__file__).parent.parent.parent.parent.parent / "vault-web" / "subagents"
+# Path to subagents directory (in the vault, see settings.VAULT_WEB_DIR)
+SUBAGENTS_DIR = Path(settings.VAULT_WEB_PATH) / "subagents"
 
 def parse_markdown_frontmatter(file_path: Path):
     """
@@ -6,11 +6,12 @@ from typing import List, Optional
 from pathlib import Path
 import yaml
 
+from app.core.config import settings
+
 router = APIRouter()
 
-# Path to tools directory (in vault-web)
-# Go from endpoints/ -> api/ -> app/ -> backend/ -> web/
-TOOLS_DIR = Path(__file__).parent.parent.parent.parent.parent / "vault-web" / "tools"
+# Path to tools directory (in the vault, see settings.VAULT_WEB_DIR)
+TOOLS_DIR = Path(settings.VAULT_WEB_PATH) / "tools"
 
 def parse_markdown_frontmatter(file_path: Path):
     """
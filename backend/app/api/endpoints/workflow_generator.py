@@ -5,14 +5,21 @@ Two-phase workflow generation:
 - Phase 2: Structured expansion (deterministic, evaluable)
 """
 
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Header, HTTPException, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Literal, AsyncGenerator
+from typing import Literal, AsyncGenerator, Optional
 import json
 import os
 import logging
+import dataclasses
+import hashlib
+import hmac
+import importlib
+import uuid
+import zlib
 from datetime import datetime
+from enum import Enum
 from pathlib import Path
 import re
 
@@ -25,6 +32,15 @@ from workflow_generator import (
     WorkflowRequest,
 )
 
+from app.core.config import settings
+from app.core.session_store import create_session_store
+from app.models.workflow_model import WorkflowDocument, WorkflowIdAllocator, WorkflowIndex
+from app.models.docs_model import DocSection, refresh_dependency_graph
+from app.models.docs_model.frontmatter import parse_frontmatter
+from app.models.docs_model.vault_io import (
+    ConflictError, atomic_write_text, check_etag, compute_etag, file_lock
+)
+
 router = APIRouter()
 
 
@@ -131,8 +147,127 @@ class WorkflowStepUpdateRequest(BaseModel):
     )
 
 
-# Store active generators (in production, use Redis or similar)
-_active_generators: dict[str, ConversationalWorkflowGenerator] = {}
+class WorkflowStepBatchItem(WorkflowStepUpdateRequest):
+    """One step edit in a batch update."""
+    step_number: int = Field(
+        ...,
+        ge=1,
+        description="Step number to update (1-indexed)"
+    )
+
+
+class WorkflowStepsUpdateRequest(BaseModel):
+    """Request model for updating several workflow steps in one write."""
+    steps: list[WorkflowStepBatchItem] = Field(
+        ...,
+        min_length=1,
+        description="Step edits to apply"
+    )
+
+
+# Conversation state per session, serialized into a bounded, expiring store
+# (SESSION_STORE_BACKEND=redis lets any worker resume any session)
+_session_store = create_session_store(
+    "workflow", settings.WORKFLOW_SESSION_TTL_SECONDS, settings.WORKFLOW_SESSION_MAX
+)
+
+# Generator attributes holding API clients are rebuilt, not serialized
+_CLIENT_MODULES = ("anthropic", "httpx")
+
+# Modules whose enums, pydantic models and dataclasses may appear in session
+# state; nothing else is ever instantiated when a session is loaded
+_STATE_MODULES = ("workflow_generator", "anthropic.types")
+
+
+def _state_type(path: str) -> type:
+    """Resolve a "module:QualName" tag from session state, allowlisted modules only."""
+    module_name, _, qualname = path.partition(":")
+    if not any(module_name == m or module_name.startswith(f"{m}.") for m in _STATE_MODULES):
+        raise ValueError(f"Type not allowed in session state: {path}")
+
+    obj = importlib.import_module(module_name)
+    for name in qualname.split("."):
+        obj = getattr(obj, name)
+    if not isinstance(obj, type) or not (
+        issubclass(obj, (Enum, BaseModel)) or dataclasses.is_dataclass(obj)
+    ):
+        raise ValueError(f"Type not allowed in session state: {path}")
+    return obj
+
+
+def _encode_state(value):
+    """json.dumps default: tag enums, models, dataclasses and datetimes."""
+    cls = type(value)
+    tag = f"{cls.__module__}:{cls.__qualname__}"
+    if isinstance(value, Enum):
+        return {"__enum__": tag, "value": value.value}
+    if isinstance(value, BaseModel):
+        return {"__model__": tag, "data": value.dict(by_alias=True)}
+    if dataclasses.is_dataclass(value):
+        return {"__dataclass__": tag, "data": {
+            f.name: getattr(value, f.name) for f in dataclasses.fields(value) if f.init
+        }}
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Cannot store {tag} in a workflow session")
+
+
+def _decode_state(obj: dict):
+    """json.loads object_hook: rebuild values tagged by _encode_state."""
+    if "__enum__" in obj:
+        return _state_type(obj["__enum__"])(obj["value"])
+    if "__model__" in obj:
+        return _state_type(obj["__model__"])(**obj["data"])
+    if "__dataclass__" in obj:
+        return _state_type(obj["__dataclass__"])(**obj["data"])
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+def _dump_generator(generator: ConversationalWorkflowGenerator) -> bytes:
+    """Serialize conversation state: signed, compressed JSON without the API client."""
+    state = {
+        name: value for name, value in vars(generator).items()
+        if not type(value).__module__.startswith(_CLIENT_MODULES)
+    }
+    payload = zlib.compress(json.dumps(state, default=_encode_state).encode("utf-8"))
+    signature = hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    return signature + payload
+
+
+def _load_generator(blob: bytes) -> Optional[ConversationalWorkflowGenerator]:
+    """Rebuild a generator from _dump_generator output (None if tampered or unreadable)."""
+    signature, payload = blob[:32], blob[32:]
+    expected = hmac.new(settings.SECRET_KEY.encode(), payload, hashlib.sha256).digest()
+    if not hmac.compare_digest(signature, expected):
+        logger.warning("Discarding workflow session with an invalid signature")
+        return None
+
+    try:
+        state = json.loads(zlib.decompress(payload), object_hook=_decode_state)
+    except (zlib.error, ValueError, TypeError, AttributeError, ImportError) as e:
+        logger.warning(f"Discarding unreadable workflow session: {e}")
+        return None
+
+    generator = ConversationalWorkflowGenerator(api_key=_get_api_key())
+    generator.__dict__.update(state)
+    return generator
+
+
+async def _get_generator(session_id: Optional[str]) -> Optional[ConversationalWorkflowGenerator]:
+    """Load a session's generator from the store."""
+    if not session_id:
+        return None
+    blob = await _session_store.get(session_id)
+    return _load_generator(blob) if blob else None
+
+
+async def _save_generator(session_id: str, generator: ConversationalWorkflowGenerator):
+    """Persist a session's generator (also refreshes its expiry)."""
+    await _session_store.set(session_id, _dump_generator(generator))
 
 
 def _get_api_key() -> str:
@@ -146,8 +281,8 @@ def _get_api_key() -> str:
     return api_key
 
 
-async def _stream_events(generator, method_name: str, *args) -> AsyncGenerator[str, None]:
-    """Stream events from generator method as SSE."""
+async def _stream_events(generator, method_name: str, *args, session_id: str) -> AsyncGenerator[str, None]:
+    """Stream events from generator method as SSE, then save the session."""
     method = getattr(generator, method_name)
 
     # Call the method to get the async generator
@@ -166,12 +301,14 @@ async def _stream_events(generator, method_name: str, *args) -> AsyncGenerator[s
         # Send as Server-Sent Events format
         yield f"data: {json.dumps(event)}\n\n"
 
+    await _save_generator(session_id, generator)
+
     # Send completion event
     yield f"data: {json.dumps({'type': 'done'})}\n\n"
 
 
-async def _stream_events_websocket(websocket: WebSocket, generator, method_name: str, *args):
-    """Stream events from generator method over WebSocket."""
+async def _stream_events_websocket(websocket: WebSocket, generator, method_name: str, *args, session_id: str):
+    """Stream events from generator method over WebSocket, then save the session."""
     try:
         method = getattr(generator, method_name)
 
@@ -191,6 +328,8 @@ async def _stream_events_websocket(websocket: WebSocket, generator, method_name:
         async for event in event_generator:
             await websocket.send_json(event)
 
+        await _save_generator(session_id, generator)
+
         # Send completion event
         await websocket.send_json({'type': 'done'})
 
@@ -206,14 +345,17 @@ async def _stream_events_websocket(websocket: WebSocket, generator, method_name:
 @router.post("/workflow/discover")
 async def discover_workflow(
     request: WorkflowGenerateRequest,
-    session_id: str = "default"
+    session_id: Optional[str] = None
 ):
     """Phase 1a: Discover - Analyze task and ask clarifying questions.
 
     Uses extended thinking and web search to understand the task.
-    Returns 1-2 clarifying questions.
+    Returns 1-2 clarifying questions. Without a session_id a new one is
+    issued in the X-Session-Id header.
     """
     try:
+        session_id = session_id or uuid.uuid4().hex
+
         api_key = _get_api_key()
 
         # Create workflow request
@@ -226,15 +368,16 @@ async def discover_workflow(
 
         # Create generator
         generator = ConversationalWorkflowGenerator(api_key=api_key)
-        _active_generators[session_id] = generator
+        await _save_generator(session_id, generator)
 
         # Stream discovery process
         return StreamingResponse(
-            _stream_events(generator, "discover", workflow_request),
+            _stream_events(generator, "discover", workflow_request, session_id=session_id),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
                 "Connection": "keep-alive",
+                "X-Session-Id": session_id,
             }
         )
 
@@ -245,11 +388,11 @@ async def discover_workflow(
 @router.post("/workflow/generate-outline")
 async def generate_outline(
     request: WorkflowAnswerRequest,
-    session_id: str = "default"
+    session_id: Optional[str] = None
 ):
     """Phase 1c: Generate initial outline after answering questions."""
     try:
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             raise HTTPException(
                 status_code=400,
@@ -258,7 +401,7 @@ async def generate_outline(
 
         # Stream outline generation
         return StreamingResponse(
-            _stream_events(generator, "generate_outline", request.answers),
+            _stream_events(generator, "generate_outline", request.answers, session_id=session_id),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -273,14 +416,14 @@ async def generate_outline(
 @router.post("/workflow/refine")
 async def refine_workflow(
     request: WorkflowRefineRequest,
-    session_id: str = "default"
+    session_id: Optional[str] = None
 ):
     """Phase 1d: Refine the outline based on user feedback.
 
     Interactive refinement loop with conditional extended thinking.
     """
     try:
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             raise HTTPException(
                 status_code=400,
@@ -289,7 +432,7 @@ async def refine_workflow(
 
         # Stream refinement
         return StreamingResponse(
-            _stream_events(generator, "refine", request.message),
+            _stream_events(generator, "refine", request.message, session_id=session_id),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -302,7 +445,7 @@ async def refine_workflow(
 
 
 @router.post("/workflow/finalize")
-async def finalize_workflow(session_id: str = "default"):
+async def finalize_workflow(session_id: Optional[str] = None):
     """Phase 2: Finalize - Extract structure and expand to detailed workflow.
 
     Executes:
@@ -313,7 +456,7 @@ async def finalize_workflow(session_id: str = "default"):
     Returns the final markdown workflow.
     """
     try:
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             raise HTTPException(
                 status_code=400,
@@ -322,7 +465,7 @@ async def finalize_workflow(session_id: str = "default"):
 
         # Stream finalization
         return StreamingResponse(
-            _stream_events(generator, "finalize_streaming"),
+            _stream_events(generator, "finalize_streaming", session_id=session_id),
             media_type="text/event-stream",
             headers={
                 "Cache-Control": "no-cache",
@@ -337,8 +480,7 @@ async def finalize_workflow(session_id: str = "default"):
 @router.delete("/workflow/session/{session_id}")
 async def delete_session(session_id: str):
     """Delete an active workflow generation session."""
-    if session_id in _active_generators:
-        del _active_generators[session_id]
+    if await _session_store.delete(session_id):
         return {"message": "Session deleted"}
 
     raise HTTPException(status_code=404, detail="Session not found")
@@ -347,8 +489,8 @@ async def delete_session(session_id: str):
 @router.get("/workflow/session/{session_id}")
 async def get_session_status(session_id: str):
     """Get the status of a workflow generation session."""
-    if session_id in _active_generators:
-        generator = _active_generators[session_id]
+    generator = await _get_generator(session_id)
+    if generator:
         return {
             "exists": True,
             "workflow_type": generator.request.workflow_type.value if generator.request else None,
@@ -390,10 +532,10 @@ async def websocket_discover(websocket: WebSocket, session_id: str):
 
         # Create generator
         generator = ConversationalWorkflowGenerator(api_key=api_key)
-        _active_generators[session_id] = generator
+        await _save_generator(session_id, generator)
 
         # Stream discovery events
-        await _stream_events_websocket(websocket, generator, "discover", workflow_request)
+        await _stream_events_websocket(websocket, generator, "discover", workflow_request, session_id=session_id)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -417,7 +559,7 @@ async def websocket_generate_outline(websocket: WebSocket, session_id: str):
 
     try:
         # Get existing generator
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             await websocket.send_json({
                 "type": "error",
@@ -431,7 +573,7 @@ async def websocket_generate_outline(websocket: WebSocket, session_id: str):
         answers = data['answers']
 
         # Stream outline generation
-        await _stream_events_websocket(websocket, generator, "generate_outline", answers)
+        await _stream_events_websocket(websocket, generator, "generate_outline", answers, session_id=session_id)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -455,7 +597,7 @@ async def websocket_refine(websocket: WebSocket, session_id: str):
 
     try:
         # Get existing generator
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             await websocket.send_json({
                 "type": "error",
@@ -469,7 +611,7 @@ async def websocket_refine(websocket: WebSocket, session_id: str):
         message = data['message']
 
         # Stream refinement
-        await _stream_events_websocket(websocket, generator, "refine", message)
+        await _stream_events_websocket(websocket, generator, "refine", message, session_id=session_id)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -493,7 +635,7 @@ async def websocket_finalize(websocket: WebSocket, session_id: str):
 
     try:
         # Get existing generator
-        generator = _active_generators.get(session_id)
+        generator = await _get_generator(session_id)
         if not generator:
             await websocket.send_json({
                 "type": "error",
@@ -503,7 +645,7 @@ async def websocket_finalize(websocket: WebSocket, session_id: str):
             return
 
         # Stream finalization
-        await _stream_events_websocket(websocket, generator, "finalize_streaming")
+        await _stream_events_websocket(websocket, generator, "finalize_streaming", session_id=session_id)
 
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected: {session_id}")
@@ -524,12 +666,21 @@ async def websocket_finalize(websocket: WebSocket, session_id: str):
 
 
 def _get_vault_workflows_dir() -> Path:
-    """Get the vault-web/workflows directory path."""
-    current_file = Path(__file__)
-    # Go from endpoints/ -> api/ -> app/ -> backend/ -> web/
-    web_dir = current_file.parent.parent.parent.parent.parent
-    vault_workflows_dir = web_dir / "vault-web" / "workflows"
-    return vault_workflows_dir
+    """Get the vault workflows directory path."""
+    return Path(settings.VAULT_WEB_PATH) / "workflows"
+
+
+# Scalar frontmatter fields of WORKFLOW.md, keyed by their metadata name
+_WORKFLOW_METADATA_FIELDS = {
+    'title': 'title',
+    'description': 'description',
+    'type': 'type',
+    'difficulty': 'difficulty',
+    'estimated_time': 'estimated_time',
+    'agent': 'agent',
+    'created': 'created_date',
+    'context': 'context',
+}
 
 
 def _parse_workflow_metadata(content: str) -> dict:
@@ -551,127 +702,24 @@ def _parse_workflow_metadata(content: str) -> dict:
         'tools': []
     }
 
-    # Check for YAML frontmatter
+    # YAML frontmatter (decodes the quoting _render_workflow_frontmatter writes)
     if content.startswith('---'):
         try:
-            # Extract YAML block
-            end_marker = content.find('---', 3)
-            if end_marker > 0:
-                yaml_content = content[3:end_marker].strip()
-
-                # Simple YAML parser (handles the specific format we generate)
-                in_steps_section = False
-                in_skills_section = False
-                in_tools_section = False
-                in_multiline_section = False
-                for line in yaml_content.split('\n'):
-                    original_line = line
-                    line = line.strip()
-
-                    # Skip comments
-                    if line.startswith('#'):
-                        continue
-
-                    # Handle multiline content (indicated by | or >)
-                    # Skip indented lines when in a multiline section
-                    if in_multiline_section:
-                        if original_line.startswith('  ') or not line:
-                            # Still in multiline content, skip it
-                            continue
-                        else:
-                            # Hit a new field, exit multiline mode
-                            in_multiline_section = False
-
-                    if line.startswith('title:'):
-                        metadata['title'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('description:'):
-                        metadata['description'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('type:'):
-                        metadata['type'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('difficulty:'):
-                        metadata['difficulty'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('estimated_time:'):
-                        metadata['estimated_time'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('agent:'):
-                        metadata['agent'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('created_date:'):
-                        metadata['created'] = line.split(':', 1)[1].strip().strip('"')
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('context:'):
-                        value = line.split(':', 1)[1].strip().strip('"')
-                        metadata['context'] = value
-                        # Check if this is a multiline field (starts with | or >)
-                        if value in ('|', '>'):
-                            in_multiline_section = True
-                            metadata['context'] = ''  # Reset, we'll skip the actual content
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('references:'):
-                        # Skip references section (we don't need to parse it)
-                        # Just treat it as entering an ignored list section
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('steps:'):
-                        # Enter steps section
-                        in_steps_section = True
-                        in_skills_section = False
-                        in_tools_section = False
-                    elif line.startswith('skills:'):
-                        # Enter skills section
-                        in_skills_section = True
-                        in_steps_section = False
-                        in_tools_section = False
-                    elif line.startswith('tools:'):
-                        # Enter tools section
-                        in_tools_section = True
-                        in_steps_section = False
-                        in_skills_section = False
-                    elif in_steps_section and line.startswith('- '):
-                        # Step name in list (only when in steps section)
-                        # Handle both quoted and unquoted values
-                        step_name = line[2:].strip().strip('"')
-                        metadata['steps'].append(step_name)
-                    elif in_skills_section and line.startswith('- '):
-                        # Skill name in list (only when in skills section)
-                        # Handle both quoted and unquoted values
-                        skill_name = line[2:].strip().strip('"')
-                        metadata['skills'].append(skill_name)
-                    elif in_tools_section and line.startswith('- '):
-                        # Tool name in list (only when in tools section)
-                        # Handle both quoted and unquoted values
-                        tool_name = line[2:].strip().strip('"')
-                        metadata['tools'].append(tool_name)
-                    elif not line.startswith('-') and ':' in line:
-                        # Hit a new section, exit all list sections
-                        in_steps_section = False
-                        in_skills_section = False
-                        in_tools_section = False
-
-                return metadata
-        except Exception as e:
+            frontmatter, _ = parse_frontmatter(content)
+        except ValueError as e:
             logger.warning(f"Failed to parse YAML frontmatter: {e}")
+            frontmatter = None
+
+        if isinstance(frontmatter, dict) and frontmatter:
+            for key, field in _WORKFLOW_METADATA_FIELDS.items():
+                value = frontmatter.get(field)
+                if value is not None:
+                    metadata[key] = value.isoformat() if hasattr(value, 'isoformat') else str(value).strip()
+            for key in ('steps', 'skills', 'tools'):
+                items = frontmatter.get(key)
+                if isinstance(items, list):
+                    metadata[key] = [str(item).strip() for item in items if item is not None]
+            return metadata
 
     # Fallback to legacy markdown metadata parsing
     lines = content.split('\n')
@@ -698,59 +746,90 @@ def _parse_workflow_metadata(content: str) -> dict:
     return metadata
 
 
+def _build_workflow_entry(filepath: Path) -> dict:
+    """Build a /workflow/list entry from a WORKFLOW.md file."""
+    vault_workflows_dir = filepath.parent.parent
+    metadata = _parse_workflow_metadata(filepath.read_text(encoding='utf-8'))
+
+    # Extract workflow ID from directory name
+    workflow_id = filepath.parent.name
+
+    return {
+        'workflow_id': workflow_id,
+        'filename': filepath.name,
+        'title': metadata['title'] or workflow_id.replace('_', ' ').title(),
+        'description': metadata['description'] or metadata['context'],
+        'type': metadata['type'] or 'unknown',
+        'difficulty': metadata['difficulty'],
+        'estimated_time': metadata['estimated_time'],
+        'agent': metadata['agent'],
+        'created': metadata['created'],
+        'context': metadata['context'],
+        'steps': metadata['steps'],
+        'step_count': len(metadata['steps']),
+        'skills': metadata['skills'],
+        'tools': metadata['tools'],
+        'path': str(filepath.parent.relative_to(vault_workflows_dir.parent))
+    }
+
+
+# Parsed workflow metadata, persisted and revalidated by file stamp
+_workflow_index = WorkflowIndex(_get_vault_workflows_dir(), _build_workflow_entry)
+
+_WORKFLOW_SORT_KEYS = {
+    'created': lambda w: (w['created'], w['workflow_id']),
+    'title': lambda w: w['title'].lower(),
+    'steps': lambda w: w['step_count'],
+    'id': lambda w: w['workflow_id'],
+}
+
+
 @router.get("/workflow/list")
-async def list_workflows():
-    """List all workflows from vault-website/workflows directory.
+async def list_workflows(
+    type: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    skill: Optional[str] = None,
+    tool: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Search title and description"),
+    sort: Literal["created", "title", "steps", "id"] = "id",
+    order: Literal["asc", "desc"] = "desc",
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    offset: int = Query(0, ge=0)
+):
+    """List workflows from the vault-website/workflows directory.
 
-    Returns a list of workflows with metadata extracted from WORKFLOW.md files in subdirectories.
+    Entries come from the workflow index (only changed WORKFLOW.md files are
+    re-parsed). Supports filtering, sorting and pagination; `total` is the
+    number of matches before pagination.
     """
     try:
-        vault_workflows_dir = _get_vault_workflows_dir()
-
-        if not vault_workflows_dir.exists():
-            return {"success": True, "workflows": []}
-
-        workflows = []
-
-        # Read all WORKFLOW.md files in workflow_* subdirectories
-        for filepath in sorted(vault_workflows_dir.glob("workflow_*/WORKFLOW.md"), reverse=True):
-            try:
-                content = filepath.read_text(encoding='utf-8')
-                metadata = _parse_workflow_metadata(content)
-
-                # Debug logging
-                if 'schwarzenbach' in filepath.parent.name.lower():
-                    logger.info(f"DEBUG: Schwarzenbach metadata: steps={len(metadata['steps'])}, skills={len(metadata['skills'])}, tools={len(metadata['tools'])}")
-                    logger.info(f"DEBUG: Skills={metadata['skills']}")
-                    logger.info(f"DEBUG: Tools={metadata['tools']}")
-
-                # Extract workflow ID from directory name
-                workflow_id = filepath.parent.name
-
-                workflows.append({
-                    'workflow_id': workflow_id,
-                    'filename': filepath.name,
-                    'title': metadata['title'] or workflow_id.replace('_', ' ').title(),
-                    'description': metadata['description'] or metadata['context'],
-                    'type': metadata['type'] or 'unknown',
-                    'difficulty': metadata['difficulty'],
-                    'estimated_time': metadata['estimated_time'],
-                    'agent': metadata['agent'],
-                    'created': metadata['created'],
-                    'context': metadata['context'],
-                    'steps': metadata['steps'],
-                    'skills': metadata['skills'],
-                    'tools': metadata['tools'],
-                    'path': str(filepath.parent.relative_to(vault_workflows_dir.parent))
-                })
-            except Exception as e:
-                logger.error(f"Error parsing workflow {filepath.parent.name}: {e}")
-                continue
+        workflows = _workflow_index.entries()
+
+        if type:
+            workflows = [w for w in workflows if w['type'] == type]
+        if difficulty:
+            workflows = [w for w in workflows if w['difficulty'] == difficulty]
+        if skill:
+            workflows = [w for w in workflows if skill in w['skills']]
+        if tool:
+            workflows = [w for w in workflows if tool in w['tools']]
+        if q:
+            needle = q.lower()
+            workflows = [
+                w for w in workflows
+                if needle in w['title'].lower() or needle in w['description'].lower()
+            ]
+
+        workflows.sort(key=_WORKFLOW_SORT_KEYS[sort], reverse=(order == "desc"))
+
+        total = len(workflows)
+        workflows = workflows[offset:offset + limit] if limit else workflows[offset:]
 
         return {
             "success": True,
             "workflows": workflows,
-            "count": len(workflows)
+            "count": len(workflows),
+            "total": total
         }
 
     except Exception as e:
@@ -798,6 +877,7 @@ async def get_workflow(workflow_id: str):
                 'context': metadata['context'],
                 'steps': metadata['steps'],
                 'content': content,
+                'etag': compute_etag(content),
                 'path': str(workflow_dir.relative_to(vault_workflows_dir.parent))
             }
         }
@@ -812,59 +892,15 @@ async def get_workflow(workflow_id: str):
         )
 
 
-@router.post("/workflow/save")
-async def save_workflow(request: WorkflowSaveRequest):
-    """Save a workflow to the vault-website/workflows directory.
-
-    Creates a workflow directory with structure:
-    workflow_YYYYMMDD_NNN_sanitized_title/
-    ├── WORKFLOW.md
-    └── references/
-
-    Returns the workflow ID and path.
-    """
-    try:
-        # Get the vault-website/workflows directory
-        vault_workflows_dir = _get_vault_workflows_dir()
-
-        # Create directory if it doesn't exist
-        vault_workflows_dir.mkdir(parents=True, exist_ok=True)
-
-        # Generate workflow directory name
-        today = datetime.now().strftime("%Y%m%d")
-
-        # Sanitize title for directory name (keep only alphanumeric, spaces, hyphens, underscores)
-        sanitized_title = re.sub(r'[^a-zA-Z0-9\s\-_]', '', request.title)
-        sanitized_title = re.sub(r'\s+', '_', sanitized_title.strip())
-        sanitized_title = sanitized_title.lower()[:50]  # Limit length
-
-        # Find next available number for today
-        existing_dirs = list(vault_workflows_dir.glob(f"workflow_{today}_*"))
-        if existing_dirs:
-            # Extract numbers and find max
-            numbers = []
-            for d in existing_dirs:
-                match = re.search(r'workflow_\d{8}_(\d{3})_', d.name)
-                if match:
-                    numbers.append(int(match.group(1)))
-            next_num = max(numbers) + 1 if numbers else 1
-        else:
-            next_num = 1
-
-        dirname = f"workflow_{today}_{next_num:03d}_{sanitized_title}"
-        workflow_dir = vault_workflows_dir / dirname
-        workflow_id = f"workflow_{today}_{next_num:03d}"
+# Workflow IDs come from a per-day counter instead of globbing the directory
+_workflow_ids = WorkflowIdAllocator(_get_vault_workflows_dir())
 
-        # Extract step count from markdown
-        step_count = len(request.step_names)
-
-        # Build YAML frontmatter
-        yaml_frontmatter = f"""---
+_WORKFLOW_FRONTMATTER = """---
 # Workflow Metadata
-title: "{request.title}"
-description: "{request.description or request.context or 'AI-generated workflow'}"
-type: "{request.workflow_type}"
-difficulty: "{request.difficulty}"
+title: {title}
+description: {description}
+type: {type}
+difficulty: {difficulty}
 status: "active"
 
 # Agent/Model Information
@@ -872,18 +908,18 @@ agent: "Claude Code"
 model: "claude-sonnet-4-5"
 
 # Time & Effort
-estimated_time: "{request.estimated_time or 'Not specified'}"
-total_steps: {step_count}
+estimated_time: {estimated_time}
+total_steps: {total_steps}
 
 # Categorization
 tags:
-  - "{request.workflow_type}"
+  - {type}
   - "ai-generated"
 category: "workflow"
 
 # Tracking
-created_date: "{datetime.now().strftime('%Y-%m-%d')}"
-last_modified: "{datetime.now().strftime('%Y-%m-%d')}"
+created_date: "{today}"
+last_modified: "{today}"
 workflow_id: "{workflow_id}"
 
 # Optional Metadata
@@ -894,24 +930,68 @@ tools_required: []
 budget_constraint: null
 
 # Step Names
-steps:"""
-
-        # Add step names as YAML list
-        if request.step_names:
-            for step_name in request.step_names:
-                # Escape quotes in step names
-                escaped_name = step_name.replace('"', '\\"')
-                yaml_frontmatter += f'\n  - "{escaped_name}"'
-        else:
-            yaml_frontmatter += '\n  []'
+steps:{steps}
+---
+
+"""
 
-        yaml_frontmatter += "\n---\n\n"
 
-        # Create full markdown content
-        content = yaml_frontmatter + request.markdown
+def _render_workflow_frontmatter(request: WorkflowSaveRequest, workflow_id: str) -> str:
+    """Render the WORKFLOW.md frontmatter for a save request.
+
+    Values are JSON-encoded, which makes them valid double-quoted YAML
+    scalars however they are punctuated.
+    """
+    def quote(value: str) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    if request.step_names:
+        steps = ''.join(f"\n  - {quote(name)}" for name in request.step_names)
+    else:
+        steps = " []"
+
+    return _WORKFLOW_FRONTMATTER.format(
+        title=quote(request.title),
+        description=quote(request.description or request.context or 'AI-generated workflow'),
+        type=quote(request.workflow_type),
+        difficulty=quote(request.difficulty),
+        estimated_time=quote(request.estimated_time or 'Not specified'),
+        total_steps=len(request.step_names),
+        today=datetime.now().strftime('%Y-%m-%d'),
+        workflow_id=workflow_id,
+        steps=steps,
+    )
+
+
+@router.post("/workflow/save")
+async def save_workflow(request: WorkflowSaveRequest):
+    """Save a workflow to the vault-website/workflows directory.
+
+    Creates a workflow directory with structure:
+    workflow_YYYYMMDD_NNN_sanitized_title/
+    ├── WORKFLOW.md
+    └── references/
+
+    Returns the workflow ID and path.
+    """
+    try:
+        # Get the vault-website/workflows directory
+        vault_workflows_dir = _get_vault_workflows_dir()
 
-        # Create workflow directory structure
-        workflow_dir.mkdir(parents=True, exist_ok=True)
+        # Create directory if it doesn't exist
+        vault_workflows_dir.mkdir(parents=True, exist_ok=True)
+
+        # Sanitize title for directory name (keep only alphanumeric, spaces, hyphens, underscores)
+        sanitized_title = re.sub(r'[^a-zA-Z0-9\s\-_]', '', request.title)
+        sanitized_title = re.sub(r'\s+', '_', sanitized_title.strip())
+        sanitized_title = sanitized_title.lower()[:50]  # Limit length
+
+        # Reserve the next ID for today and create its directory
+        workflow_id, workflow_dir = _workflow_ids.allocate(sanitized_title)
+        dirname = workflow_dir.name
+
+        # Create full markdown content
+        content = _render_workflow_frontmatter(request, workflow_id) + request.markdown
 
         # Create references subdirectory
         references_dir = workflow_dir / "references"
@@ -919,7 +999,9 @@ steps:"""
 
         # Write WORKFLOW.md
         workflow_file = workflow_dir / "WORKFLOW.md"
-        workflow_file.write_text(content, encoding='utf-8')
+        atomic_write_text(workflow_file, content)
+        _workflow_index.refresh(dirname)
+        refresh_dependency_graph(DocSection.WORKFLOWS, dirname)
 
         logger.info(f"Saved workflow to: {workflow_file}")
 
@@ -961,6 +1043,8 @@ async def delete_workflow(workflow_id: str):
         # Delete the entire directory
         import shutil
         shutil.rmtree(workflow_dir)
+        _workflow_index.remove(workflow_id)
+        refresh_dependency_graph(DocSection.WORKFLOWS, workflow_id)
 
         logger.info(f"Deleted workflow directory: {workflow_dir}")
 
@@ -980,126 +1064,78 @@ async def delete_workflow(workflow_id: str):
         )
 
 
-@router.put("/workflow/{workflow_id}/step/{step_number}")
-async def update_workflow_step(
-    workflow_id: str,
-    step_number: int,
-    step_data: WorkflowStepUpdateRequest
-):
-    """Update a specific step in a workflow.
-
-    Args:
-        workflow_id: The workflow identifier
-        step_number: The step number to update (1-indexed)
-        step_data: The updated step data
+def _apply_step_updates(workflow_id: str, updates: dict[int, dict], if_match: Optional[str] = None) -> tuple[str, str]:
+    """Patch steps of a workflow with one parse and one write.
 
-    Returns:
-        Success status and updated workflow metadata
+    Returns the sanitized workflow ID and the new ETag; 409 if if_match
+    doesn't match the file's current content.
     """
-    try:
-        vault_workflows_dir = _get_vault_workflows_dir()
+    vault_workflows_dir = _get_vault_workflows_dir()
 
-        # Sanitize workflow_id
-        workflow_id = re.sub(r'[^a-zA-Z0-9_\-]', '', workflow_id)
-        workflow_dir = vault_workflows_dir / workflow_id
-        workflow_file = workflow_dir / "WORKFLOW.md"
-
-        if not workflow_file.exists():
-            raise HTTPException(
-                status_code=404,
-                detail=f"Workflow not found: {workflow_id}"
-            )
+    # Sanitize workflow_id
+    workflow_id = re.sub(r'[^a-zA-Z0-9_\-]', '', workflow_id)
+    workflow_file = vault_workflows_dir / workflow_id / "WORKFLOW.md"
 
-        # Read the current workflow content
-        with open(workflow_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+    if not workflow_file.exists():
+        raise HTTPException(
+            status_code=404,
+            detail=f"Workflow not found: {workflow_id}"
+        )
 
-        # Find the specific step
-        # Match step pattern: ## Step N: Title
-        step_pattern = rf'(## Step {step_number}:.*?)(?=## Step {step_number + 1}:|## Deliverable|$)'
+    with file_lock(workflow_file):
+        document = WorkflowDocument.load(workflow_file)
 
-        import re as regex
-        step_match = regex.search(step_pattern, content, flags=regex.DOTALL)
+        try:
+            check_etag(document.text, if_match)
+        except ConflictError as e:
+            raise HTTPException(status_code=409, detail=str(e))
 
-        if not step_match:
+        missing = [number for number in updates if document.step(number) is None]
+        if missing:
             raise HTTPException(
                 status_code=404,
-                detail=f"Step {step_number} not found in workflow"
+                detail=f"Step {missing[0]} not found in workflow"
             )
 
-        # Parse existing step content to preserve sections not being updated
-        existing_step = step_match.group(1)
-
-        # Extract existing sections
-        existing_instruction = ""
-        existing_skills = ""
-        existing_tools = ""
-        existing_resources = ""
-        existing_deliverable = ""
+        updated_content = document.patch_steps(updates)
+        atomic_write_text(workflow_file, updated_content)
 
-        instruction_match = regex.search(r'\*\*Instruction:\*\*\s*\n(.*?)(?=\n\*\*[A-Z]|\n##|$)', existing_step, regex.DOTALL)
-        if instruction_match:
-            existing_instruction = instruction_match.group(1).strip()
+    _workflow_index.refresh(workflow_id)
 
-        skills_match = regex.search(r'\*\*Skills:\*\*\s*\n(.*?)(?=\n\*\*[A-Z]|\n##|$)', existing_step, regex.DOTALL)
-        if skills_match:
-            existing_skills = skills_match.group(1).strip()
+    refresh_dependency_graph(DocSection.WORKFLOWS, workflow_id)
 
-        tools_match = regex.search(r'\*\*Tools:\*\*\s*\n(.*?)(?=\n\*\*[A-Z]|\n##|$)', existing_step, regex.DOTALL)
-        if tools_match:
-            existing_tools = tools_match.group(1).strip()
+    return workflow_id, compute_etag(updated_content)
 
-        resources_match = regex.search(r'\*\*Resources:\*\*\s*\n(.*?)(?=\n\*\*[A-Z]|\n##|$)', existing_step, regex.DOTALL)
-        if resources_match:
-            existing_resources = resources_match.group(1).strip()
 
-        deliverable_match = regex.search(r'\*\*Deliverable:\*\*\s*\n(.*?)(?=\n\*\*[A-Z]|\n##|$)', existing_step, regex.DOTALL)
-        if deliverable_match:
-            existing_deliverable = deliverable_match.group(1).strip()
-
-        # Build the new step content, preserving existing values when not provided
-        new_step_content = f"## Step {step_number}: {step_data.title}\n\n"
-
-        # Use new value if provided, otherwise keep existing
-        final_instruction = step_data.instruction if step_data.instruction else existing_instruction
-        final_skills = step_data.skills if step_data.skills else existing_skills
-        final_tools = step_data.tools if step_data.tools else existing_tools
-        final_resources = step_data.resources if step_data.resources else existing_resources
-        final_deliverable = step_data.deliverable if step_data.deliverable else existing_deliverable
-
-        if final_instruction:
-            new_step_content += f"**Instruction:**\n{final_instruction}\n\n"
-
-        if final_skills:
-            new_step_content += f"**Skills:**\n{final_skills}\n\n"
-
-        if final_tools:
-            new_step_content += f"**Tools:**\n{final_tools}\n\n"
-
-        if final_resources:
-            new_step_content += f"**Resources:**\n{final_resources}\n\n"
+@router.put("/workflow/{workflow_id}/step/{step_number}")
+async def update_workflow_step(
+    workflow_id: str,
+    step_number: int,
+    step_data: WorkflowStepUpdateRequest,
+    if_match: Optional[str] = Header(None)
+):
+    """Update a specific step in a workflow.
 
-        if final_deliverable:
-            new_step_content += f"**Deliverable:**\n{final_deliverable}\n\n"
+    Args:
+        workflow_id: The workflow identifier
+        step_number: The step number to update (1-indexed)
+        step_data: The updated step data
 
-        # Replace the step in the content
-        updated_content = regex.sub(
-            step_pattern,
-            new_step_content,
-            content,
-            flags=regex.DOTALL
+    Returns:
+        Success status and updated workflow metadata
+    """
+    try:
+        workflow_id, etag = _apply_step_updates(
+            workflow_id, {step_number: step_data.dict()}, if_match
         )
 
-        # Write the updated content back
-        with open(workflow_file, 'w', encoding='utf-8') as f:
-            f.write(updated_content)
-
         logger.info(f"Updated step {step_number} in workflow {workflow_id}")
 
         return {
             "success": True,
             "workflow_id": workflow_id,
             "step_number": step_number,
+            "etag": etag,
             "message": f"Step {step_number} updated successfully"
         }
 
@@ -1110,4 +1146,38 @@ async def update_workflow_step(
         raise HTTPException(
             status_code=500,
             detail=f"Failed to update workflow step: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@router.put("/workflow/{workflow_id}/steps")
+async def update_workflow_steps(
+    workflow_id: str,
+    request: WorkflowStepsUpdateRequest,
+    if_match: Optional[str] = Header(None)
+):
+    """Update several steps of a workflow in a single write.
+
+    Either every step is applied or none is (404 if any step is missing).
+    """
+    try:
+        updates = {item.step_number: item.dict() for item in request.steps}
+        workflow_id, etag = _apply_step_updates(workflow_id, updates, if_match)
+
+        logger.info(f"Updated steps {sorted(updates)} in workflow {workflow_id}")
+
+        return {
+            "success": True,
+            "workflow_id": workflow_id,
+            "step_numbers": sorted(updates),
+            "etag": etag,
+            "message": f"{len(updates)} steps updated successfully"
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating workflow steps: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to update workflow steps: {str(e)}"
+        )
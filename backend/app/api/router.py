@@ -1,5 +1,6 @@
 """Central router - ADD NEW ROUTES HERE"""
 from fastapi import APIRouter
+from app.core.db_pool import db_pools
 from app.api.endpoints.databank import router as databank_router
 
 try:
@@ -100,6 +101,13 @@ except ImportError as e:
     print(f"Subagents router not available: {e}")
     subagents_available = False
 
+try:
+    from app.api.endpoints.enrollments import router as enrollments_router
+    enrollments_available = True
+except ImportError as e:
+    print(f"Enrollments router not available: {e}")
+    enrollments_available = False
+
 api_router = APIRouter()
 
 @api_router.get("/health")
@@ -107,6 +115,11 @@ async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "message": "FARP backend is running!"}
 
+@api_router.get("/health/db")
+async def database_pool_health():
+    """Connection budget and per-pool usage/latency for this worker"""
+    return db_pools.stats()
+
 # Include databank routes (always available)
 api_router.include_router(databank_router, prefix="/databank", tags=["databank"])
 
@@ -128,6 +141,10 @@ if chat_available:
 if hybrid_auth_available:
     api_router.include_router(hybrid_auth_router, tags=["hybrid-authentication"])
 
+# Course enrollments (batched progress updates)
+if enrollments_available:
+    api_router.include_router(enrollments_router, prefix="/enrollments", tags=["enrollments"])
+
 # MCP Server Generator (AI-powered MCP server creation)
 if mcp_generator_available:
     api_router.include_router(mcp_generator_router, prefix="/mcp", tags=["mcp-generator"])
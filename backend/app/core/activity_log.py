@@ -0,0 +1,135 @@
+"""
+Buffered activity logging
+
+Request handlers enqueue activity rows in memory and return immediately; a
+background task writes them with COPY in batches, every ACTIVITY_LOG_FLUSH_MS
+or every ACTIVITY_LOG_BATCH_SIZE rows, whichever comes first. The queue is
+bounded, so if the database falls behind producers wait instead of growing
+memory without limit. If a COPY fails the batch is retried row by row, so
+only the rows the database rejects are lost. Pending rows are flushed on
+shutdown.
+"""
+import asyncio
+import logging
+from typing import List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.db_pool import db_pools
+
+logger = logging.getLogger(__name__)
+
+# Every buffer created in this process, so shutdown can flush them all
+_buffers: List["ActivityLogBuffer"] = []
+
+
+class ActivityLogBuffer:
+    """Batches rows for one table/column layout and COPYs them in the background"""
+
+    def __init__(self, table: str, columns: Sequence[str], pool_name: str = "auth",
+                 batch_size: Optional[int] = None,
+                 flush_interval_ms: Optional[int] = None,
+                 max_queue: Optional[int] = None):
+        self.table = table
+        self.columns = list(columns)
+        self.pool_name = pool_name
+        self.batch_size = batch_size or settings.ACTIVITY_LOG_BATCH_SIZE
+        self.flush_interval = (flush_interval_ms or settings.ACTIVITY_LOG_FLUSH_MS) / 1000
+        self._max_queue = max_queue or settings.ACTIVITY_LOG_QUEUE_SIZE
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        _buffers.append(self)
+
+    def _ensure_started(self):
+        # Started lazily so the queue and task belong to the running loop
+        if self._task is None or self._task.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue(maxsize=self._max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    async def log(self, record: tuple):
+        """Enqueue one row (values in `columns` order); waits only when the queue is full"""
+        self._ensure_started()
+        await self._queue.put(record)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch: list = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.flush_interval
+
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush(batch)
+                batch = []
+
+        except asyncio.CancelledError:
+            # Shutdown: write whatever is in hand or still queued
+            batch.extend(self._drain())
+            if batch:
+                await self._flush(batch)
+            raise
+
+    def _drain(self) -> list:
+        records = []
+        while self._queue is not None and not self._queue.empty():
+            records.append(self._queue.get_nowait())
+        return records
+
+    async def _flush(self, records: list):
+        try:
+            async with db_pools.acquire(self.pool_name) as conn:
+                await conn.copy_records_to_table(
+                    self.table, records=records, columns=self.columns
+                )
+        except Exception as e:
+            # COPY is all-or-nothing; retry row by row so one bad row does
+            # not take the rest of the batch with it
+            logger.warning(f"COPY of {len(records)} {self.table} rows failed, inserting one by one: {e}")
+            await self._insert_rows(records)
+
+    async def _insert_rows(self, records: list):
+        query = (
+            f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join(f'${i + 1}' for i in range(len(self.columns)))})"
+        )
+        dropped = 0
+        try:
+            async with db_pools.acquire(self.pool_name) as conn:
+                for record in records:
+                    try:
+                        await conn.execute(query, *record)
+                    except Exception as e:
+                        dropped += 1
+                        logger.debug(f"Dropped {self.table} row {record!r}: {e}")
+        except Exception as e:
+            # No connection at all; activity logs are best-effort, never
+            # let them break requests
+            dropped = len(records)
+            logger.warning(f"Could not reach the database for {self.table}: {e}")
+        if dropped:
+            logger.warning(f"Dropped {dropped} of {len(records)} {self.table} rows")
+
+    async def stop(self):
+        """Flush pending rows and stop the background writer"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+
+async def flush_activity_logs():
+    """Flush and stop every activity log buffer (application shutdown)"""
+    for buffer in _buffers:
+        await buffer.stop()
@@ -15,6 +15,15 @@ class Settings(BaseSettings):
     def DATABASE_URL(self) -> str:
         return f"postgresql://{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@{self.DATABASE_HOST}:{self.DATABASE_PORT}/{self.DATABASE_NAME}"
 
+    # Connection budget shared by every pool in all workers (see core/db_pool.py)
+    DB_MAX_CONNECTIONS: int = 80
+    DB_RESERVED_CONNECTIONS: int = 5
+    WEB_CONCURRENCY: int = 1
+    DB_POOL_MIN_SIZE: int = 2
+
+    # Course storage asyncpg pool (set statement cache to 0 behind pgbouncer)
+    COURSE_DB_STATEMENT_CACHE_SIZE: int = 100
+
     # AWS
     AWS_ACCESS_KEY_ID: str
     AWS_SECRET_ACCESS_KEY: str
@@ -37,6 +46,45 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Password hashing (existing hashes are upgraded on login when rounds change)
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Authenticated-user cache (per worker); bounds how long a revoked
+    # session or profile change can be seen by other workers
+    AUTH_CACHE_TTL_SECONDS: int = 30
+
+    # Dashboard stats (GET /enrollments/stats) read-through cache, per
+    # worker; writers drop the user's entry, 0 disables it
+    DASHBOARD_STATS_CACHE_TTL_SECONDS: int = 15
+
+    # Activity logs are buffered and written with COPY every FLUSH_MS or
+    # every BATCH_SIZE rows; producers wait once QUEUE_SIZE rows are pending
+    ACTIVITY_LOG_BATCH_SIZE: int = 200
+    ACTIVITY_LOG_FLUSH_MS: int = 250
+    ACTIVITY_LOG_QUEUE_SIZE: int = 10000
+
+    # Background course generation jobs; every SWEEP_SECONDS the runner
+    # re-queues jobs whose worker stopped heartbeating STALE_SECONDS ago
+    COURSE_JOB_WORKERS: int = 2
+    COURSE_JOB_STALE_SECONDS: int = 120
+    COURSE_JOB_SWEEP_SECONDS: int = 30
+
+    # Conversational session state (workflow generator). "memory" is
+    # per-process; use "redis" when running more than one worker
+    SESSION_STORE_BACKEND: str = "memory"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    WORKFLOW_SESSION_TTL_SECONDS: int = 3600
+    WORKFLOW_SESSION_MAX: int = 1000
+
+    # Bulk vault import (POST /docs/import): upload size cap, caps on what
+    # the archive may unpack to, and the number of processes validating
+    # frontmatter
+    VAULT_IMPORT_MAX_BYTES: int = 512 * 1024 * 1024
+    VAULT_IMPORT_MAX_EXTRACTED_BYTES: int = 1024 * 1024 * 1024
+    VAULT_IMPORT_MAX_MEMBERS: int = 10000
+    VAULT_IMPORT_WORKERS: int = 4
+
     # CORS - Dynamically includes production frontend URL
     @property
     def BACKEND_CORS_ORIGINS(self) -> List[str]:
@@ -75,20 +123,45 @@ class Settings(BaseSettings):
     COGNITO_IDENTITY_POOL_ID: str = ""
     COGNITO_REGION: str = ""
 
-    # Docs Content Management - Paths relative to backend directory
+    # Docs Content Management - Paths relative to backend directory unless
+    # overridden. VAULT_EXTRA_DIRS lists additional vault roots (separated by
+    # os.pathsep); on duplicate IDs the earlier root wins.
+    VAULT_WEB_DIR: str = ""
+    VAULT_EXTRA_DIRS: str = ""
+    FRONTEND_PUBLIC_CONTENT_DIR: str = ""
+
     @property
     def VAULT_WEB_PATH(self) -> str:
-        """Path to vault-web directory (source of truth for docs content)."""
+        """Path to the primary vault directory (source of truth for docs content)."""
         from pathlib import Path
-        # Backend is at hub/web/backend, vault-web is at hub/web/vault-web
+        if self.VAULT_WEB_DIR:
+            return str(Path(self.VAULT_WEB_DIR).expanduser().resolve())
+
+        # Backend is at web/backend, the vault is at web/vault-web-v2
+        # (older checkouts: web/vault-web)
         backend_dir = Path(__file__).parent.parent.parent
-        vault_path = backend_dir.parent / "vault-web"
-        return str(vault_path.resolve())
+        for name in ("vault-web-v2", "vault-web"):
+            vault_path = backend_dir.parent / name
+            if vault_path.exists():
+                return str(vault_path.resolve())
+        return str((backend_dir.parent / "vault-web-v2").resolve())
+
+    @property
+    def VAULT_EXTRA_PATHS(self) -> List[str]:
+        """Additional vault roots, in priority order."""
+        from pathlib import Path
+        return [
+            str(Path(path).expanduser().resolve())
+            for path in self.VAULT_EXTRA_DIRS.split(os.pathsep)
+            if path.strip()
+        ]
 
     @property
     def FRONTEND_PUBLIC_CONTENT_PATH(self) -> str:
         """Path to frontend/public/content (sync target for static serving)."""
         from pathlib import Path
+        if self.FRONTEND_PUBLIC_CONTENT_DIR:
+            return str(Path(self.FRONTEND_PUBLIC_CONTENT_DIR).expanduser().resolve())
         backend_dir = Path(__file__).parent.parent.parent
         public_path = backend_dir.parent / "frontend" / "public" / "content"
         return str(public_path.resolve())
@@ -2,16 +2,19 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.core.db_pool import db_pools
+from typing import AsyncIterator
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Create engine with connection pooling for AWS RDS
+# Create engine with connection pooling for AWS RDS (sized from the global budget)
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_size=20,
-    max_overflow=40,
+    pool_size=db_pools.size_for("sqlalchemy"),
+    max_overflow=0,
     pool_pre_ping=True,  # Important for AWS RDS
     pool_recycle=3600,   # Recycle connections after 1 hour
     connect_args={
@@ -25,9 +28,35 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine (asyncpg driver) for handlers that must not block the event loop
+async_engine = create_async_engine(
+    settings.DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    pool_size=db_pools.size_for("sqlalchemy_async"),
+    max_overflow=0,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    connect_args={"ssl": "require"}  # Required for AWS RDS, same as the asyncpg pools
+)
+
+db_pools.register_engine("sqlalchemy", engine)
+db_pools.register_engine("sqlalchemy_async", async_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False
+)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,218 @@
+"""
+Database pool manager - owns every connection pool in the process
+
+All pools (the SQLAlchemy engines and the named asyncpg pools used by the
+course repository and auth service) are sized from one per-worker budget:
+
+    (DB_MAX_CONNECTIONS - DB_RESERVED_CONNECTIONS) / WEB_CONCURRENCY
+
+so scaling uvicorn workers never pushes RDS past max_connections. Every pool
+reports in-use/idle counts, and asyncpg acquires are timed so wait time and
+acquire latency are visible at /health/db.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Fraction of the per-worker budget each pool may use
+POOL_SHARES = {
+    "sqlalchemy": 0.2,        # sync ORM engine (legacy get_db)
+    "sqlalchemy_async": 0.3,  # AsyncSession engine
+    "courses": 0.3,           # CourseRepository + generation jobs
+    "auth": 0.2,              # PostgreSQLAuthService + /auth endpoints
+}
+
+
+class PoolStats:
+    """Acquire counters and latency samples for one pool"""
+
+    def __init__(self, samples: int = 1024):
+        self.acquires = 0
+        self.timeouts = 0
+        self.waiting = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._latencies = deque(maxlen=samples)
+
+    def record(self, seconds: float):
+        self.acquires += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        self._latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+
+        return {
+            "acquires": self.acquires,
+            "timeouts": self.timeouts,
+            "waiting": self.waiting,
+            "acquire_ms_avg": round(1000 * self.total_wait / self.acquires, 3) if self.acquires else 0.0,
+            "acquire_ms_p50": round(1000 * percentile(0.50), 3),
+            "acquire_ms_p95": round(1000 * percentile(0.95), 3),
+            "acquire_ms_max": round(1000 * self.max_wait, 3),
+        }
+
+
+class MeteredPool:
+    """asyncpg pool wrapper whose acquire() records wait time"""
+
+    def __init__(self, pool: asyncpg.Pool, stats: PoolStats):
+        self._pool = pool
+        self.stats = stats
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        start = time.perf_counter()
+        self.stats.waiting += 1
+        try:
+            conn = await self._pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            self.stats.waiting -= 1
+        self.stats.record(time.perf_counter() - start)
+
+        try:
+            yield conn
+        finally:
+            await self._pool.release(conn)
+
+    def __getattr__(self, name):
+        # close(), get_size(), execute(), ... go straight to the real pool
+        return getattr(self._pool, name)
+
+
+class DatabasePoolManager:
+    """Creates, budgets, meters and closes every database pool"""
+
+    def __init__(self):
+        self.workers = max(1, settings.WEB_CONCURRENCY)
+        self.worker_budget = max(
+            len(POOL_SHARES),
+            (settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS) // self.workers
+        )
+        self._pools: Dict[str, MeteredPool] = {}
+        self._pool_options: Dict[str, Dict[str, Any]] = {}
+        self._engines: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+
+    def size_for(self, name: str) -> int:
+        """Maximum connections pool `name` may hold in this worker"""
+        return max(1, int(self.worker_budget * POOL_SHARES[name]))
+
+    def configure(self, name: str, **options):
+        """Set extra asyncpg.create_pool options (init, statement cache, ...) for a named pool"""
+        if name not in POOL_SHARES:
+            raise ValueError(f"Unknown pool: {name}")
+        self._pool_options[name] = options
+
+    def register_engine(self, name: str, engine):
+        """Track a SQLAlchemy Engine/AsyncEngine for stats and shutdown"""
+        self._engines[name] = engine
+
+    async def get_pool(self, name: str) -> MeteredPool:
+        """Get (lazily creating) the named asyncpg pool"""
+        pool = self._pools.get(name)
+        if pool is not None:
+            return pool
+
+        async with self._lock:
+            if name not in self._pools:
+                max_size = self.size_for(name)
+                raw_pool = await asyncpg.create_pool(
+                    host=settings.DATABASE_HOST,
+                    port=int(settings.DATABASE_PORT),
+                    user=settings.DATABASE_USER,
+                    password=settings.DATABASE_PASSWORD,
+                    database=settings.DATABASE_NAME,
+                    ssl='require',  # Required for AWS RDS
+                    min_size=min(settings.DB_POOL_MIN_SIZE, max_size),
+                    max_size=max_size,
+                    max_inactive_connection_lifetime=300,
+                    **self._pool_options.get(name, {})
+                )
+                self._pools[name] = MeteredPool(raw_pool, PoolStats())
+                logger.info(f"Created '{name}' pool (max={max_size})")
+
+        return self._pools[name]
+
+    @asynccontextmanager
+    async def acquire(self, name: str, timeout: Optional[float] = None):
+        """Borrow a connection from the named asyncpg pool"""
+        pool = await self.get_pool(name)
+        async with pool.acquire(timeout=timeout) as conn:
+            yield conn
+
+    def stats(self) -> Dict[str, Any]:
+        """Budget plus in-use/idle/latency figures for every pool"""
+        pools: Dict[str, Any] = {}
+
+        for name, pool in self._pools.items():
+            size = pool.get_size()
+            idle = pool.get_idle_size()
+            pools[name] = {
+                "driver": "asyncpg",
+                "max_size": pool.get_max_size(),
+                "size": size,
+                "in_use": size - idle,
+                "idle": idle,
+                **pool.stats.snapshot(),
+            }
+
+        for name, engine in self._engines.items():
+            sa_pool = getattr(engine, "sync_engine", engine).pool
+            pools[name] = {
+                "driver": "sqlalchemy",
+                "max_size": self.size_for(name),
+                "size": sa_pool.size(),
+                "in_use": sa_pool.checkedout(),
+                "idle": sa_pool.checkedin(),
+                "overflow": sa_pool.overflow(),
+            }
+
+        return {
+            "max_connections": settings.DB_MAX_CONNECTIONS,
+            "reserved_connections": settings.DB_RESERVED_CONNECTIONS,
+            "workers": self.workers,
+            "worker_budget": self.worker_budget,
+            "allocated": sum(self.size_for(name) for name in POOL_SHARES),
+            "pools": pools,
+        }
+
+    async def close_pool(self, name: str):
+        """Close one named asyncpg pool; it is recreated on next use"""
+        pool = self._pools.pop(name, None)
+        if pool is not None:
+            await pool.close()
+            logger.info(f"Closed '{name}' pool")
+
+    async def close_all(self):
+        """Close every pool and dispose every engine (application shutdown)"""
+        for name in list(self._pools):
+            await self.close_pool(name)
+
+        for engine in self._engines.values():
+            if hasattr(engine, "sync_engine"):
+                await engine.dispose()
+            else:
+                engine.dispose()
+
+
+# Global pool manager
+db_pools = DatabasePoolManager()
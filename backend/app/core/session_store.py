@@ -0,0 +1,91 @@
+"""
+Session stores - bounded, expiring key/value storage for conversational state
+
+Values are opaque bytes (callers serialize). Two backends:
+
+- MemorySessionStore: per-process LRU + TTL (single worker / development)
+- RedisSessionStore: any redis.asyncio-compatible client, so every uvicorn
+  worker or instance can resume any session
+
+Pick one with SESSION_STORE_BACKEND ("memory" or "redis") and REDIS_URL.
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+class SessionStore(ABC):
+    """Interface for session backends"""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> Optional[bytes]:
+        """The stored value, or None if missing or expired"""
+
+    @abstractmethod
+    async def set(self, session_id: str, data: bytes) -> None:
+        """Store a value, resetting its TTL"""
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session; True if it existed"""
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU + TTL store; memory stays bounded by max_sessions"""
+
+    def __init__(self, ttl_seconds: int, max_sessions: int):
+        self._cache = TTLCache(ttl_seconds, max_size=max_sessions)
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        return self._cache.get(session_id)
+
+    async def set(self, session_id: str, data: bytes) -> None:
+        self._cache.set(session_id, data)
+
+    async def delete(self, session_id: str) -> bool:
+        existed = self._cache.get(session_id) is not None
+        self._cache.delete(session_id)
+        return existed
+
+
+class RedisSessionStore(SessionStore):
+    """Redis-backed store; every write resets the session's expiry"""
+
+    def __init__(self, client, ttl_seconds: int, prefix: str = "session:"):
+        self._client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.prefix}{session_id}"
+
+    async def get(self, session_id: str) -> Optional[bytes]:
+        return await self._client.get(self._key(session_id))
+
+    async def set(self, session_id: str, data: bytes) -> None:
+        await self._client.set(self._key(session_id), data, ex=self.ttl_seconds)
+
+    async def delete(self, session_id: str) -> bool:
+        return bool(await self._client.delete(self._key(session_id)))
+
+
+def create_session_store(prefix: str, ttl_seconds: int, max_sessions: int) -> SessionStore:
+    """Build the configured session store backend"""
+    if settings.SESSION_STORE_BACKEND == "redis":
+        if aioredis is None:
+            raise RuntimeError("SESSION_STORE_BACKEND=redis requires the 'redis' package")
+        client = aioredis.from_url(settings.REDIS_URL)
+        logger.info(f"Using Redis session store for '{prefix}'")
+        return RedisSessionStore(client, ttl_seconds, prefix=f"{prefix}:")
+
+    return MemorySessionStore(ttl_seconds, max_sessions)
@@ -3,6 +3,8 @@ import os
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.db_pool import db_pools
+from app.core.activity_log import flush_activity_logs
 from app.api.router import api_router
 
 def create_application() -> FastAPI:
@@ -20,6 +22,27 @@ def create_application() -> FastAPI:
     )
     
     app.include_router(api_router, prefix=settings.API_V1_STR)
+
+    @app.on_event("startup")
+    async def open_database_pools():
+        # Warm the course pool so the first request doesn't pay the handshakes
+        try:
+            await db_pools.get_pool("courses")
+        except Exception as e:
+            print(f"⚠️  Course DB pool not available at startup: {e}")
+
+    @app.on_event("shutdown")
+    async def close_database_pools():
+        # Write out buffered activity logs while the pools are still open
+        await flush_activity_logs()
+        await db_pools.close_all()
+
+        try:
+            from app.models.user_model.password_hasher import password_hasher
+            password_hasher.shutdown()
+        except ImportError:
+            pass
+
     return app
 
 app = create_application()
@@ -7,7 +7,7 @@ import json
 import uuid
 import re
 import asyncio
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, AsyncIterator
 from datetime import datetime
 import boto3
 from botocore.exceptions import ClientError
@@ -141,15 +141,13 @@ class BedrockCourseGenerator:
                     }
                 }
             
-            # Make the API call
-            response = self.bedrock_client.invoke_model(
-                modelId=full_model_id,
-                body=json.dumps(body)
+            # Make the API call off the event loop so concurrent module
+            # generations actually overlap instead of serializing on boto3
+            response_body = await asyncio.to_thread(
+                self._invoke_model_sync, full_model_id, body
             )
             
             # Parse response based on model type
-            response_body = json.loads(response['body'].read())
-            
             if "anthropic.claude" in full_model_id or "eu.anthropic.claude" in full_model_id:
                 return response_body['content'][0]['text']
             elif "amazon.titan" in full_model_id:
@@ -170,6 +168,14 @@ class BedrockCourseGenerator:
             print(f"Bedrock invocation error: {e}")
             return self._generate_template_content(prompt)
     
+    def _invoke_model_sync(self, full_model_id: str, body: Dict) -> Dict:
+        """Blocking Bedrock call, run in a worker thread by invoke_bedrock_model"""
+        response = self.bedrock_client.invoke_model(
+            modelId=full_model_id,
+            body=json.dumps(body)
+        )
+        return json.loads(response['body'].read())
+    
     def _generate_template_content(self, prompt: str) -> str:
         """Fallback template generation when Bedrock is unavailable"""
         topic = "the subject"
@@ -582,7 +588,7 @@ Course Context: {course_context}"""
         print(f"📋 Generated course outline with {len(course_outline.get('modules', []))} modules")
 
         # Generate modules with AI-powered content (in parallel for speed)
-        course_context = f"Course: {course_outline['title']} | Level: {request.level.value} | Topic: {request.topic}"
+        course_context = self._build_course_context(course_outline, request)
 
         module_outlines = course_outline.get('modules', [])
         print(f"⚡ Generating {len(module_outlines)} modules in parallel...")
@@ -603,6 +609,97 @@ Course Context: {course_context}"""
             synthesis_result = await self.synthesize_course(course_outline, modules, request)
             print(f"📊 Synthesis recommendations: {len(synthesis_result.get('quality_recommendations', []))} improvements identified")
 
+        course = self._assemble_course(request, course_outline, modules, synthesis_result)
+        
+        # Save to repository
+        course_id = await self.repository.save_course(course)
+        print(f"✅ Course saved to repository: {course_id}")
+        
+        return course
+
+    async def generate_course_stream(self, request: CourseRequest) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Generate a course and yield progress events as each stage finishes.
+
+        Events (in order): ``outline``, one ``module`` per module in completion
+        order, ``synthesis`` (only when enabled), ``saved`` and ``complete``.
+        Module generation runs concurrently; if the consumer stops iterating
+        (e.g. the client disconnected), any module still in flight is cancelled.
+        """
+        print(f"🚀 Starting streamed Bedrock course generation for: {request.topic}")
+
+        course_outline = await self.generate_course_outline(request)
+        module_outlines = course_outline.get('modules', [])
+        yield {
+            "type": "outline",
+            "title": course_outline['title'],
+            "description": course_outline['description'],
+            "modules": [
+                {"index": i, "title": m.get('title'), "description": m.get('description')}
+                for i, m in enumerate(module_outlines)
+            ],
+            "prerequisites": course_outline.get('prerequisites', []),
+            "tags": course_outline.get('tags', []),
+            "module_count": len(module_outlines)
+        }
+
+        course_context = self._build_course_context(course_outline, request)
+
+        async def _indexed_module(module_outline: Dict, index: int):
+            module = await self.generate_module_content(module_outline, index, request, course_context)
+            return index, module
+
+        tasks = [
+            asyncio.create_task(_indexed_module(module_outline, i))
+            for i, module_outline in enumerate(module_outlines)
+        ]
+        modules: List[Optional[CourseModule]] = [None] * len(tasks)
+
+        try:
+            for completed, next_done in enumerate(asyncio.as_completed(tasks), start=1):
+                index, module = await next_done
+                modules[index] = module
+                yield {
+                    "type": "module",
+                    "index": index,
+                    "completed": completed,
+                    "total": len(tasks),
+                    "module": module.dict()
+                }
+        finally:
+            # Consumer went away or a module failed: don't leave work running
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        synthesis_result = None
+        if request.enable_synthesis:
+            synthesis_result = await self.synthesize_course(course_outline, modules, request)
+            yield {"type": "synthesis", "synthesis": synthesis_result}
+
+        course = self._assemble_course(request, course_outline, modules, synthesis_result)
+        course_id = await self.repository.save_course(course)
+        print(f"✅ Streamed course saved to repository: {course_id}")
+        yield {"type": "saved", "course_id": course_id}
+
+        yield {
+            "type": "complete",
+            "course_id": course.course_id,
+            "title": course.title,
+            "slug": course.slug,
+            "module_count": len(course.modules),
+            "quality_score": course.metadata.get('quality_score')
+        }
+
+    def _build_course_context(self, course_outline: Dict, request: CourseRequest) -> str:
+        """Short course summary passed to every module prompt"""
+        return f"Course: {course_outline['title']} | Level: {request.level.value} | Topic: {request.topic}"
+
+    def _assemble_course(self, request: CourseRequest, course_outline: Dict,
+                         modules: List[CourseModule],
+                         synthesis_result: Optional[Dict[str, Any]] = None,
+                         course_id: Optional[str] = None) -> GeneratedCourse:
+        """Build the final course object from the outline, generated modules and synthesis"""
         # Create learning path (enhanced with synthesis if available)
         if synthesis_result and synthesis_result.get('learning_path_enhancements'):
             enhancements = synthesis_result['learning_path_enhancements']
@@ -633,8 +730,8 @@ Course Context: {course_context}"""
             )
         
         # Create complete course
-        course = GeneratedCourse(
-            course_id=self.generate_course_id(),
+        return GeneratedCourse(
+            course_id=course_id or self.generate_course_id(),
             title=course_outline['title'],
             slug=self.generate_slug(course_outline['title']),
             description=course_outline['description'],
@@ -664,12 +761,6 @@ Course Context: {course_context}"""
                 "quality_score": synthesis_result.get('overall_quality_score', {}).get('score') if synthesis_result else None
             }
         )
-        
-        # Save to repository
-        course_id = await self.repository.save_course(course)
-        print(f"✅ Course saved to repository: {course_id}")
-        
-        return course
     
     async def regenerate_module(self, course_id: str, module_index: int, 
                               custom_prompt: str = None) -> CourseModule:
@@ -0,0 +1,391 @@
+"""
+Course Generation Jobs - Durable background generation
+Runs BedrockCourseGenerator stages outside the HTTP request and checkpoints
+every finished stage (outline, each module, synthesis) to PostgreSQL, so a
+crashed or restarted worker resumes where it stopped instead of paying for
+the same model calls twice.
+"""
+import asyncio
+import json
+import os
+import socket
+import uuid
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+from app.core.db_pool import db_pools
+from .course_models import CourseRequest, CourseModule
+
+
+class JobStatus:
+    """Lifecycle states stored in course_generation_jobs.status"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class JobStage:
+    """Last stage a job is working on, for progress reporting"""
+    OUTLINE = "outline"
+    MODULES = "modules"
+    SYNTHESIS = "synthesis"
+    SAVING = "saving"
+    DONE = "done"
+
+
+def _load_json(value: Any) -> Any:
+    """Tolerate json values that were stored as encoded strings"""
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+class CourseJobStore:
+    """Persistence for generation jobs and their per-stage checkpoints"""
+
+    def _acquire(self):
+        """Borrow a connection from the shared "courses" pool"""
+        return db_pools.acquire("courses")
+
+    async def create_job(self, request: CourseRequest, course_id: str) -> str:
+        """Insert a queued job; the course_id is fixed up front so re-saves are idempotent"""
+        job_id = f"course_job_{uuid.uuid4().hex[:16]}"
+        async with self._acquire() as conn:
+            await conn.execute("""
+                INSERT INTO course_generation_jobs (job_id, course_id, status, stage, request)
+                VALUES ($1, $2, $3, $4, $5)
+            """, job_id, course_id, JobStatus.QUEUED, JobStage.OUTLINE,
+                request.dict())
+            return job_id
+
+    async def claim_job(self, job_id: str, worker_id: str, stale_after: int) -> Optional[Dict]:
+        """
+        Atomically take ownership of a job.
+
+        Succeeds for queued jobs and for running jobs whose owner stopped
+        heartbeating, so two processes never run the same job at once.
+        """
+        async with self._acquire() as conn:
+            row = await conn.fetchrow("""
+                UPDATE course_generation_jobs
+                SET status = $2, worker_id = $3, heartbeat_at = NOW(),
+                    attempts = attempts + 1, updated_at = NOW()
+                WHERE job_id = $1
+                  AND (status = $4
+                       OR (status = $2 AND heartbeat_at < NOW() - make_interval(secs => $5)))
+                RETURNING *
+            """, job_id, JobStatus.RUNNING, worker_id, JobStatus.QUEUED, float(stale_after))
+
+            return self._row_to_job(row) if row else None
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> None:
+        """Refresh the lease on a running job"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs SET heartbeat_at = NOW()
+                WHERE job_id = $1 AND worker_id = $2 AND status = $3
+            """, job_id, worker_id, JobStatus.RUNNING)
+
+    async def save_outline(self, job_id: str, outline: Dict) -> None:
+        """Checkpoint the course outline"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs
+                SET outline = $2, modules_total = $3, stage = $4, updated_at = NOW()
+                WHERE job_id = $1
+            """, job_id, outline, len(outline.get('modules', [])), JobStage.MODULES)
+
+    async def save_module(self, job_id: str, index: int, module: CourseModule) -> None:
+        """Checkpoint one generated module"""
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("""
+                    INSERT INTO course_generation_job_modules (job_id, module_index, module)
+                    VALUES ($1, $2, $3)
+                    ON CONFLICT (job_id, module_index) DO UPDATE SET module = EXCLUDED.module
+                """, job_id, index, module.dict())
+                await conn.execute("""
+                    UPDATE course_generation_jobs
+                    SET modules_completed = (
+                            SELECT COUNT(*) FROM course_generation_job_modules WHERE job_id = $1
+                        ),
+                        updated_at = NOW()
+                    WHERE job_id = $1
+                """, job_id)
+
+    async def get_modules(self, job_id: str) -> Dict[int, Dict]:
+        """Already generated modules for a job, keyed by module index"""
+        async with self._acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT module_index, module FROM course_generation_job_modules
+                WHERE job_id = $1
+            """, job_id)
+            return {row['module_index']: _load_json(row['module']) for row in rows}
+
+    async def save_synthesis(self, job_id: str, synthesis: Optional[Dict]) -> None:
+        """Checkpoint the synthesis result and move on to saving the course"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs
+                SET synthesis = $2, stage = $3, updated_at = NOW()
+                WHERE job_id = $1
+            """, job_id, synthesis, JobStage.SAVING)
+
+    async def set_stage(self, job_id: str, stage: str) -> None:
+        """Record the stage a job is currently in"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs SET stage = $2, updated_at = NOW()
+                WHERE job_id = $1
+            """, job_id, stage)
+
+    async def complete_job(self, job_id: str) -> None:
+        """Mark a job finished; its course is now in the courses table"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs
+                SET status = $2, stage = $3, error = NULL,
+                    completed_at = NOW(), updated_at = NOW()
+                WHERE job_id = $1
+            """, job_id, JobStatus.COMPLETED, JobStage.DONE)
+
+    async def fail_job(self, job_id: str, error: str) -> None:
+        """Mark a job failed; checkpoints are kept so it can be retried"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs
+                SET status = $2, error = $3, updated_at = NOW()
+                WHERE job_id = $1
+            """, job_id, JobStatus.FAILED, error)
+
+    async def release_job(self, job_id: str, worker_id: str) -> None:
+        """Hand a job back to the queue (used on graceful shutdown)"""
+        async with self._acquire() as conn:
+            await conn.execute("""
+                UPDATE course_generation_jobs
+                SET status = $3, worker_id = NULL, updated_at = NOW()
+                WHERE job_id = $1 AND worker_id = $2 AND status = $4
+            """, job_id, worker_id, JobStatus.QUEUED, JobStatus.RUNNING)
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """Fetch a job's current state"""
+        async with self._acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT * FROM course_generation_jobs WHERE job_id = $1",
+                job_id
+            )
+            return self._row_to_job(row) if row else None
+
+    async def list_resumable_jobs(self, stale_after: int) -> List[str]:
+        """Queued jobs plus running jobs whose worker stopped heartbeating"""
+        async with self._acquire() as conn:
+            rows = await conn.fetch("""
+                SELECT job_id FROM course_generation_jobs
+                WHERE status = $1
+                   OR (status = $2 AND heartbeat_at < NOW() - make_interval(secs => $3))
+                ORDER BY created_at
+            """, JobStatus.QUEUED, JobStatus.RUNNING, float(stale_after))
+            return [row['job_id'] for row in rows]
+
+    def _row_to_job(self, row) -> Dict:
+        job = dict(row)
+        for field in ('request', 'outline', 'synthesis'):
+            if job.get(field) is not None:
+                job[field] = _load_json(job[field])
+        return job
+
+
+class CourseJobRunner:
+    """Local worker pool that drains the generation job queue"""
+
+    def __init__(self, store: Optional[CourseJobStore] = None,
+                 workers: Optional[int] = None,
+                 stale_after: Optional[int] = None,
+                 heartbeat_interval: int = 15,
+                 sweep_interval: Optional[int] = None):
+        self.store = store or CourseJobStore()
+        self.workers = workers or settings.COURSE_JOB_WORKERS
+        self.stale_after = stale_after or settings.COURSE_JOB_STALE_SECONDS
+        self.heartbeat_interval = heartbeat_interval
+        self.sweep_interval = sweep_interval or settings.COURSE_JOB_SWEEP_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._queued: Set[str] = set()
+        self._tasks: List[asyncio.Task] = []
+        self._running_jobs: Dict[str, asyncio.Task] = {}
+        self._generator = None
+
+    @property
+    def started(self) -> bool:
+        return bool(self._tasks)
+
+    def _get_generator(self):
+        # Imported lazily: constructing the generator sets up the Bedrock client
+        if self._generator is None:
+            from .bedrock_course_generator import BedrockCourseGenerator
+            self._generator = BedrockCourseGenerator()
+        return self._generator
+
+    async def start(self) -> None:
+        """Spawn workers and the sweeper that re-enqueues abandoned jobs"""
+        if self.started:
+            return
+
+        for n in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(n)))
+        self._tasks.append(asyncio.create_task(self._sweeper()))
+
+        print(f"👷 Course job runner started with {self.workers} workers")
+
+    def _enqueue(self, job_id: str) -> bool:
+        """Queue a job unless it is already queued or running here"""
+        if job_id in self._queued or job_id in self._running_jobs:
+            return False
+        self._queued.add(job_id)
+        self._queue.put_nowait(job_id)
+        return True
+
+    async def sweep(self) -> None:
+        """
+        Queue queued jobs and running jobs whose worker stopped heartbeating.
+
+        Runs at startup and then periodically, so jobs abandoned by a crash
+        are picked up even when the restart came before they went stale.
+        """
+        try:
+            for job_id in await self.store.list_resumable_jobs(self.stale_after):
+                if self._enqueue(job_id):
+                    print(f"♻️  Resuming course generation job: {job_id}")
+        except Exception as e:
+            print(f"⚠️  Could not load resumable course jobs: {e}")
+
+    async def _sweeper(self) -> None:
+        while True:
+            await self.sweep()
+            await asyncio.sleep(self.sweep_interval)
+
+    async def stop(self) -> None:
+        """Cancel workers and return in-flight jobs to the queue"""
+        in_flight = list(self._running_jobs)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+        for job_id in in_flight:
+            try:
+                await self.store.release_job(job_id, self.worker_id)
+            except Exception as e:
+                print(f"⚠️  Could not release course job {job_id}: {e}")
+        self._running_jobs.clear()
+        self._queued.clear()
+
+    async def submit(self, request: CourseRequest) -> Dict:
+        """Persist a new job and schedule it on the local pool"""
+        course_id = self._get_generator().generate_course_id()
+        job_id = await self.store.create_job(request, course_id)
+        self._enqueue(job_id)
+        return {"job_id": job_id, "course_id": course_id, "status": JobStatus.QUEUED}
+
+    async def _worker(self, n: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            self._queued.discard(job_id)
+            try:
+                job = await self.store.claim_job(job_id, self.worker_id, self.stale_after)
+                if job is None:
+                    # Finished, failed, or owned by a live worker elsewhere
+                    continue
+
+                self._running_jobs[job_id] = asyncio.current_task()
+                await self._run_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"❌ Course job {job_id} failed: {e}")
+                try:
+                    await self.store.fail_job(job_id, str(e))
+                except Exception as store_error:
+                    print(f"⚠️  Could not record failure for {job_id}: {store_error}")
+            finally:
+                self._running_jobs.pop(job_id, None)
+                self._queue.task_done()
+
+    async def _heartbeat(self, job_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                await self.store.heartbeat(job_id, self.worker_id)
+            except Exception as e:
+                print(f"⚠️  Heartbeat failed for course job {job_id}: {e}")
+
+    async def _run_job(self, job: Dict) -> None:
+        """Run the remaining stages of a job, skipping everything already checkpointed"""
+        job_id = job['job_id']
+        generator = self._get_generator()
+        request = CourseRequest(**job['request'])
+        print(f"🚀 Running course job {job_id} (attempt {job['attempts']})")
+
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            # Stage 1: outline
+            course_outline = job.get('outline')
+            if course_outline is None:
+                course_outline = await generator.generate_course_outline(request)
+                await self.store.save_outline(job_id, course_outline)
+            else:
+                await self.store.set_stage(job_id, JobStage.MODULES)
+
+            # Stage 2: modules - only the ones not checkpointed yet
+            module_outlines = course_outline.get('modules', [])
+            done = {
+                index: CourseModule(**data)
+                for index, data in (await self.store.get_modules(job_id)).items()
+            }
+            missing = [i for i in range(len(module_outlines)) if i not in done]
+            if done:
+                print(f"⏭️  Job {job_id}: {len(done)} modules restored, {len(missing)} to generate")
+
+            course_context = generator._build_course_context(course_outline, request)
+
+            async def _generate_and_save(index: int):
+                module = await generator.generate_module_content(
+                    module_outlines[index], index, request, course_context
+                )
+                await self.store.save_module(job_id, index, module)
+                return index, module
+
+            tasks = [asyncio.create_task(_generate_and_save(i)) for i in missing]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    index, module = await next_done
+                    done[index] = module
+            finally:
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+
+            modules = [done[i] for i in range(len(module_outlines))]
+
+            # Stage 3: synthesis
+            synthesis_result = job.get('synthesis')
+            if request.enable_synthesis and synthesis_result is None:
+                await self.store.set_stage(job_id, JobStage.SYNTHESIS)
+                synthesis_result = await generator.synthesize_course(course_outline, modules, request)
+            await self.store.save_synthesis(job_id, synthesis_result)
+
+            # Stage 4: save under the job's fixed course_id (upsert on resume)
+            course = generator._assemble_course(
+                request, course_outline, modules, synthesis_result, course_id=job['course_id']
+            )
+            await generator.repository.save_course(course)
+            await self.store.complete_job(job_id)
+            print(f"✅ Course job {job_id} completed: {course.course_id}")
+        finally:
+            heartbeat.cancel()
+
+
+# Process-wide runner, started from the bedrock courses router
+course_job_runner = CourseJobRunner()
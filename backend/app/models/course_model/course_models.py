@@ -158,6 +158,43 @@ class CourseProgress(BaseModel):
     certificate_issued: bool = False
 
 
+class ProgressEvent(BaseModel):
+    """One progress event (a module viewed) for an enrolled course"""
+    course_id: str
+    module_id: str
+    progress_percentage: float = Field(..., ge=0, le=100, description="Overall course progress")
+    time_spent_minutes: int = Field(0, ge=0)
+    module_completed: bool = False
+
+
+class BulkProgressUpdate(BaseModel):
+    """Batch of progress events applied in one statement"""
+    updates: List[ProgressEvent] = Field(..., min_length=1, max_length=500)
+
+
+class ProgressUpdateResult(BaseModel):
+    """Enrollment state after a bulk progress update"""
+    course_id: str
+    overall_progress: float  # 0.0 to 1.0
+    current_module: Optional[str]
+    modules_completed: List[str]
+    completion_status: str
+    newly_completed: bool
+
+
+class BulkProgressUpdateResponse(BaseModel):
+    """Bulk progress update response"""
+    updated: List[ProgressUpdateResult]
+    not_found: List[str]
+
+
+class DashboardStats(BaseModel):
+    """Counters shown on a user's dashboard"""
+    courses_created: int
+    total_enrollments: int
+    courses_completed: int
+
+
 class CourseExport(BaseModel):
     """Export configuration for courses"""
     course_id: str
@@ -6,108 +6,147 @@ import json
 import asyncpg
 from typing import List, Optional, Dict
 from datetime import datetime
-from .course_models import GeneratedCourse, CourseProgress
+from .course_models import GeneratedCourse, CourseProgress, ProgressEvent
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.db_pool import db_pools
+
+
+# Insert-or-update keyed on the unique course_id (migration 008)
+_UPSERT_COURSE_SQL = """
+    INSERT INTO courses (
+        course_id, title, slug, description, level, duration,
+        modules, prerequisites, learning_objectives,
+        target_audience, learning_path, databank_resources,
+        tags, language, status, access_type,
+        created_at, updated_at, created_by, course_metadata,
+        module_count, uses_bedrock
+    ) VALUES (
+        $1, $2, $3, $4, $5, $6,
+        $7::jsonb, $8::jsonb, $9::jsonb,
+        $10, $11::jsonb, $12::jsonb,
+        $13::jsonb, $14, $15, $16,
+        $17, $18, $19, $20::jsonb,
+        $21, $22
+    )
+    ON CONFLICT (course_id) DO UPDATE SET
+        title = EXCLUDED.title, slug = EXCLUDED.slug, description = EXCLUDED.description,
+        level = EXCLUDED.level, duration = EXCLUDED.duration,
+        modules = EXCLUDED.modules, prerequisites = EXCLUDED.prerequisites,
+        learning_objectives = EXCLUDED.learning_objectives,
+        target_audience = EXCLUDED.target_audience, learning_path = EXCLUDED.learning_path,
+        databank_resources = EXCLUDED.databank_resources,
+        tags = EXCLUDED.tags, language = EXCLUDED.language, status = EXCLUDED.status,
+        access_type = EXCLUDED.access_type, updated_at = EXCLUDED.updated_at,
+        created_by = EXCLUDED.created_by, course_metadata = EXCLUDED.course_metadata,
+        module_count = EXCLUDED.module_count, uses_bedrock = EXCLUDED.uses_bedrock
+"""
 
+# Add to a user's enrollment counters (migration 014), creating the row on
+# first write; runs in the caller's transaction
+_BUMP_DASHBOARD_STATS_SQL = """
+    INSERT INTO user_dashboard_stats (user_email, total_enrollments, courses_completed)
+    VALUES ($1, GREATEST($2, 0), GREATEST($3, 0))
+    ON CONFLICT (user_email) DO UPDATE SET
+        total_enrollments = GREATEST(user_dashboard_stats.total_enrollments + $2, 0),
+        courses_completed = GREATEST(user_dashboard_stats.courses_completed + $3, 0),
+        updated_at = NOW()
+"""
 
-class CourseRepository:
-    """Repository for course storage and retrieval using PostgreSQL"""
+# Read-through cache for dashboard stats, keyed by user email; the writers
+# above drop the user's entry after commit
+_dashboard_cache = TTLCache(settings.DASHBOARD_STATS_CACHE_TTL_SECONDS)
+
+# Upper bound for a single page of search results
+SEARCH_MAX_LIMIT = 100
+
+# Card/list projection: everything except the heavy module bodies and the
+# synthesis report stored in the metadata (migration 009 adds the summary columns)
+_COURSE_SUMMARY_COLUMNS = """
+    id, course_id, title, slug, description, level, duration, tags,
+    status, language, access_type, module_count, uses_bedrock,
+    created_at, updated_at, created_by,
+    course_metadata::jsonb - 'synthesis_result' AS course_metadata
+"""
 
-    def __init__(self):
-        """Initialize repository with PostgreSQL connection settings"""
-        self.host = settings.DATABASE_HOST
-        self.port = int(settings.DATABASE_PORT)
-        self.user = settings.DATABASE_USER
-        self.password = settings.DATABASE_PASSWORD
-        self.database = settings.DATABASE_NAME
-
-    async def _get_connection(self):
-        """Get a database connection"""
-        return await asyncpg.connect(
-            host=self.host,
-            port=self.port,
-            user=self.user,
-            password=self.password,
-            database=self.database,
-            ssl='require'
+
+def _encode_json(value) -> str:
+    # Enums and datetimes inside model dumps fall back to their string form
+    return json.dumps(value, default=str)
+
+
+async def _init_connection(conn: asyncpg.Connection):
+    """Let asyncpg encode/decode json and jsonb values directly"""
+    for type_name in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            type_name,
+            encoder=_encode_json,
+            decoder=json.loads,
+            schema='pg_catalog'
         )
 
-    async def save_course(self, course: GeneratedCourse) -> str:
-        """Save a generated course to PostgreSQL"""
-        conn = await self._get_connection()
 
-        try:
-            # Check if course already exists
-            existing = await conn.fetchval(
-                "SELECT id FROM courses WHERE course_id = $1",
-                course.course_id
-            )
+# Course storage uses the "courses" pool of the shared pool manager
+db_pools.configure(
+    "courses",
+    init=_init_connection,
+    statement_cache_size=settings.COURSE_DB_STATEMENT_CACHE_SIZE
+)
 
-            if existing:
-                # Update existing course
-                await conn.execute("""
-                    UPDATE courses SET
-                        title = $1, slug = $2, description = $3, level = $4, duration = $5,
-                        modules = $6, prerequisites = $7, learning_objectives = $8,
-                        target_audience = $9, learning_path = $10, databank_resources = $11,
-                        tags = $12, language = $13, status = $14, access_type = $15,
-                        updated_at = $16, created_by = $17, course_metadata = $18
-                    WHERE course_id = $19
-                """,
-                    course.title, course.slug, course.description, course.level.value, course.duration,
-                    json.dumps([m.dict() for m in course.modules]),
-                    json.dumps(course.prerequisites),
-                    json.dumps(course.learning_objectives),
-                    course.target_audience,
-                    json.dumps(course.learning_path.dict()),
-                    json.dumps(course.databank_resources),
-                    json.dumps(course.tags),
-                    course.language,
-                    course.status.value,
-                    course.access_type.value,
-                    course.updated_at.isoformat(),
-                    course.created_by,
-                    json.dumps(course.metadata),
-                    course.course_id
-                )
-            else:
-                # Insert new course
-                await conn.execute("""
-                    INSERT INTO courses (
-                        course_id, title, slug, description, level, duration,
-                        modules, prerequisites, learning_objectives,
-                        target_audience, learning_path, databank_resources,
-                        tags, language, status, access_type,
-                        created_at, updated_at, created_by, course_metadata
-                    ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18, $19, $20)
-                """,
-                    course.course_id, course.title, course.slug, course.description,
-                    course.level.value, course.duration,
-                    json.dumps([m.dict() for m in course.modules]),
-                    json.dumps(course.prerequisites),
-                    json.dumps(course.learning_objectives),
-                    course.target_audience,
-                    json.dumps(course.learning_path.dict()),
-                    json.dumps(course.databank_resources),
-                    json.dumps(course.tags),
-                    course.language,
-                    course.status.value,
-                    course.access_type.value,
-                    course.created_at.isoformat(),
-                    course.updated_at.isoformat(),
-                    course.created_by,
-                    json.dumps(course.metadata)
-                )
 
-            return course.course_id
-        finally:
-            await conn.close()
+class CourseRepository:
+    """Repository for course storage and retrieval using PostgreSQL"""
+
+    def _acquire(self):
+        """Borrow a connection from the shared "courses" pool"""
+        return db_pools.acquire("courses")
+
+    async def save_course(self, course: GeneratedCourse) -> str:
+        """Save (insert or update) a generated course in a single round trip"""
+        async with self._acquire() as conn:
+            await conn.execute(_UPSERT_COURSE_SQL, *self._course_params(course))
+
+        return course.course_id
+
+    async def save_courses(self, courses: List[GeneratedCourse]) -> List[str]:
+        """Save many courses at once (bulk imports); all or nothing"""
+        if not courses:
+            return []
+
+        records = [self._course_params(course) for course in courses]
+
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                await conn.executemany(_UPSERT_COURSE_SQL, records)
+
+        return [course.course_id for course in courses]
+
+    def _course_params(self, course: GeneratedCourse) -> tuple:
+        """Positional parameters for _UPSERT_COURSE_SQL; JSON columns are encoded by the pool codec"""
+        return (
+            course.course_id, course.title, course.slug, course.description,
+            course.level.value, course.duration,
+            [m.dict() for m in course.modules],
+            course.prerequisites,
+            course.learning_objectives,
+            course.target_audience,
+            course.learning_path.dict(),
+            course.databank_resources,
+            course.tags,
+            course.language,
+            course.status.value,
+            course.access_type.value,
+            course.created_at.isoformat(),
+            course.updated_at.isoformat(),
+            course.created_by,
+            course.metadata,
+            len(course.modules),
+            bool(course.metadata.get('uses_bedrock', False))
+        )
 
     async def get_course(self, course_id: str) -> Optional[Dict]:
         """Retrieve a course by course_id"""
-        conn = await self._get_connection()
-
-        try:
+        async with self._acquire() as conn:
             row = await conn.fetchrow(
                 "SELECT * FROM courses WHERE course_id = $1",
                 course_id
@@ -134,17 +173,14 @@ class CourseRepository:
                 course['metadata'] = course.pop('course_metadata')
 
             return course
-        finally:
-            await conn.close()
 
     async def list_courses(self, skip: int = 0, limit: int = 10,
                           status: Optional[str] = None,
-                          level: Optional[str] = None) -> List[Dict]:
-        """List courses with pagination and filters"""
-        conn = await self._get_connection()
-
-        try:
-            query = "SELECT * FROM courses WHERE 1=1"
+                          level: Optional[str] = None,
+                          uses_bedrock: Optional[bool] = None) -> List[Dict]:
+        """List course summaries with pagination and filters (no module bodies)"""
+        async with self._acquire() as conn:
+            query = f"SELECT {_COURSE_SUMMARY_COLUMNS} FROM courses WHERE 1=1"
             params = []
             param_count = 1
 
@@ -158,39 +194,38 @@ class CourseRepository:
                 params.append(level)
                 param_count += 1
 
+            if uses_bedrock is not None:
+                query += f" AND uses_bedrock = ${param_count}"
+                params.append(uses_bedrock)
+                param_count += 1
+
             query += f" ORDER BY created_at DESC LIMIT ${param_count} OFFSET ${param_count + 1}"
             params.extend([limit, skip])
 
             rows = await conn.fetch(query, *params)
 
-            courses = []
-            for row in rows:
-                course = dict(row)
+            return [self._summary_from_row(row) for row in rows]
 
-                # Parse JSON fields safely
-                json_fields = ['modules', 'tags', 'course_metadata']
-                for field in json_fields:
-                    if course.get(field):
-                        try:
-                            course[field] = json.loads(course[field]) if isinstance(course[field], str) else course[field]
-                        except (json.JSONDecodeError, TypeError):
-                            course[field] = {} if field == 'course_metadata' else []
+    def _summary_from_row(self, row) -> Dict:
+        """Turn a summary projection row into the dict shape the API returns"""
+        course = dict(row)
 
-                # Rename course_metadata to metadata for compatibility
-                if 'course_metadata' in course:
-                    course['metadata'] = course.pop('course_metadata')
+        for field in ('tags', 'course_metadata'):
+            if course.get(field):
+                try:
+                    course[field] = json.loads(course[field]) if isinstance(course[field], str) else course[field]
+                except (json.JSONDecodeError, TypeError):
+                    course[field] = {} if field == 'course_metadata' else []
 
-                courses.append(course)
+        # Rename course_metadata to metadata for compatibility
+        if 'course_metadata' in course:
+            course['metadata'] = course.pop('course_metadata') or {}
 
-            return courses
-        finally:
-            await conn.close()
+        return course
 
     async def update_course_status(self, course_id: str, status: str) -> bool:
         """Update course status"""
-        conn = await self._get_connection()
-
-        try:
+        async with self._acquire() as conn:
             result = await conn.execute("""
                 UPDATE courses
                 SET status = $1, updated_at = $2
@@ -199,14 +234,10 @@ class CourseRepository:
 
             # asyncpg execute returns "UPDATE N" where N is row count
             return int(result.split()[-1]) > 0
-        finally:
-            await conn.close()
 
     async def enroll_user(self, course_id: str, user_email: str) -> bool:
         """Enroll a user in a course"""
-        conn = await self._get_connection()
-
-        try:
+        async with self._acquire() as conn:
             # Get the integer ID from course_id
             course_pk = await conn.fetchval(
                 "SELECT id FROM courses WHERE course_id = $1",
@@ -216,22 +247,25 @@ class CourseRepository:
             if not course_pk:
                 return False
 
-            await conn.execute("""
-                INSERT INTO course_enrollments (
-                    course_id, user_email, enrolled_at, completion_status
-                ) VALUES ($1, $2, $3, $4)
-                ON CONFLICT (course_id, user_email) DO NOTHING
-            """, course_pk, user_email, datetime.now().isoformat(), 'not_started')
+            async with conn.transaction():
+                enrolled = await conn.fetchval("""
+                    INSERT INTO course_enrollments (
+                        course_id, user_email, enrolled_at, completion_status
+                    ) VALUES ($1, $2, $3, $4)
+                    ON CONFLICT (course_id, user_email) DO NOTHING
+                    RETURNING TRUE
+                """, course_pk, user_email, datetime.now().isoformat(), 'not_started')
+
+                if enrolled:
+                    await conn.execute(_BUMP_DASHBOARD_STATS_SQL, user_email, 1, 0)
 
-            return True
-        finally:
-            await conn.close()
+        if enrolled:
+            _dashboard_cache.delete(user_email)
+        return True
 
     async def get_user_progress(self, course_id: str, user_email: str) -> Optional[Dict]:
         """Get user's progress in a course"""
-        conn = await self._get_connection()
-
-        try:
+        async with self._acquire() as conn:
             # Get the integer ID from course_id
             course_pk = await conn.fetchval(
                 "SELECT id FROM courses WHERE course_id = $1",
@@ -255,15 +289,11 @@ class CourseRepository:
                         progress['progress'] = {}
                 return progress
             return None
-        finally:
-            await conn.close()
 
     async def update_user_progress(self, course_id: str, user_email: str,
                                  progress_data: Dict) -> bool:
         """Update user's course progress"""
-        conn = await self._get_connection()
-
-        try:
+        async with self._acquire() as conn:
             # Get the integer ID from course_id
             course_pk = await conn.fetchval(
                 "SELECT id FROM courses WHERE course_id = $1",
@@ -273,71 +303,205 @@ class CourseRepository:
             if not course_pk:
                 return False
 
-            result = await conn.execute("""
-                UPDATE course_enrollments
-                SET progress = $1, last_accessed = $2, completion_status = $3
-                WHERE course_id = $4 AND user_email = $5
-            """,
-                json.dumps(progress_data),
-                datetime.now().isoformat(),
-                progress_data.get('completion_status', 'in_progress'),
-                course_pk,
-                user_email
-            )
+            status = progress_data.get('completion_status', 'in_progress')
 
-            return int(result.split()[-1]) > 0
-        finally:
-            await conn.close()
+            async with conn.transaction():
+                previous = await conn.fetchrow("""
+                    SELECT completion_status FROM course_enrollments
+                    WHERE course_id = $1 AND user_email = $2
+                    FOR UPDATE
+                """, course_pk, user_email)
 
-    async def search_courses(self, query: str, filters: Dict = None) -> List[Dict]:
-        """Search courses by query and filters"""
-        conn = await self._get_connection()
+                if previous is None:
+                    return False
 
-        try:
-            search_query = """
-                SELECT * FROM courses
-                WHERE (title ILIKE $1 OR description ILIKE $2 OR tags::text ILIKE $3)
-            """
-            params = [f'%{query}%', f'%{query}%', f'%{query}%']
-            param_count = 4
+                await conn.execute("""
+                    UPDATE course_enrollments
+                    SET progress = $1::jsonb, last_accessed = $2, completion_status = $3
+                    WHERE course_id = $4 AND user_email = $5
+                """,
+                    progress_data,
+                    datetime.now().isoformat(),
+                    status,
+                    course_pk,
+                    user_email
+                )
+
+                # Callers may move a course out of 'completed' as well as into it
+                completed_delta = (status == 'completed') - (previous['completion_status'] == 'completed')
+                if completed_delta:
+                    await conn.execute(_BUMP_DASHBOARD_STATS_SQL, user_email, 0, completed_delta)
+
+        if completed_delta:
+            _dashboard_cache.delete(user_email)
+        return True
+
+    async def bulk_update_progress(self, user_email: str,
+                                   events: List[ProgressEvent]) -> List[Dict]:
+        """
+        Apply many progress events to a user's enrollments in one statement.
+
+        Events are folded per course (highest progress, summed minutes, the
+        last module seen, the union of completed modules) and merged into the
+        enrollment's progress JSON; progress never moves backwards. Courses
+        reaching 100% are marked completed in the same UPDATE. Only the
+        user's existing enrollments are touched; returns one row per
+        enrollment updated. Newly completed courses are added to the user's
+        dashboard counters in the same transaction.
+        """
+        if not events:
+            return []
+
+        async with self._acquire() as conn:
+            async with conn.transaction():
+                rows = await conn.fetch("""
+                    WITH events AS (
+                        SELECT *
+                        FROM unnest($2::text[], $3::text[], $4::float8[], $5::int[], $6::bool[])
+                             WITH ORDINALITY AS e(course_id, module_id, progress, minutes, completed, ord)
+                    ),
+                    folded AS (
+                        SELECT c.id AS course_pk,
+                               ce.completion_status AS previous_status,
+                               ev.course_id,
+                               MAX(ev.progress) / 100.0 AS progress,
+                               SUM(ev.minutes) AS minutes,
+                               (array_agg(ev.module_id ORDER BY ev.ord DESC))[1] AS current_module,
+                               COALESCE(array_agg(DISTINCT ev.module_id) FILTER (WHERE ev.completed), '{}') AS completed_modules
+                        FROM events ev
+                        JOIN courses c ON c.course_id = ev.course_id
+                        JOIN course_enrollments ce ON ce.course_id = c.id AND ce.user_email = $1
+                        GROUP BY c.id, ce.completion_status, ev.course_id
+                    )
+                    UPDATE course_enrollments ce SET
+                        progress = COALESCE(ce.progress, '{}'::jsonb) || jsonb_build_object(
+                            'overall_progress', GREATEST(COALESCE((ce.progress->>'overall_progress')::float8, 0), f.progress),
+                            'time_spent_minutes', COALESCE((ce.progress->>'time_spent_minutes')::int, 0) + f.minutes,
+                            'current_module', f.current_module,
+                            'modules_completed', (
+                                SELECT COALESCE(jsonb_agg(m ORDER BY m), '[]'::jsonb)
+                                FROM (
+                                    SELECT jsonb_array_elements_text(COALESCE(ce.progress->'modules_completed', '[]'::jsonb))
+                                    UNION
+                                    SELECT unnest(f.completed_modules)
+                                ) AS modules(m)
+                            )
+                        ),
+                        completion_status = CASE
+                            WHEN ce.completion_status = 'completed' OR f.progress >= 1 THEN 'completed'
+                            ELSE 'in_progress'
+                        END,
+                        last_accessed = NOW()
+                    FROM folded f
+                    WHERE ce.course_id = f.course_pk AND ce.user_email = $1
+                    RETURNING f.course_id, ce.progress, ce.completion_status,
+                              (f.previous_status IS DISTINCT FROM 'completed'
+                               AND ce.completion_status = 'completed') AS newly_completed
+                """,
+                    user_email,
+                    [e.course_id for e in events],
+                    [e.module_id for e in events],
+                    [e.progress_percentage for e in events],
+                    [e.time_spent_minutes for e in events],
+                    [e.module_completed for e in events]
+                )
+
+                newly_completed = sum(1 for row in rows if row['newly_completed'])
+                if newly_completed:
+                    await conn.execute(_BUMP_DASHBOARD_STATS_SQL, user_email, 0, newly_completed)
+
+        if newly_completed:
+            _dashboard_cache.delete(user_email)
+
+        results = []
+        for row in rows:
+            progress = row['progress'] or {}
+            results.append({
+                'course_id': row['course_id'],
+                'overall_progress': progress.get('overall_progress', 0.0),
+                'current_module': progress.get('current_module'),
+                'modules_completed': progress.get('modules_completed', []),
+                'completion_status': row['completion_status'],
+                'newly_completed': row['newly_completed'],
+            })
+        return results
+
+    async def get_dashboard_stats(self, user_email: str) -> Dict:
+        """Enrollment counters for a user's dashboard (a primary-key lookup)"""
+        cached = _dashboard_cache.get(user_email)
+        if cached is not None:
+            return cached
+
+        async with self._acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT total_enrollments, courses_completed
+                FROM user_dashboard_stats WHERE user_email = $1
+            """, user_email)
+
+        stats = {
+            'total_enrollments': row['total_enrollments'] if row else 0,
+            'courses_completed': row['courses_completed'] if row else 0,
+        }
+        if settings.DASHBOARD_STATS_CACHE_TTL_SECONDS > 0:
+            _dashboard_cache.set(user_email, stats)
+        return stats
+
+    async def search_courses(self, query: str, filters: Dict = None,
+                             limit: int = 20, offset: int = 0) -> List[Dict]:
+        """
+        Ranked full-text search over course summaries.
+
+        Matches title, description, tags and module titles through the
+        GIN-indexed search_vector (migration 010), ordered by ts_rank. Results
+        are always paginated (limit capped at SEARCH_MAX_LIMIT) and carry
+        highlighted `title_highlight` and `snippet` fields.
+        """
+        limit = max(1, min(limit, SEARCH_MAX_LIMIT))
+        offset = max(0, offset)
+
+        async with self._acquire() as conn:
+            where = "search_vector @@ q.tsq"
+            params = [query]
+            param_count = 2
 
             if filters:
                 if filters.get('level'):
-                    search_query += f" AND level = ${param_count}"
+                    where += f" AND level = ${param_count}"
                     params.append(filters['level'])
                     param_count += 1
                 if filters.get('status'):
-                    search_query += f" AND status = ${param_count}"
+                    where += f" AND status = ${param_count}"
                     params.append(filters['status'])
                     param_count += 1
                 if filters.get('language'):
-                    search_query += f" AND language = ${param_count}"
+                    where += f" AND language = ${param_count}"
                     params.append(filters['language'])
                     param_count += 1
+                if filters.get('uses_bedrock') is not None:
+                    where += f" AND uses_bedrock = ${param_count}"
+                    params.append(filters['uses_bedrock'])
+                    param_count += 1
 
-            search_query += " ORDER BY created_at DESC"
+            # Rank and paginate first; headlines are only built for the page
+            search_query = f"""
+                WITH q AS (SELECT websearch_to_tsquery('english', $1) AS tsq)
+                SELECT page.*,
+                       ts_headline('english', page.title, q.tsq,
+                                   'HighlightAll=true, StartSel=<mark>, StopSel=</mark>') AS title_highlight,
+                       ts_headline('english', COALESCE(page.description, ''), q.tsq,
+                                   'MaxWords=35, MinWords=15, StartSel=<mark>, StopSel=</mark>') AS snippet
+                FROM (
+                    SELECT {_COURSE_SUMMARY_COLUMNS},
+                           ts_rank(search_vector, q.tsq) AS rank
+                    FROM courses, q
+                    WHERE {where}
+                    ORDER BY rank DESC, created_at DESC
+                    LIMIT ${param_count} OFFSET ${param_count + 1}
+                ) page, q
+                ORDER BY page.rank DESC, page.created_at DESC
+            """
+            params.extend([limit, offset])
 
             rows = await conn.fetch(search_query, *params)
 
-            courses = []
-            for row in rows:
-                course = dict(row)
-
-                # Parse JSON fields
-                json_fields = ['modules', 'tags', 'course_metadata']
-                for field in json_fields:
-                    if course.get(field):
-                        try:
-                            course[field] = json.loads(course[field]) if isinstance(course[field], str) else course[field]
-                        except (json.JSONDecodeError, TypeError):
-                            course[field] = {} if field == 'course_metadata' else []
-
-                # Rename course_metadata to metadata
-                if 'course_metadata' in course:
-                    course['metadata'] = course.pop('course_metadata')
-
-                courses.append(course)
-
-            return courses
-        finally:
-            await conn.close()
+            return [self._summary_from_row(row) for row in rows]
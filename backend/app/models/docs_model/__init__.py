@@ -9,9 +9,23 @@ from .schemas import (
     DocListResponse,
     CreateDocRequest,
     UpdateDocRequest,
-    SyncResponse
+    SyncResponse,
+    DocRef,
+    DocReference,
+    DocReferencesResponse,
+    ImportResponse
 )
 from .docs_service import DocsService
+from .manifest_files import write_manifest
+from .dependency_graph import DependencyGraph, refresh_dependency_graph
+from .vault_archive import ArchiveError, ArchiveTooLargeError, iter_export, import_archive
+from .vault_io import (
+    ConflictError,
+    atomic_write_text,
+    check_etag,
+    compute_etag,
+    file_lock
+)
 
 __all__ = [
     "DocSection",
@@ -23,5 +37,21 @@ __all__ = [
     "CreateDocRequest",
     "UpdateDocRequest",
     "SyncResponse",
-    "DocsService"
+    "DocRef",
+    "DocReference",
+    "DocReferencesResponse",
+    "ImportResponse",
+    "DocsService",
+    "write_manifest",
+    "DependencyGraph",
+    "refresh_dependency_graph",
+    "ArchiveError",
+    "ArchiveTooLargeError",
+    "iter_export",
+    "import_archive",
+    "ConflictError",
+    "atomic_write_text",
+    "check_etag",
+    "compute_etag",
+    "file_lock"
 ]
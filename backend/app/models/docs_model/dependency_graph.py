@@ -0,0 +1,317 @@
+"""
+Vault-wide dependency graph between docs.
+
+Workflows reference skills, tools and subagents by name in their
+frontmatter (``skills: [- brand-guideline-applier (for ...)]``), and skills
+and subagents list the tools they need. The graph keeps those references
+per doc plus a reverse index keyed by normalized name, so "depends on" and
+"used by" queries cost O(degree) instead of a scan of the vault.
+
+References resolve at query time against each doc's aliases (directory ID,
+name/title and ``*_id`` field), so adding a skill that an existing workflow
+already names fixes that reference without relinking anything.
+
+The graph is built once per set of vault roots. Writers call
+refresh_dependency_graph() to update it immediately, and every query
+revalidates it against the disk the way WorkflowIndex does:
+- A doc whose main file's (mtime_ns, size) stamp changed is re-read.
+- A section whose directory mtime changed is rescanned for added and removed docs.
+This catches edits made by other workers and directly in the vault.
+"""
+
+import logging
+import re
+import threading
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+
+from .schemas import SECTION_FILES, DocSection
+
+if TYPE_CHECKING:
+    from .docs_service import DocsService
+
+logger = logging.getLogger(__name__)
+
+# Frontmatter fields holding references, and the sections they may point to
+REFERENCE_FIELDS: Dict[DocSection, Dict[str, Tuple[DocSection, ...]]] = {
+    DocSection.WORKFLOWS: {
+        'skills': (DocSection.SKILLS,),
+        'tools': (DocSection.TOOLS, DocSection.MCP),
+        'subagents': (DocSection.SUBAGENTS,),
+    },
+    DocSection.SKILLS: {
+        'tools_required': (DocSection.TOOLS, DocSection.MCP),
+    },
+    DocSection.SUBAGENTS: {
+        'skills': (DocSection.SKILLS,),
+        'tools_required': (DocSection.TOOLS, DocSection.MCP),
+    },
+}
+
+# Frontmatter fields that name a doc besides its directory
+ALIAS_FIELDS = ('name', 'title', 'workflow_id', 'skill_id', 'tool_id', 'mcp_id', 'subagent_id')
+
+_ANNOTATION = re.compile(r'\s*\(.*$')
+_SEPARATORS = re.compile(r'[\s_]+')
+
+NodeKey = Tuple[DocSection, str]
+Stamp = Tuple[int, int]
+
+
+def normalize_ref(value: Any) -> str:
+    """'Brand Guideline Applier (for styling)' -> 'brand-guideline-applier'."""
+    text = _ANNOTATION.sub('', str(value)).strip().lower()
+    return _SEPARATORS.sub('-', text)
+
+
+def _as_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(',') if part.strip()]
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    return [str(value)]
+
+
+class DependencyGraph:
+    """Bidirectional reference graph for the docs in a set of vault roots."""
+
+    def __init__(self, service: "DocsService"):
+        self._service = service
+        self._nodes: Dict[NodeKey, Dict[str, Any]] = {}
+        # (section, alias) -> docs answering to that alias
+        self._aliases: Dict[Tuple[DocSection, str], Set[NodeKey]] = defaultdict(set)
+        # doc -> [(field, raw ref, normalized ref)]
+        self._edges: Dict[NodeKey, List[Tuple[str, str, str]]] = {}
+        # (section, normalized ref) -> {(referring doc, field, raw ref)}
+        self._referrers: Dict[Tuple[DocSection, str], Set[Tuple[NodeKey, str, str]]] = defaultdict(set)
+        # Docs whose frontmatter couldn't be read, retried when their stamp changes
+        self._skipped: Dict[NodeKey, Stamp] = {}
+        # section -> mtime_ns of its directory in each vault root
+        self._section_stamps: Dict[DocSection, Tuple[Optional[int], ...]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, service: "DocsService") -> "DependencyGraph":
+        graph = cls(service)
+        for section in DocSection:
+            graph._scan_section(section)
+        logger.info(f"Built dependency graph: {len(graph._nodes)} docs")
+        return graph
+
+    # ================================================================
+    # Maintenance
+    # ================================================================
+
+    def refresh(self, section: DocSection, doc_id: str):
+        """Re-read one doc (or drop it if it no longer exists)."""
+        with self._lock:
+            self._unindex((section, doc_id))
+            self._index(section, doc_id)
+
+    def _main_file_stamp(self, section: DocSection, doc_id: str) -> Optional[Stamp]:
+        path = self._service._get_entry_path(section, doc_id) / SECTION_FILES[section]
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _directory_stamps(self, section: DocSection) -> Tuple[Optional[int], ...]:
+        stamps = []
+        for root in self._service.vault_paths:
+            try:
+                stamps.append((root / section.value).stat().st_mtime_ns)
+            except OSError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def _scan_section(self, section: DocSection):
+        """Index docs added to a section and drop the ones removed from it."""
+        self._section_stamps[section] = self._directory_stamps(section)
+        on_disk = set(self._service._collect_entries(section))
+
+        for key in [k for k in list(self._nodes) + list(self._skipped) if k[0] == section]:
+            if key[1] not in on_disk:
+                self._unindex(key)
+        for doc_id in on_disk:
+            key = (section, doc_id)
+            if key not in self._nodes and key not in self._skipped:
+                self._index(section, doc_id)
+
+    def _revalidate(self):
+        """Bring the graph in line with the files on disk (lock held)."""
+        for section in DocSection:
+            if self._directory_stamps(section) != self._section_stamps.get(section):
+                self._scan_section(section)
+
+        stale = [
+            key for key, stamp in
+            [(k, node['stamp']) for k, node in self._nodes.items()] + list(self._skipped.items())
+            if self._main_file_stamp(*key) != stamp
+        ]
+        for key in stale:
+            self._unindex(key)
+            self._index(*key)
+
+    def _index(self, section: DocSection, doc_id: str):
+        key = (section, doc_id)
+        # Stamp before reading, so a write racing the read is seen next time
+        stamp = self._main_file_stamp(section, doc_id)
+        if stamp is None:
+            return
+
+        try:
+            frontmatter = self._service._read_frontmatter(section, doc_id)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Skipping {section.value}/{doc_id} in dependency graph: {e}")
+            self._skipped[key] = stamp
+            return
+
+        self._nodes[key] = {
+            'section': section,
+            'id': doc_id,
+            'name': str(frontmatter.get('name') or frontmatter.get('title') or doc_id),
+            'stamp': stamp,
+        }
+
+        aliases = {normalize_ref(doc_id)}
+        aliases.update(normalize_ref(frontmatter[f]) for f in ALIAS_FIELDS if frontmatter.get(f))
+        self._nodes[key]['aliases'] = aliases
+        for alias in aliases:
+            self._aliases[(section, alias)].add(key)
+
+        edges = []
+        for field, targets in REFERENCE_FIELDS.get(section, {}).items():
+            for ref in _as_list(frontmatter.get(field)):
+                norm = normalize_ref(ref)
+                if not norm:
+                    continue
+                edges.append((field, ref, norm))
+                for target_section in targets:
+                    self._referrers[(target_section, norm)].add((key, field, ref))
+        self._edges[key] = edges
+
+    def _unindex(self, key: NodeKey):
+        self._skipped.pop(key, None)
+        node = self._nodes.pop(key, None)
+        if node is None:
+            return
+        for alias in node['aliases']:
+            owners = self._aliases.get((key[0], alias))
+            if owners is not None:
+                owners.discard(key)
+                if not owners:
+                    del self._aliases[(key[0], alias)]
+
+        for field, ref, norm in self._edges.pop(key, []):
+            for target_section in REFERENCE_FIELDS[key[0]][field]:
+                referrers = self._referrers.get((target_section, norm))
+                if referrers is not None:
+                    referrers.discard((key, field, ref))
+                    if not referrers:
+                        del self._referrers[(target_section, norm)]
+
+    # ================================================================
+    # Queries
+    # ================================================================
+
+    def _ref(self, key: NodeKey) -> Dict[str, Any]:
+        node = self._nodes[key]
+        return {'section': node['section'], 'id': node['id'], 'name': node['name']}
+
+    def _resolve(self, source: DocSection, field: str, norm: str) -> Optional[NodeKey]:
+        for target_section in REFERENCE_FIELDS[source][field]:
+            owners = self._aliases.get((target_section, norm))
+            if owners:
+                return min(owners, key=lambda k: k[1])
+        return None
+
+    def node(self, section: DocSection, doc_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._revalidate()
+            key = (section, doc_id)
+            return self._ref(key) if key in self._nodes else None
+
+    def depends_on(self, section: DocSection, doc_id: str) -> List[Dict[str, Any]]:
+        """References from one doc, resolved where possible."""
+        with self._lock:
+            self._revalidate()
+            key = (section, doc_id)
+            result = []
+            for field, ref, norm in self._edges.get(key, []):
+                target = self._resolve(section, field, norm)
+                result.append({
+                    'source': self._ref(key),
+                    'field': field,
+                    'ref': ref,
+                    'target': self._ref(target) if target else None,
+                })
+            return result
+
+    def used_by(self, section: DocSection, doc_id: str) -> List[Dict[str, Any]]:
+        """Docs whose references resolve to this doc."""
+        with self._lock:
+            self._revalidate()
+            key = (section, doc_id)
+            node = self._nodes.get(key)
+            if node is None:
+                return []
+
+            result = []
+            for alias in sorted(node['aliases']):
+                for source, field, ref in self._referrers.get((section, alias), ()):
+                    # Another doc may own the alias in an earlier section
+                    if self._resolve(source[0], field, alias) != key:
+                        continue
+                    result.append({
+                        'source': self._ref(source),
+                        'field': field,
+                        'ref': ref,
+                        'target': self._ref(key),
+                    })
+            return sorted(result, key=lambda r: (r['source']['section'].value, r['source']['id'], r['field']))
+
+    def broken_references(self) -> List[Dict[str, Any]]:
+        """References that don't resolve to any doc."""
+        with self._lock:
+            self._revalidate()
+            broken = set()
+            for (target_section, norm), referrers in self._referrers.items():
+                if (target_section, norm) in self._aliases:
+                    continue
+                for source, field, ref in referrers:
+                    if self._resolve(source[0], field, norm) is None:
+                        broken.add((source, field, ref))
+
+            return [
+                {'source': self._ref(source), 'field': field, 'ref': ref, 'target': None}
+                for source, field, ref in sorted(broken, key=lambda b: (b[0][0].value, b[0][1], b[1], b[2]))
+            ]
+
+
+# One graph per set of vault roots
+_graphs: Dict[Tuple[str, ...], DependencyGraph] = {}
+_graphs_lock = threading.Lock()
+
+
+def get_dependency_graph(service: "DocsService") -> DependencyGraph:
+    """The graph for the service's vault roots, built on first use."""
+    key = tuple(str(path) for path in service.vault_paths)
+    with _graphs_lock:
+        graph = _graphs.get(key)
+        if graph is None:
+            graph = DependencyGraph.build(service)
+            _graphs[key] = graph
+        return graph
+
+
+def refresh_dependency_graph(section: DocSection, doc_id: str):
+    """Bring already-built graphs in line with one changed or deleted doc."""
+    with _graphs_lock:
+        graphs = list(_graphs.values())
+    for graph in graphs:
+        graph.refresh(section, doc_id)
@@ -4,7 +4,7 @@ import os
 import shutil
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 from .schemas import (
@@ -25,31 +25,74 @@ from .frontmatter import (
     enrich_frontmatter,
     extract_id_from_frontmatter
 )
+from .vault_io import atomic_write_text, check_etag, compute_etag, file_lock
+from .dependency_graph import (
+    DependencyGraph,
+    get_dependency_graph,
+    refresh_dependency_graph
+)
+from .manifest_files import (
+    INDEX_DIRNAME,
+    MANIFEST_FILENAME,
+    current_manifest,
+    entry_detail_path,
+    remove_entry_detail,
+    write_entry_detail,
+    write_manifest
+)
+
+# Section-specific frontmatter fields listed in manifest entries (read by
+# the hub's previews and catalogs), with defaults where the catalog expects one
+MANIFEST_FIELDS: Dict[DocSection, Dict[str, Any]] = {
+    DocSection.WORKFLOWS: {'type': 'workflow', 'difficulty': 'intermediate', 'estimated_time': None},
+    DocSection.SKILLS: {'skill_type': None},
+    DocSection.TOOLS: {'capabilities': None, 'pricing': None, 'language': None, 'compatibility': None},
+}
+
+# Manifest fields only listed when they hold a list
+MANIFEST_LIST_FIELDS = ('capabilities', 'compatibility')
 
 
 class DocsService:
     """
     Service layer for docs content management.
 
-    Manages reading/writing content from vault-web and syncing
-    to frontend/public for static serving.
+    Manages reading/writing content from one or more vault roots and
+    syncing to frontend/public for static serving. New entries are created
+    in the primary root; when several roots hold the same ID, the earlier
+    root wins.
     """
 
-    def __init__(self, vault_path: str, public_path: str):
+    def __init__(
+        self,
+        vault_path: str,
+        public_path: str,
+        extra_vault_paths: Optional[List[str]] = None
+    ):
         """
         Initialize DocsService.
 
         Args:
-            vault_path: Path to vault-web directory (source of truth)
+            vault_path: Path to the primary vault directory (source of truth)
             public_path: Path to frontend/public/content (sync target)
+            extra_vault_paths: Additional vault roots, in priority order
         """
         self.vault_path = Path(vault_path)
         self.public_path = Path(public_path)
+        self.vault_paths = [self.vault_path] + [
+            Path(path) for path in (extra_vault_paths or [])
+            if Path(path).exists()
+        ]
 
         # Validate vault path exists
         if not self.vault_path.exists():
             raise ValueError(f"Vault path does not exist: {vault_path}")
 
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """Reference graph across this service's vault roots (built once)."""
+        return get_dependency_graph(self)
+
     # ================================================================
     # READ Operations
     # ================================================================
@@ -64,22 +107,10 @@ class DocsService:
         Returns:
             DocListResponse with items list
         """
-        section_path = self.vault_path / section.value
-
-        if not section_path.exists():
-            return DocListResponse(section=section, count=0, items=[])
-
         items = []
-        for entry_dir in sorted(section_path.iterdir()):
-            if not entry_dir.is_dir():
-                continue
-
-            # Skip hidden directories
-            if entry_dir.name.startswith('.'):
-                continue
-
+        for doc_id, entry_dir in sorted(self._collect_entries(section).items()):
             try:
-                metadata = self._read_metadata(section, entry_dir.name)
+                metadata = self._read_metadata(section, doc_id)
                 items.append(metadata)
             except Exception as e:
                 # Log but don't fail entire listing
@@ -118,7 +149,8 @@ class DocsService:
             metadata=metadata,
             frontmatter=frontmatter,
             content=content,
-            raw=raw
+            raw=raw,
+            etag=compute_etag(raw)
         )
 
     def list_files(self, section: DocSection, doc_id: str) -> List[DocFile]:
@@ -238,31 +270,34 @@ class DocsService:
             ValueError: If doc already exists or validation fails
         """
         entry_path = self._get_entry_path(section, request.id)
+        main_file = entry_path / SECTION_FILES[section]
 
-        if entry_path.exists():
-            raise ValueError(f"Doc already exists: {section.value}/{request.id}")
+        with file_lock(main_file):
+            if entry_path.exists():
+                raise ValueError(f"Doc already exists: {section.value}/{request.id}")
 
-        # Enrich frontmatter with auto-generated fields
-        frontmatter = enrich_frontmatter(request.frontmatter, request.id, is_new=True)
+            # Enrich frontmatter with auto-generated fields
+            frontmatter = enrich_frontmatter(request.frontmatter, request.id, is_new=True)
 
-        # Ensure required fields
-        if 'name' not in frontmatter:
-            frontmatter['name'] = request.id
+            # Ensure required fields
+            if 'name' not in frontmatter:
+                frontmatter['name'] = request.id
 
-        # Create directory and main file
-        entry_path.mkdir(parents=True, exist_ok=True)
-        main_file = entry_path / SECTION_FILES[section]
+            # Create directory and main file
+            entry_path.mkdir(parents=True, exist_ok=True)
 
-        file_content = serialize_frontmatter(frontmatter, request.content)
-        main_file.write_text(file_content, encoding='utf-8')
+            file_content = serialize_frontmatter(frontmatter, request.content)
+            atomic_write_text(main_file, file_content)
 
+        refresh_dependency_graph(section, request.id)
         return self.get_entry(section, request.id)
 
     def update_entry(
         self,
         section: DocSection,
         doc_id: str,
-        request: UpdateDocRequest
+        request: UpdateDocRequest,
+        if_match: Optional[str] = None
     ) -> DocEntry:
         """
         Update an existing doc entry.
@@ -271,6 +306,8 @@ class DocsService:
             section: The section containing the doc
             doc_id: The document identifier
             request: UpdateDocRequest with optional frontmatter and content
+            if_match: ETag the client last read; the update is rejected if
+                the file changed since
 
         Returns:
             The updated DocEntry
@@ -278,32 +315,36 @@ class DocsService:
         Raises:
             FileNotFoundError: If doc doesn't exist
             ValueError: If validation fails
+            ConflictError: If if_match doesn't match the current content
         """
         entry_path = self._get_entry_path(section, doc_id)
         main_file = entry_path / SECTION_FILES[section]
 
-        if not main_file.exists():
-            raise FileNotFoundError(f"Doc not found: {section.value}/{doc_id}")
+        with file_lock(main_file):
+            if not main_file.exists():
+                raise FileNotFoundError(f"Doc not found: {section.value}/{doc_id}")
 
-        # Read existing content
-        raw = main_file.read_text(encoding='utf-8')
-        existing_frontmatter, existing_content = parse_frontmatter(raw)
+            # Read existing content
+            raw = main_file.read_text(encoding='utf-8')
+            check_etag(raw, if_match)
+            existing_frontmatter, existing_content = parse_frontmatter(raw)
 
-        # Merge updates
-        if request.frontmatter:
-            frontmatter = {**existing_frontmatter, **request.frontmatter}
-        else:
-            frontmatter = existing_frontmatter
+            # Merge updates
+            if request.frontmatter:
+                frontmatter = {**existing_frontmatter, **request.frontmatter}
+            else:
+                frontmatter = existing_frontmatter
 
-        content = request.content if request.content is not None else existing_content
+            content = request.content if request.content is not None else existing_content
 
-        # Enrich with timestamp update
-        frontmatter = enrich_frontmatter(frontmatter, doc_id, is_new=False)
+            # Enrich with timestamp update
+            frontmatter = enrich_frontmatter(frontmatter, doc_id, is_new=False)
 
-        # Write back
-        file_content = serialize_frontmatter(frontmatter, content)
-        main_file.write_text(file_content, encoding='utf-8')
+            # Write back
+            file_content = serialize_frontmatter(frontmatter, content)
+            atomic_write_text(main_file, file_content)
 
+        refresh_dependency_graph(section, doc_id)
         return self.get_entry(section, doc_id)
 
     def delete_entry(self, section: DocSection, doc_id: str) -> bool:
@@ -325,8 +366,8 @@ class DocsService:
         if not entry_path.exists():
             raise FileNotFoundError(f"Doc not found: {section.value}/{doc_id}")
 
-        # Move to trash instead of hard delete
-        trash_path = self.vault_path / '.trash' / section.value / doc_id
+        # Move to trash (in the entry's own vault root) instead of hard delete
+        trash_path = entry_path.parent.parent / '.trash' / section.value / doc_id
         trash_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Remove existing trash entry if present
@@ -334,104 +375,153 @@ class DocsService:
             shutil.rmtree(trash_path)
 
         shutil.move(str(entry_path), str(trash_path))
+        refresh_dependency_graph(section, doc_id)
         return True
 
     # ================================================================
     # SYNC Operations
     # ================================================================
 
-    def sync_all(self) -> SyncResponse:
+    def sync_all(self, dry_run: bool = False) -> SyncResponse:
         """
         Sync all sections to frontend/public.
 
+        Args:
+            dry_run: Report what would change without writing anything
+
         Returns:
             SyncResponse with results
         """
         sections_synced = []
         total_files = 0
+        manifest_updated = False
         errors = []
+        added, updated, removed = [], [], []
 
         for section in DocSection:
             try:
-                result = self.sync_section(section)
+                result = self.sync_section(section, dry_run=dry_run)
                 sections_synced.append(section.value)
                 total_files += result.files_processed
+                manifest_updated |= result.manifest_updated
                 errors.extend(result.errors)
+                added.extend(result.added)
+                updated.extend(result.updated)
+                removed.extend(result.removed)
             except Exception as e:
                 errors.append(f"{section.value}: {str(e)}")
 
+        # Build the dependency graph now rather than on the first query
+        if not dry_run:
+            get_dependency_graph(self)
+
         return SyncResponse(
             success=len(errors) == 0,
             sections_synced=sections_synced,
             files_processed=total_files,
-            manifest_updated=True,
-            errors=errors
+            manifest_updated=manifest_updated,
+            errors=errors,
+            dry_run=dry_run,
+            added=added,
+            updated=updated,
+            removed=removed
         )
 
-    def sync_section(self, section: DocSection) -> SyncResponse:
+    def sync_section(self, section: DocSection, dry_run: bool = False) -> SyncResponse:
         """
-        Sync a single section to frontend/public.
+        Sync a single section to frontend/public incrementally.
+
+        Files are compared by (mtime_ns, size) against the public copy, which
+        keeps the source mtime, so only changed files are copied, removed
+        files and entries are deleted, and only changed entries have their
+        frontmatter re-read for the manifest and their detail file. The
+        manifest is rewritten only when its content changes, as minified,
+        precompressed and fingerprinted artifacts plus the sharded index
+        (see manifest_files).
 
         Args:
             section: The section to sync
+            dry_run: Report what would change without writing anything
 
         Returns:
             SyncResponse with results
         """
-        source_path = self.vault_path / section.value
         target_path = self.public_path / section.value
+        manifest_file = target_path / MANIFEST_FILENAME
 
-        if not source_path.exists():
-            return SyncResponse(
-                success=True,
-                sections_synced=[section.value],
-                files_processed=0,
-                manifest_updated=False,
-                errors=[]
-            )
+        sources = self._collect_entries(section)
+        previous = self._read_manifest(manifest_file)
 
-        # Ensure target exists
-        target_path.mkdir(parents=True, exist_ok=True)
-
-        # Build manifest from frontmatter
         manifest_entries = []
-        files_copied = 0
+        files_processed = 0
         errors = []
+        added, updated, removed = [], [], []
 
-        for entry_dir in sorted(source_path.iterdir()):
-            if not entry_dir.is_dir() or entry_dir.name.startswith('.'):
-                continue
+        for doc_id, entry_dir in sorted(sources.items()):
+            target_entry = target_path / doc_id
 
             try:
-                # Read and build manifest entry
-                metadata = self._read_metadata(section, entry_dir.name)
-                manifest_entries.append(self._metadata_to_manifest(metadata))
+                copies, deletions = self._diff_tree(entry_dir, target_entry)
+                changed = bool(copies or deletions)
+
+                # Reuse the manifest entry (and detail file) of unchanged docs
+                if (changed or doc_id not in previous
+                        or not entry_detail_path(target_path, doc_id).exists()):
+                    frontmatter = self._read_frontmatter(section, doc_id)
+                    metadata = self._build_metadata(section, doc_id, frontmatter, entry_dir)
+                    manifest_entry = self._metadata_to_manifest(metadata, frontmatter)
+                    if not dry_run:
+                        write_entry_detail(target_path, doc_id, {**metadata.dict(), **manifest_entry})
+                else:
+                    manifest_entry = previous[doc_id]
+
+                if changed:
+                    label = f"{section.value}/{doc_id}"
+                    (updated if target_entry.exists() else added).append(label)
+                    files_processed += len(copies) + len(deletions)
+
+                    if not dry_run:
+                        for rel_path in copies:
+                            self._copy_file(entry_dir / rel_path, target_entry / rel_path)
+                        for rel_path in deletions:
+                            (target_entry / rel_path).unlink()
+                        refresh_dependency_graph(section, doc_id)
+
+                manifest_entries.append(manifest_entry)
 
-                # Copy directory to target
-                target_entry = target_path / entry_dir.name
-                if target_entry.exists():
+            except Exception as e:
+                errors.append(f"{doc_id}: {str(e)}")
+
+        # Entries that no longer exist in any vault root
+        if target_path.exists():
+            for target_entry in sorted(target_path.iterdir()):
+                if not target_entry.is_dir() or target_entry.name.startswith('.'):
+                    continue
+                if target_entry.name in sources or target_entry.name == INDEX_DIRNAME:
+                    continue
+                removed.append(f"{section.value}/{target_entry.name}")
+                if not dry_run:
                     shutil.rmtree(target_entry)
-                shutil.copytree(entry_dir, target_entry)
-
-                files_copied += sum(1 for _ in entry_dir.rglob('*') if _.is_file())
+                    remove_entry_detail(target_path, target_entry.name)
+                    refresh_dependency_graph(section, target_entry.name)
 
-            except Exception as e:
-                errors.append(f"{entry_dir.name}: {str(e)}")
-
-        # Write manifest.json
-        manifest_file = target_path / 'manifest.json'
-        manifest_data = {"entries": manifest_entries}
-        manifest_file.write_text(
-            json.dumps(manifest_data, indent=2, default=str),
-            encoding='utf-8'
+        # Also (re)write when the fingerprinted artifacts are missing
+        manifest_updated = manifest_entries != list(previous.values()) or (
+            bool(sources) and current_manifest(target_path) is None
         )
+        if manifest_updated and not dry_run:
+            write_manifest(target_path, {"entries": manifest_entries})
 
         return SyncResponse(
             success=len(errors) == 0,
             sections_synced=[section.value],
-            files_processed=files_copied,
-            manifest_updated=True,
-            errors=errors
+            files_processed=files_processed,
+            manifest_updated=manifest_updated,
+            errors=errors,
+            dry_run=dry_run,
+            added=added,
+            updated=updated,
+            removed=removed
         )
 
     # ================================================================
@@ -439,20 +529,92 @@ class DocsService:
     # ================================================================
 
     def _get_entry_path(self, section: DocSection, doc_id: str) -> Path:
-        """Get the filesystem path for a doc entry."""
+        """Get the filesystem path for a doc entry (primary root if new)."""
+        for root in self.vault_paths:
+            entry_path = root / section.value / doc_id
+            if entry_path.exists():
+                return entry_path
         return self.vault_path / section.value / doc_id
 
-    def _read_metadata(self, section: DocSection, doc_id: str) -> DocMetadata:
-        """Read metadata from a doc entry."""
-        entry_path = self._get_entry_path(section, doc_id)
-        main_file = entry_path / SECTION_FILES[section]
+    def _collect_entries(self, section: DocSection) -> Dict[str, Path]:
+        """Map doc ID to entry directory across all roots (earlier root wins)."""
+        main_filename = SECTION_FILES[section]
+        entries: Dict[str, Path] = {}
+
+        for root in self.vault_paths:
+            section_path = root / section.value
+            if not section_path.exists():
+                continue
+            for entry_dir in section_path.iterdir():
+                if entry_dir.name.startswith('.') or entry_dir.name in entries:
+                    continue
+                if entry_dir.name == INDEX_DIRNAME:
+                    continue
+                # Folders without a main file (e.g. shared references) aren't entries
+                if entry_dir.is_dir() and (entry_dir / main_filename).exists():
+                    entries[entry_dir.name] = entry_dir
+
+        return entries
+
+    def _read_manifest(self, manifest_file: Path) -> Dict[str, Dict[str, Any]]:
+        """Read an existing manifest as {id: entry}; empty if missing or invalid."""
+        try:
+            data = json.loads(manifest_file.read_text(encoding='utf-8'))
+            return {entry['id']: entry for entry in data.get('entries', [])}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return {}
+
+    @staticmethod
+    def _file_stamps(root: Path) -> Dict[str, tuple]:
+        """Map relative file path to (mtime_ns, size) for every file under root."""
+        stamps = {}
+        if not root.exists():
+            return stamps
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                stat = os.stat(full_path)
+                stamps[os.path.relpath(full_path, root)] = (stat.st_mtime_ns, stat.st_size)
+        return stamps
+
+    def _diff_tree(self, source: Path, target: Path):
+        """Files to copy and files to delete to make target match source."""
+        source_stamps = self._file_stamps(source)
+        target_stamps = self._file_stamps(target)
+
+        copies = sorted(
+            rel_path for rel_path, stamp in source_stamps.items()
+            if target_stamps.get(rel_path) != stamp
+        )
+        deletions = sorted(set(target_stamps) - set(source_stamps))
+        return copies, deletions
+
+    @staticmethod
+    def _copy_file(source: Path, target: Path):
+        """Copy one file atomically, keeping its mtime for the next diff."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            shutil.copy2(source, tmp_path)
+            os.replace(tmp_path, target)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _read_frontmatter(self, section: DocSection, doc_id: str) -> Dict[str, Any]:
+        """Read the frontmatter of a doc entry's main file."""
+        main_file = self._get_entry_path(section, doc_id) / SECTION_FILES[section]
 
         if not main_file.exists():
             raise FileNotFoundError(f"Main file not found: {main_file}")
 
-        raw = main_file.read_text(encoding='utf-8')
-        frontmatter, _ = parse_frontmatter(raw)
+        frontmatter, _ = parse_frontmatter(main_file.read_text(encoding='utf-8'))
+        return frontmatter
 
+    def _read_metadata(self, section: DocSection, doc_id: str) -> DocMetadata:
+        """Read metadata from a doc entry."""
+        frontmatter = self._read_frontmatter(section, doc_id)
+        entry_path = self._get_entry_path(section, doc_id)
         return self._build_metadata(section, doc_id, frontmatter, entry_path)
 
     def _build_metadata(
@@ -507,8 +669,12 @@ class DocsService:
             return date.isoformat()
         return str(date)
 
-    def _metadata_to_manifest(self, metadata: DocMetadata) -> Dict[str, Any]:
-        """Convert DocMetadata to manifest entry format."""
+    def _metadata_to_manifest(
+        self,
+        metadata: DocMetadata,
+        frontmatter: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Convert DocMetadata (plus section-specific frontmatter) to manifest entry format."""
         entry = {
             "id": metadata.id,
             "name": metadata.name,
@@ -520,4 +686,18 @@ class DocsService:
         if metadata.difficulty:
             entry["difficulty"] = metadata.difficulty
 
-        return entry
+        frontmatter = frontmatter or {}
+        for field, default in MANIFEST_FIELDS.get(metadata.section, {}).items():
+            value = frontmatter.get(field, entry.get(field, default))
+            if field in MANIFEST_LIST_FIELDS and not isinstance(value, list):
+                continue
+            if value is not None:
+                entry[field] = value
+
+        # Shards are ordered by creation date
+        if metadata.created_date:
+            entry["created_date"] = metadata.created_date
+
+        # Round-trip through JSON so entries compare equal to the ones read
+        # back from manifest.json
+        return json.loads(json.dumps(entry, default=str))
@@ -0,0 +1,240 @@
+"""
+Static manifest artifacts for frontend/public.
+
+Each section manifest is written as minified JSON in three forms:
+
+- ``manifest.<hash>.json``: content-addressed, safe to cache immutably
+- ``manifest.json``: stable name for older clients and tooling
+- ``manifest.latest.json``: tiny pointer to the current fingerprinted file
+
+Large sections are also split for lazy loading, under ``_index/``:
+
+- ``index.<hash>.json``: entry count, shard size and the shard files for
+  the newest-first order and for each tag
+- ``shards/<hash>.json``: fixed-size pages of manifest entries
+- ``entries/<id>.json``: full metadata for a single entry
+
+so the first page renders from the pointer, the index and one shard no
+matter how many entries the section has. Shards and indexes are
+content-addressed and immutable; only changed shards get new files.
+
+Manifests, indexes and shards get precompressed ``.gz`` (and ``.br`` when
+the optional ``brotli`` package is installed) siblings for static servers
+that serve precompressed files. The pointer is written last, so it never
+references a file that isn't there yet.
+"""
+
+import gzip
+import hashlib
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .vault_io import atomic_write_bytes
+
+try:
+    import brotli
+except ImportError:  # Optional: only .gz siblings without it
+    brotli = None
+
+MANIFEST_FILENAME = "manifest.json"
+POINTER_FILENAME = "manifest.latest.json"
+FINGERPRINTED = re.compile(r'^manifest\.([0-9a-f]{12})\.json$')
+
+# Generated lazy-loading artifacts; never treated as a doc entry
+INDEX_DIRNAME = "_index"
+INDEX_FINGERPRINTED = re.compile(r'^index\.([0-9a-f]{12})\.json$')
+INDEX_VERSION = 1
+SHARD_SIZE = 50
+
+# Older fingerprinted manifests kept for clients still holding an old pointer
+KEEP_PREVIOUS = 1
+
+
+def encode_manifest(data: Dict[str, Any]) -> bytes:
+    """Minified, deterministic JSON for a manifest."""
+    return json.dumps(
+        data, separators=(',', ':'), ensure_ascii=False, default=str
+    ).encode('utf-8')
+
+
+def _write_with_siblings(path: Path, body: bytes):
+    atomic_write_bytes(path, body)
+    # mtime=0 keeps the .gz byte-identical for identical content
+    atomic_write_bytes(path.with_name(path.name + '.gz'), gzip.compress(body, 9, mtime=0))
+    if brotli is not None:
+        atomic_write_bytes(path.with_name(path.name + '.br'), brotli.compress(body, quality=11))
+
+
+def _remove_with_siblings(path: Path):
+    for suffix in ('', '.gz', '.br'):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def _fingerprint(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()[:12]
+
+
+def build_index(
+    entries: List[Dict[str, Any]],
+    shard_size: int = SHARD_SIZE
+) -> Tuple[Dict[str, Any], Dict[str, bytes]]:
+    """
+    Split manifest entries into shards.
+
+    Entries are ordered newest first by created_date (undated last), then
+    by ID, and paged both overall and per tag.
+
+    Returns:
+        (index, shards) where shards maps "shards/<hash>.json" to its body
+    """
+    dated = sorted(
+        (e for e in entries if e.get('created_date')),
+        key=lambda e: (str(e['created_date']), e['id']),
+        reverse=True
+    )
+    undated = sorted((e for e in entries if not e.get('created_date')), key=lambda e: e['id'])
+    ordered = dated + undated
+
+    shards: Dict[str, bytes] = {}
+
+    def paginate(items: List[Dict[str, Any]]) -> List[str]:
+        pages = []
+        for start in range(0, len(items), shard_size):
+            body = encode_manifest({"entries": items[start:start + shard_size]})
+            name = f"shards/{_fingerprint(body)}.json"
+            shards[name] = body
+            pages.append(name)
+        return pages
+
+    by_tag: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for entry in ordered:
+        for tag in dict.fromkeys(str(t) for t in entry.get('tags') or []):
+            by_tag[tag].append(entry)
+
+    index = {
+        "version": INDEX_VERSION,
+        "count": len(ordered),
+        "shard_size": shard_size,
+        "pages": paginate(ordered),
+        "tags": {
+            tag: {"count": len(items), "pages": paginate(items)}
+            for tag, items in sorted(by_tag.items())
+        },
+    }
+    return index, shards
+
+
+def _write_index(directory: Path, entries: List[Dict[str, Any]]) -> str:
+    """Write shards and the index; returns the index path relative to directory."""
+    index_dir = directory / INDEX_DIRNAME
+    (index_dir / "shards").mkdir(parents=True, exist_ok=True)
+
+    index, shards = build_index(entries)
+    for name, body in shards.items():
+        # Content-addressed: an existing shard is already correct
+        if not (index_dir / name).exists():
+            _write_with_siblings(index_dir / name, body)
+
+    body = encode_manifest(index)
+    index_name = f"index.{_fingerprint(body)}.json"
+    _write_with_siblings(index_dir / index_name, body)
+    return f"{INDEX_DIRNAME}/{index_name}"
+
+
+def _prune_index(directory: Path, current_index: str):
+    """Drop old indexes (keeping a few) and shards no kept index references."""
+    index_dir = directory / INDEX_DIRNAME
+    current = Path(current_index).name
+
+    stale = sorted(
+        (p for p in index_dir.iterdir() if INDEX_FINGERPRINTED.match(p.name) and p.name != current),
+        key=lambda p: p.stat().st_mtime_ns,
+        reverse=True
+    )
+    for path in stale[KEEP_PREVIOUS:]:
+        _remove_with_siblings(path)
+
+    referenced = set()
+    for path in [index_dir / current] + stale[:KEEP_PREVIOUS]:
+        try:
+            index = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            continue
+        referenced.update(index.get('pages', []))
+        for tag in index.get('tags', {}).values():
+            referenced.update(tag.get('pages', []))
+
+    for path in (index_dir / "shards").glob("*.json"):
+        if f"shards/{path.name}" not in referenced:
+            _remove_with_siblings(path)
+
+
+def write_manifest(directory: Path, data: Dict[str, Any]) -> str:
+    """
+    Write a section manifest and its static artifacts.
+
+    Args:
+        directory: Section directory in frontend/public/content
+        data: Manifest content ({"entries": [...]})
+
+    Returns:
+        Filename of the fingerprinted manifest
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    body = encode_manifest(data)
+    digest = _fingerprint(body)
+    fingerprinted = f"manifest.{digest}.json"
+
+    index_name = _write_index(directory, data.get('entries', []))
+    _write_with_siblings(directory / fingerprinted, body)
+    _write_with_siblings(directory / MANIFEST_FILENAME, body)
+    _write_with_siblings(
+        directory / POINTER_FILENAME,
+        encode_manifest({"manifest": fingerprinted, "hash": digest, "index": index_name})
+    )
+
+    # Prune stale fingerprints, newest first, keeping a few for in-flight clients
+    stale = sorted(
+        (p for p in directory.iterdir() if FINGERPRINTED.match(p.name) and p.name != fingerprinted),
+        key=lambda p: p.stat().st_mtime_ns,
+        reverse=True
+    )
+    for path in stale[KEEP_PREVIOUS:]:
+        _remove_with_siblings(path)
+    _prune_index(directory, index_name)
+
+    return fingerprinted
+
+
+def current_manifest(directory: Path) -> Optional[str]:
+    """Fingerprinted manifest the pointer references, if it and its index exist."""
+    try:
+        pointer = json.loads((directory / POINTER_FILENAME).read_text(encoding='utf-8'))
+        name = pointer.get('manifest', '')
+        index_name = pointer.get('index', '')
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not index_name or not (directory / index_name).exists():
+        return None
+    if FINGERPRINTED.match(name) and (directory / name).exists():
+        return name
+    return None
+
+
+def entry_detail_path(directory: Path, doc_id: str) -> Path:
+    """Per-entry detail file for a doc in a section directory."""
+    return directory / INDEX_DIRNAME / "entries" / f"{doc_id}.json"
+
+
+def write_entry_detail(directory: Path, doc_id: str, detail: Dict[str, Any]):
+    """Write the full metadata of one entry for lazy loading."""
+    path = entry_detail_path(directory, doc_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, encode_manifest(detail))
+
+
+def remove_entry_detail(directory: Path, doc_id: str):
+    entry_detail_path(directory, doc_id).unlink(missing_ok=True)
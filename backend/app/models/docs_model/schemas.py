@@ -10,6 +10,7 @@ class DocSection(str, Enum):
     """Available documentation sections."""
     WORKFLOWS = "workflows"
     SKILLS = "skills"
+    TOOLS = "tools"
     MCP = "mcp"
     SUBAGENTS = "subagents"
 
@@ -25,6 +26,7 @@ class Difficulty(str, Enum):
 SECTION_FILES = {
     DocSection.WORKFLOWS: "WORKFLOW.md",
     DocSection.SKILLS: "SKILL.md",
+    DocSection.TOOLS: "TOOL.md",
     DocSection.MCP: "MCP.md",
     DocSection.SUBAGENTS: "SUBAGENT.md",
 }
@@ -57,6 +59,7 @@ class DocEntry(BaseModel):
     frontmatter: Dict[str, Any]
     content: str  # Markdown content without frontmatter
     raw: str  # Original file content
+    etag: str = ""  # Content hash; send back as If-Match when updating
 
 
 class DocFile(BaseModel):
@@ -101,3 +104,41 @@ class SyncResponse(BaseModel):
     files_processed: int
     manifest_updated: bool = True
     errors: List[str] = Field(default_factory=list)
+    # Entry-level diff ("section/doc_id"); on a dry run, what would change
+    dry_run: bool = False
+    added: List[str] = Field(default_factory=list)
+    updated: List[str] = Field(default_factory=list)
+    removed: List[str] = Field(default_factory=list)
+
+
+class ImportResponse(BaseModel):
+    """Response from a bulk archive import ("section/doc_id" entries)."""
+    success: bool
+    dry_run: bool = False
+    files_processed: int = 0
+    added: List[str] = Field(default_factory=list)
+    updated: List[str] = Field(default_factory=list)
+    unchanged: List[str] = Field(default_factory=list)
+    errors: List[str] = Field(default_factory=list)
+
+
+class DocRef(BaseModel):
+    """Identifies a doc in the dependency graph."""
+    section: DocSection
+    id: str
+    name: str
+
+
+class DocReference(BaseModel):
+    """A frontmatter reference from one doc to another."""
+    source: DocRef
+    field: str  # Frontmatter field, e.g. 'skills'
+    ref: str  # Reference as written
+    target: Optional[DocRef] = None  # None if the reference doesn't resolve
+
+
+class DocReferencesResponse(BaseModel):
+    """Response for dependency graph queries."""
+    doc: Optional[DocRef] = None
+    count: int
+    references: List[DocReference]
@@ -0,0 +1,354 @@
+"""
+Bulk vault export and import as tar archives.
+
+Export streams ``<section>/<doc_id>/...`` members as tar.gz or tar.zst
+without building the archive in memory: compressed bytes are handed out
+after every file, so memory is bounded by the largest single file.
+
+Import reads an archive the same way into a hidden staging directory inside
+the primary vault (same filesystem, so entries can be renamed into place),
+validates every entry's frontmatter in a process pool, diffs it against the
+vault and then swaps the changed entries in. If validation fails nothing is
+applied; if a swap fails the entries already swapped are rolled back.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import tarfile
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .dependency_graph import refresh_dependency_graph
+from .frontmatter import parse_frontmatter
+from .schemas import DocSection, ImportResponse, SECTION_FILES
+from .vault_io import file_lock
+
+try:
+    import zstandard
+except ImportError:  # Optional: tar.gz only without it
+    zstandard = None
+
+if TYPE_CHECKING:
+    from .docs_service import DocsService
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMATS = ("tar.gz", "tar.zst")
+MEDIA_TYPES = {"tar.gz": "application/gzip", "tar.zst": "application/zstd"}
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Doc IDs accepted from an archive; paths below an entry may use any name
+SAFE_ID = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]*$')
+
+# Defaults for what an archive may unpack to (compression ratios are unbounded)
+MAX_EXTRACTED_BYTES = 1024 * 1024 * 1024
+MAX_MEMBERS = 10000
+
+# Below this many entries a process pool costs more than it saves
+POOL_THRESHOLD = 32
+
+
+class ArchiveError(ValueError):
+    """The uploaded archive is unreadable or contains unsafe members."""
+
+
+class ArchiveTooLargeError(ArchiveError):
+    """The archive unpacks to more members or bytes than allowed."""
+
+
+# ================================================================
+# Export
+# ================================================================
+
+class _ChunkBuffer:
+    """Write-only file object whose contents are drained by the exporter."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_export(
+    service: "DocsService",
+    sections: Iterable[DocSection],
+    archive_format: str = "tar.gz"
+) -> Iterator[bytes]:
+    """
+    Stream the given sections as a compressed tar archive.
+
+    Args:
+        service: DocsService whose vault roots are exported
+        sections: Sections to include
+        archive_format: "tar.gz" or "tar.zst"
+
+    Returns:
+        Iterator of compressed archive chunks
+
+    Raises:
+        ArchiveError: If the format isn't available (raised before streaming)
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ArchiveError(f"Unsupported format: {archive_format}")
+    if archive_format == "tar.zst" and zstandard is None:
+        raise ArchiveError("tar.zst requires the optional zstandard package")
+    return _iter_tar(service, list(sections), archive_format)
+
+
+def _iter_tar(service: "DocsService", sections: List[DocSection], archive_format: str) -> Iterator[bytes]:
+    buffer = _ChunkBuffer()
+    if archive_format == "tar.zst":
+        compressor = zstandard.ZstdCompressor(level=10).stream_writer(buffer, closefd=False)
+        tar = tarfile.open(fileobj=compressor, mode='w|')
+    else:
+        compressor = None
+        tar = tarfile.open(fileobj=buffer, mode='w|gz')
+
+    for section in sections:
+        for doc_id, entry_dir in sorted(service._collect_entries(section).items()):
+            for path in sorted(entry_dir.rglob('*')):
+                rel_path = path.relative_to(entry_dir)
+                if not path.is_file() or any(part.startswith('.') for part in rel_path.parts):
+                    continue
+                tar.add(str(path), arcname=f"{section.value}/{doc_id}/{rel_path.as_posix()}", recursive=False)
+                chunk = buffer.drain()
+                if chunk:
+                    yield chunk
+
+    tar.close()
+    if compressor is not None:
+        compressor.close()  # Ends the zstd frame
+    yield buffer.drain()
+
+
+# ================================================================
+# Import
+# ================================================================
+
+def _open_archive(fileobj: IO[bytes]) -> tarfile.TarFile:
+    """Open a gzip or zstd tar stream, detected by its magic bytes."""
+    head = fileobj.read(4)
+    fileobj.seek(0)
+    if head == ZSTD_MAGIC:
+        if zstandard is None:
+            raise ArchiveError("tar.zst requires the optional zstandard package")
+        reader = zstandard.ZstdDecompressor().stream_reader(fileobj)
+        return tarfile.open(fileobj=reader, mode='r|')
+    return tarfile.open(fileobj=fileobj, mode='r|*')
+
+
+def _member_target(member: tarfile.TarInfo) -> Optional[Tuple[DocSection, str, Path]]:
+    """Validate a member name; returns (section, doc_id, relative path)."""
+    parts = [part for part in member.name.split('/') if part not in ('', '.')]
+    if '..' in parts or member.name.startswith('/') or '\0' in member.name:
+        raise ArchiveError(f"Unsafe path in archive: {member.name!r}")
+    # Hidden files (.DS_Store, editor state) and loose files aren't imported
+    if len(parts) < 3 or any(part.startswith('.') for part in parts):
+        return None
+    if not SAFE_ID.match(parts[1]):
+        raise ArchiveError(f"Unsafe doc ID in archive: {member.name!r}")
+    try:
+        section = DocSection(parts[0])
+    except ValueError:
+        raise ArchiveError(f"Unknown section in archive: {parts[0]}")
+    return section, parts[1], Path(*parts[2:])
+
+
+def _stage(
+    fileobj: IO[bytes],
+    staging: Path,
+    max_extracted_bytes: int,
+    max_members: int
+) -> Dict[Tuple[DocSection, str], Path]:
+    """Extract regular files into staging; returns the staged entry directories."""
+    entries: Dict[Tuple[DocSection, str], Path] = {}
+    members = extracted = 0
+    try:
+        with _open_archive(fileobj) as tar:
+            for member in tar:
+                members += 1
+                if members > max_members:
+                    raise ArchiveTooLargeError(f"Archive has more than {max_members} members")
+                if member.isdir():
+                    continue
+                if not member.isfile():
+                    raise ArchiveError(f"Only regular files are allowed: {member.name}")
+
+                target = _member_target(member)
+                if target is None:
+                    continue
+                section, doc_id, rel_path = target
+
+                # The header size bounds what extractfile() reads
+                extracted += member.size
+                if extracted > max_extracted_bytes:
+                    raise ArchiveTooLargeError(f"Archive unpacks to more than {max_extracted_bytes} bytes")
+
+                entry_dir = staging / section.value / doc_id
+                dest = entry_dir / rel_path
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                with tar.extractfile(member) as src, open(dest, 'wb') as dst:
+                    shutil.copyfileobj(src, dst, 1024 * 1024)
+                os.utime(dest, (member.mtime, member.mtime))
+                entries[(section, doc_id)] = entry_dir
+    except (tarfile.TarError, EOFError, OSError) as e:
+        raise ArchiveError(f"Unreadable archive: {e}")
+    return entries
+
+
+def validate_entry(main_file: str) -> Optional[str]:
+    """
+    Check one staged entry's main file (runs in a worker process).
+
+    Returns:
+        An error message, or None if the entry is valid
+    """
+    path = Path(main_file)
+    if not path.exists():
+        return f"missing {path.name}"
+    try:
+        frontmatter, _ = parse_frontmatter(path.read_text(encoding='utf-8'))
+    except (ValueError, UnicodeDecodeError) as e:
+        return str(e)
+    if not isinstance(frontmatter, dict) or not frontmatter:
+        return "missing frontmatter"
+    if not (frontmatter.get('name') or frontmatter.get('title')):
+        return "frontmatter needs a name or title"
+    return None
+
+
+def _validate(entries: Dict[Tuple[DocSection, str], Path], workers: int) -> List[str]:
+    keys = sorted(entries, key=lambda k: (k[0].value, k[1]))
+    main_files = [str(entries[key] / SECTION_FILES[key[0]]) for key in keys]
+
+    if len(keys) >= POOL_THRESHOLD and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(validate_entry, main_files, chunksize=16))
+    else:
+        results = [validate_entry(main_file) for main_file in main_files]
+
+    return [
+        f"{section.value}/{doc_id}: {error}"
+        for (section, doc_id), error in zip(keys, results) if error
+    ]
+
+
+def _tree_digest(root: Path) -> Dict[str, Tuple[int, str]]:
+    digest = {}
+    for path in root.rglob('*'):
+        if path.is_file():
+            content = path.read_bytes()
+            digest[path.relative_to(root).as_posix()] = (len(content), hashlib.sha256(content).hexdigest())
+    return digest
+
+
+def _same_tree(a: Path, b: Path) -> bool:
+    return _tree_digest(a) == _tree_digest(b)
+
+
+def import_archive(
+    service: "DocsService",
+    fileobj: IO[bytes],
+    dry_run: bool = False,
+    workers: int = 4,
+    max_extracted_bytes: int = MAX_EXTRACTED_BYTES,
+    max_members: int = MAX_MEMBERS
+) -> ImportResponse:
+    """
+    Import a tar.gz/tar.zst archive of ``<section>/<doc_id>/...`` entries.
+
+    Entries in the archive replace the whole entry directory in the primary
+    vault; entries not in the archive are left alone.
+
+    Args:
+        service: DocsService whose primary vault receives the entries
+        fileobj: Seekable archive stream
+        dry_run: Validate and diff only
+        workers: Processes used to validate frontmatter
+        max_extracted_bytes: Cap on the total size of the files unpacked
+        max_members: Cap on the number of archive members
+
+    Returns:
+        ImportResponse with the added/updated/unchanged entries
+
+    Raises:
+        ArchiveError: If the archive is unreadable or unsafe
+        ArchiveTooLargeError: If it unpacks past either cap
+    """
+    staging = Path(tempfile.mkdtemp(prefix='.import-', dir=service.vault_path))
+    try:
+        entries = _stage(fileobj, staging, max_extracted_bytes, max_members)
+        errors = _validate(entries, workers)
+        files = sum(1 for entry_dir in entries.values() for p in entry_dir.rglob('*') if p.is_file())
+
+        added, updated, unchanged = [], [], []
+        changes = []
+        for (section, doc_id), staged in sorted(entries.items(), key=lambda i: (i[0][0].value, i[0][1])):
+            label = f"{section.value}/{doc_id}"
+            current = service.vault_path / section.value / doc_id
+            if not current.exists():
+                added.append(label)
+            elif _same_tree(staged, current):
+                unchanged.append(label)
+                continue
+            else:
+                updated.append(label)
+            changes.append((section, doc_id, staged, current))
+
+        if errors or dry_run:
+            return ImportResponse(
+                success=not errors, dry_run=dry_run, files_processed=files,
+                added=added, updated=updated, unchanged=unchanged, errors=errors
+            )
+
+        _swap_in(changes, staging / '.previous')
+        for section, doc_id, _, _ in changes:
+            refresh_dependency_graph(section, doc_id)
+
+        logger.info(f"Imported {len(added)} new and {len(updated)} updated vault entries")
+        return ImportResponse(
+            success=True, dry_run=False, files_processed=files,
+            added=added, updated=updated, unchanged=unchanged, errors=[]
+        )
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _swap_in(changes: List[Tuple[DocSection, str, Path, Path]], backup_root: Path):
+    """Rename staged entries into place, rolling back on failure."""
+    swapped: List[Tuple[Path, Optional[Path]]] = []
+    try:
+        for section, doc_id, staged, current in changes:
+            main_file = current / SECTION_FILES[section]
+            with file_lock(main_file):
+                backup = None
+                if current.exists():
+                    backup = backup_root / section.value / doc_id
+                    backup.parent.mkdir(parents=True, exist_ok=True)
+                    os.rename(current, backup)
+                swapped.append((current, backup))
+                current.parent.mkdir(parents=True, exist_ok=True)
+                os.rename(staged, current)
+    except BaseException:
+        for current, backup in reversed(swapped):
+            if current.exists():
+                shutil.rmtree(current)
+            if backup is not None:
+                os.rename(backup, current)
+        raise
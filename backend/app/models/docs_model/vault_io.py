@@ -0,0 +1,125 @@
+"""Crash-safe file writes, per-file locks and ETags for vault documents."""
+
+import fcntl
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+
+# Lock files live outside the vault so sync never copies them
+LOCK_DIR = Path(tempfile.gettempdir()) / "vault-locks"
+
+
+class ConflictError(Exception):
+    """The document changed since the caller read it (If-Match failed)."""
+
+
+def compute_etag(content: Union[str, bytes]) -> str:
+    """
+    Strong ETag for document content.
+
+    Args:
+        content: File content (text is hashed as UTF-8)
+
+    Returns:
+        Quoted content hash, e.g. '"3f2a..."'
+    """
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+def check_etag(current: Optional[str], if_match: Optional[str]) -> None:
+    """
+    Enforce optimistic concurrency.
+
+    Args:
+        current: Current file content, or None if the file doesn't exist
+        if_match: ETag the client last saw (None skips the check, '*' only
+            requires that the file exists)
+
+    Raises:
+        ConflictError: If the file changed since the client read it
+    """
+    if if_match is None:
+        return
+    if if_match.strip() == '*':
+        if current is None:
+            raise ConflictError("Document does not exist")
+        return
+
+    current_etag = compute_etag(current) if current is not None else None
+    accepted = {tag.strip().removeprefix('W/') for tag in if_match.split(',')}
+    if current_etag not in accepted:
+        raise ConflictError("Document was modified by someone else; reload and retry")
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """
+    Hold an exclusive lock for a vault file (or entry directory).
+
+    Serializes read-modify-write cycles across threads, workers and the
+    sync job. Readers don't need it: writes are atomic renames.
+    """
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(str(Path(path).resolve()).encode('utf-8')).hexdigest()
+
+    with open(LOCK_DIR / f"{key}.lock", 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, content: str, encoding: str = 'utf-8') -> None:
+    """
+    Replace a file's content atomically.
+
+    Writes to a temp file in the same directory, fsyncs it, renames it over
+    the target and fsyncs the directory, so readers (and a crash) see either
+    the old or the new file, never a truncated one.
+
+    Args:
+        path: Target file
+        content: New text content
+        encoding: Text encoding
+    """
+    atomic_write_bytes(path, content.encode(encoding))
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """Binary counterpart of atomic_write_text()."""
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            tmp_file.write(content)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+
+        # mkstemp creates 0600; keep the usual permissions for vault files
+        if path.exists():
+            os.chmod(tmp_name, path.stat().st_mode & 0o777)
+        else:
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(tmp_name, 0o666 & ~umask)
+
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except FileNotFoundError:
+            pass
+        raise
+
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
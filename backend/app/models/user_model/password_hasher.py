@@ -0,0 +1,76 @@
+"""
+Password Hashing Service
+Runs bcrypt on a bounded worker pool so hashing and verification never block
+the event loop, with a configurable work factor and rehash-on-login support
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import bcrypt
+
+from ...core.config import settings
+
+
+class PasswordHasher:
+    """bcrypt hashing offloaded to a thread pool (bcrypt releases the GIL)"""
+
+    def __init__(self, rounds: int, max_workers: int):
+        self.rounds = rounds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="password-hasher"
+        )
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    def _hash_sync(self, password: str) -> str:
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def _verify_sync(self, password: str, password_hash: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            # Malformed or non-bcrypt hash stored for this user
+            return False
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured work factor"""
+        return await self._run(self._hash_sync, password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a stored bcrypt hash"""
+        return await self._run(self._verify_sync, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True when a stored hash was made with a different work factor"""
+        try:
+            # bcrypt hashes look like $2b$12$<salt+hash>
+            return int(password_hash.split('$')[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    async def verify_and_update(self, password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and, if the stored hash uses an outdated cost,
+        return a fresh hash to persist (otherwise None).
+        """
+        if not await self.verify(password, password_hash):
+            return False, None
+
+        if self.needs_rehash(password_hash):
+            return True, await self.hash(password)
+
+        return True, None
+
+    def shutdown(self):
+        """Stop the worker threads (called on application shutdown)"""
+        self._executor.shutdown(wait=False)
+
+
+# Global hasher instance
+password_hasher = PasswordHasher(settings.BCRYPT_ROUNDS, settings.PASSWORD_HASH_WORKERS)
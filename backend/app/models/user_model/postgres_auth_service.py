@@ -3,24 +3,44 @@ PostgreSQL-based User Authentication System
 Professional implementation with bcrypt, AWS RDS integration, and proper security
 """
 
-import bcrypt
+import base64
 import secrets
+import hmac
+import hashlib
 import json
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Optional, Any, List
 from uuid import UUID, uuid4
 import jwt
-import asyncpg
+from cryptography.fernet import Fernet, InvalidToken
 from pydantic import BaseModel, EmailStr, Field
 
 from ...core.config import settings
+from ...core.cache import TTLCache
+from ...core.db_pool import db_pools, MeteredPool
+from ...core.activity_log import ActivityLogBuffer
+from .password_hasher import password_hasher
 
 
 # Configuration
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_HOURS = 24
 
+# Provider -> user_api_keys column holding its encrypted key
+API_KEY_COLUMNS = {
+    "openai": "openai_key_encrypted",
+    "anthropic": "anthropic_key_encrypted",
+    "google": "google_key_encrypted",
+}
+
+db_pools.configure("auth", command_timeout=60)
+
+# Audit rows are queued and COPYed in batches off the request path
+activity_log_buffer = ActivityLogBuffer(
+    "user_activity_log", ("user_id", "action", "details", "ip_address", "user_agent")
+)
+
 
 class UserRegistration(BaseModel):
     """User registration model"""
@@ -70,33 +90,35 @@ class PostgreSQLAuthService:
     """PostgreSQL-based authentication service for AWS RDS"""
 
     def __init__(self):
-        self.connection_pool = None
-
-    async def get_connection_pool(self) -> asyncpg.Pool:
-        """Get or create connection pool"""
-        if not self.connection_pool:
-            self.connection_pool = await asyncpg.create_pool(
-                host=settings.DATABASE_HOST,
-                port=int(settings.DATABASE_PORT),
-                user=settings.DATABASE_USER,
-                password=settings.DATABASE_PASSWORD,
-                database=settings.DATABASE_NAME,
-                min_size=5,
-                max_size=20,
-                command_timeout=60,
-                ssl='require'  # Required for AWS RDS
-            )
-        return self.connection_pool
-
-    def hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
-        salt = bcrypt.gensalt()
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return password_hash.decode('utf-8')
-
-    def verify_password(self, password: str, password_hash: str) -> bool:
-        """Verify password against bcrypt hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        # Authenticated-principal caches: session digest -> user_id, user_id -> user row
+        self._session_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS)
+        self._user_cache = TTLCache(settings.AUTH_CACHE_TTL_SECONDS)
+
+    def invalidate_user(self, user_id: str):
+        """Drop a cached user; every write to users or a user's profile data calls this"""
+        self._user_cache.delete(str(user_id))
+
+    def invalidate_session(self, token_hash: str):
+        """Drop a cached session (call after logout/revocation)"""
+        self._session_cache.delete(token_hash)
+
+    async def get_connection_pool(self) -> MeteredPool:
+        """Get the shared "auth" pool from the pool manager"""
+        return await db_pools.get_pool("auth")
+
+    async def hash_password(self, password: str) -> str:
+        """Hash password using bcrypt (on the hasher's worker pool)"""
+        return await password_hasher.hash(password)
+
+    async def verify_password(self, password: str, password_hash: str) -> bool:
+        """Verify password against bcrypt hash (on the hasher's worker pool)"""
+        return await password_hasher.verify(password, password_hash)
+
+    def hash_session_token(self, token: str) -> str:
+        """Keyed SHA-256 digest of a session token, used as its lookup key"""
+        return hmac.new(
+            settings.SECRET_KEY.encode('utf-8'), token.encode('utf-8'), hashlib.sha256
+        ).hexdigest()
 
     def generate_user_id(self) -> str:
         """Generate unique user ID"""
@@ -126,13 +148,10 @@ class PostgreSQLAuthService:
             return None
 
     async def log_user_activity(self, user_id: str, action: str, details: Dict = None, ip_address: str = None, user_agent: str = None):
-        """Log user activity for audit trail"""
-        pool = await self.get_connection_pool()
-        async with pool.acquire() as conn:
-            await conn.execute("""
-                INSERT INTO user_activity_log (user_id, action, details, ip_address, user_agent)
-                VALUES ($1, $2, $3, $4, $5)
-            """, UUID(user_id), action, json.dumps(details or {}), ip_address, user_agent)
+        """Log user activity for audit trail (buffered; written in batches)"""
+        await activity_log_buffer.log(
+            (UUID(user_id), action, json.dumps(details or {}), ip_address, user_agent)
+        )
 
     async def register_user(self, registration: UserRegistration, ip_address: str = None, user_agent: str = None) -> Dict:
         """Register a new user in PostgreSQL"""
@@ -149,7 +168,7 @@ class PostgreSQLAuthService:
 
                 # Create new user
                 user_id = self.generate_user_id()
-                password_hash = self.hash_password(registration.password)
+                password_hash = await self.hash_password(registration.password)
                 now = datetime.utcnow()
 
                 # Insert user
@@ -171,7 +190,7 @@ class PostgreSQLAuthService:
                 
                 # Store session
                 session_id = str(uuid4())
-                token_hash = bcrypt.hashpw(token.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                token_hash = self.hash_session_token(token)
                 expires_at = now + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
 
                 await conn.execute("""
@@ -223,24 +242,34 @@ class PostgreSQLAuthService:
                 if not user_row:
                     return {"success": False, "message": "Invalid email or password"}
 
-                # Verify password
-                if not self.verify_password(login.password, user_row['password_hash']):
+                # Verify password (and upgrade the hash if the work factor changed)
+                valid, new_hash = await password_hasher.verify_and_update(
+                    login.password, user_row['password_hash']
+                )
+                if not valid:
                     return {"success": False, "message": "Invalid email or password"}
 
                 user_id = str(user_row['user_id'])
                 now = datetime.utcnow()
 
                 # Update last login
-                await conn.execute("""
-                    UPDATE users SET last_login = $1 WHERE user_id = $2
-                """, now, user_row['user_id'])
+                if new_hash:
+                    await conn.execute("""
+                        UPDATE users SET last_login = $1, password_hash = $2 WHERE user_id = $3
+                    """, now, new_hash, user_row['user_id'])
+                else:
+                    await conn.execute("""
+                        UPDATE users SET last_login = $1 WHERE user_id = $2
+                    """, now, user_row['user_id'])
+
+                self.invalidate_user(user_id)
 
                 # Create session token
                 token = self.create_access_token(user_id, user_row['email'])
                 
                 # Store session
                 session_id = str(uuid4())
-                token_hash = bcrypt.hashpw(token.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                token_hash = self.hash_session_token(token)
                 expires_at = now + timedelta(hours=ACCESS_TOKEN_EXPIRE_HOURS)
 
                 await conn.execute("""
@@ -292,32 +321,87 @@ class PostgreSQLAuthService:
                 return {"success": False, "message": f"Login failed: {str(e)}"}
 
     async def get_user_by_token(self, token: str) -> Optional[Dict]:
-        """Get user information from token"""
+        """
+        Get user information from token (requires a live, unrevoked session).
+
+        Served from a short-TTL in-process cache; only a miss touches the DB.
+        """
         payload = self.verify_token(token)
         if not payload:
             return None
 
+        token_hash = self.hash_session_token(token)
+        user_id = self._session_cache.get(token_hash)
+        if user_id is not None:
+            user = self._user_cache.get(user_id)
+            if user is not None:
+                return dict(user)
+
         pool = await self.get_connection_pool()
         async with pool.acquire() as conn:
             try:
                 user_row = await conn.fetchrow("""
                     SELECT u.user_id, u.email, u.full_name, u.organization,
                            u.subscription_tier, u.daily_limit, u.monthly_limit,
-                           u.courses_created, u.is_verified, u.created_at, u.last_login,
-                           COUNT(uc.course_id) as total_courses
-                    FROM users u
-                    LEFT JOIN user_courses uc ON u.user_id = uc.user_id
-                    WHERE u.user_id = $1 AND u.is_active = TRUE
-                    GROUP BY u.user_id
-                """, UUID(payload['user_id']))
-
-                if user_row:
-                    return dict(user_row)
-                return None
+                           u.courses_created, u.is_verified, u.created_at, u.last_login
+                    FROM user_sessions s
+                    JOIN users u ON u.user_id = s.user_id
+                    WHERE s.token_hash = $1 AND s.expires_at > NOW()
+                      AND u.user_id = $2 AND u.is_active = TRUE
+                """, token_hash, UUID(payload['user_id']))
+
+                if not user_row:
+                    return None
+
+                user = dict(user_row)
+                # courses_created is a maintained counter; keep the old key for callers
+                user['total_courses'] = user['courses_created']
+
+                user_id = str(user['user_id'])
+                self._session_cache.set(token_hash, user_id)
+                self._user_cache.set(user_id, user)
+                return dict(user)
 
             except Exception:
                 return None
 
+    async def get_session_by_token(self, token: str) -> Optional[Dict]:
+        """Look up the live session for a token with a single indexed query"""
+        pool = await self.get_connection_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow("""
+                SELECT session_id, user_id, expires_at, ip_address, user_agent
+                FROM user_sessions
+                WHERE token_hash = $1 AND expires_at > NOW()
+            """, self.hash_session_token(token))
+
+            return dict(row) if row else None
+
+    async def revoke_token(self, token: str) -> bool:
+        """Invalidate the session a token belongs to"""
+        pool = await self.get_connection_pool()
+        async with pool.acquire() as conn:
+            try:
+                token_hash = self.hash_session_token(token)
+                row = await conn.fetchrow("""
+                    DELETE FROM user_sessions WHERE token_hash = $1
+                    RETURNING session_id, user_id
+                """, token_hash)
+                # Evict only once the row is gone, so a concurrent lookup
+                # can't re-cache the revoked session
+                self.invalidate_session(token_hash)
+
+                if not row:
+                    return False
+
+                await self.log_user_activity(
+                    str(row['user_id']), "logout", {"session_id": str(row['session_id'])}
+                )
+                return True
+
+            except Exception:
+                return False
+
     async def get_user_courses(self, user_id: str, limit: int = 20) -> List[UserCourse]:
         """Get courses created by a user"""
         pool = await self.get_connection_pool()
@@ -379,6 +463,7 @@ class PostgreSQLAuthService:
                     UPDATE users SET courses_created = courses_created + 1
                     WHERE user_id = $1
                 """, UUID(user_id))
+                self.invalidate_user(user_id)
 
                 # Log course creation
                 await self.log_user_activity(
@@ -391,6 +476,57 @@ class PostgreSQLAuthService:
             except Exception:
                 return ""
 
+    def _api_key_cipher(self) -> Fernet:
+        """Fernet cipher for user_api_keys, keyed from SECRET_KEY"""
+        key = hashlib.sha256(settings.SECRET_KEY.encode('utf-8')).digest()
+        return Fernet(base64.urlsafe_b64encode(key))
+
+    async def get_user_api_keys(self, user_id: str) -> Dict[str, str]:
+        """Decrypted API keys per provider ("" when unset or unreadable)"""
+        pool = await self.get_connection_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(f"""
+                SELECT {', '.join(API_KEY_COLUMNS.values())}
+                FROM user_api_keys WHERE user_id = $1
+            """, UUID(str(user_id)))
+
+        cipher = self._api_key_cipher()
+        keys = {}
+        for provider, column in API_KEY_COLUMNS.items():
+            value = row[column] if row else None
+            try:
+                keys[provider] = cipher.decrypt(value.encode('utf-8')).decode('utf-8') if value else ""
+            except InvalidToken:
+                keys[provider] = ""
+        return keys
+
+    async def update_user_api_keys(self, user_id: str, api_keys: Dict[str, str]) -> bool:
+        """Encrypt and store the given providers' API keys; others are kept"""
+        columns = {API_KEY_COLUMNS[p]: key for p, key in api_keys.items() if p in API_KEY_COLUMNS}
+        if not columns:
+            return False
+
+        cipher = self._api_key_cipher()
+        names = list(columns)
+        values = [cipher.encrypt(columns[name].encode('utf-8')).decode('utf-8') for name in names]
+
+        pool = await self.get_connection_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                # Users registered through /auth/register have no row yet
+                result = await conn.execute(f"""
+                    UPDATE user_api_keys
+                    SET {', '.join(f'{name} = ${i + 2}' for i, name in enumerate(names))}
+                    WHERE user_id = $1
+                """, UUID(str(user_id)), *values)
+                if result == "UPDATE 0":
+                    await conn.execute(f"""
+                        INSERT INTO user_api_keys (user_id, {', '.join(names)})
+                        VALUES ($1, {', '.join(f'${i + 2}' for i in range(len(names)))})
+                    """, UUID(str(user_id)), *values)
+        self.invalidate_user(user_id)
+        return True
+
     async def logout_user(self, session_id: str, user_id: str = None) -> bool:
         """Logout user by invalidating session"""
         pool = await self.get_connection_pool()
@@ -405,15 +541,19 @@ class PostgreSQLAuthService:
                         user_id = str(session_row['user_id'])
 
                 # Delete session
-                result = await conn.execute("""
+                row = await conn.fetchrow("""
                     DELETE FROM user_sessions WHERE session_id = $1
+                    RETURNING token_hash
                 """, UUID(session_id))
 
+                if row:
+                    self.invalidate_session(row['token_hash'])
+
                 # Log logout if we have user_id
                 if user_id:
                     await self.log_user_activity(user_id, "logout", {"session_id": session_id})
 
-                return "DELETE 1" in result
+                return row is not None
 
             except Exception:
                 return False
@@ -431,9 +571,8 @@ class PostgreSQLAuthService:
                 return ""
 
     async def close_connections(self):
-        """Close connection pool"""
-        if self.connection_pool:
-            await self.connection_pool.close()
+        """Close the auth connection pool"""
+        await db_pools.close_pool("auth")
 
 
 # Global instance
@@ -0,0 +1,12 @@
+"""Workflow Model - File-based workflow storage helpers."""
+
+from .workflow_index import WorkflowIndex
+from .workflow_document import WorkflowDocument, WorkflowStep
+from .id_allocator import WorkflowIdAllocator
+
+__all__ = [
+    "WorkflowIndex",
+    "WorkflowDocument",
+    "WorkflowStep",
+    "WorkflowIdAllocator"
+]
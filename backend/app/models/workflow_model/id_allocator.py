@@ -0,0 +1,92 @@
+"""
+Collision-free workflow ID allocation.
+
+IDs look like ``workflow_YYYYMMDD_NNN``. Instead of globbing the day's
+workflow directories on every save, the allocator keeps a per-day counter
+in ``.workflow-ids/<day>.counter`` and reserves each ID by exclusively
+creating ``.workflow-ids/<day>/<NNN>``. Allocation holds a per-day file
+lock, so concurrent saves in any worker get distinct numbers. A number is
+skipped if it is already reserved or any directory uses it, whatever its
+slug (an import, a manual copy).
+
+The day's directories are scanned only once, to seed a counter that
+doesn't exist yet.
+"""
+
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from app.models.docs_model.vault_io import atomic_write_text, file_lock
+
+IDS_DIRNAME = ".workflow-ids"
+MAX_ATTEMPTS = 1000
+
+
+class WorkflowIdAllocator:
+    """Allocates workflow IDs and creates their directories."""
+
+    def __init__(self, workflows_dir: Path):
+        self.workflows_dir = workflows_dir
+        self.ids_dir = workflows_dir / IDS_DIRNAME
+
+    def _used_numbers(self, day: str, prefix: str = "") -> List[int]:
+        """Numbers of the day's workflow directories whose number starts with prefix."""
+        pattern = re.compile(rf'^workflow_{day}_(\d{{3,}})(?:_|$)')
+        return [
+            int(match.group(1))
+            for match in (pattern.match(d.name) for d in self.workflows_dir.glob(f"workflow_{day}_{prefix}*"))
+            if match
+        ]
+
+    def _seed(self, day: str) -> int:
+        """Highest number already used on a day (only for a new counter)."""
+        return max(self._used_numbers(day), default=0)
+
+    def allocate(self, slug: str, day: Optional[str] = None) -> Tuple[str, Path]:
+        """
+        Reserve the next ID for a day and create its directory.
+
+        Args:
+            slug: Sanitized title appended to the directory name
+            day: YYYYMMDD (defaults to today)
+
+        Returns:
+            (workflow_id, workflow_dir)
+        """
+        day = day or datetime.now().strftime("%Y%m%d")
+        reservations = self.ids_dir / day
+        reservations.mkdir(parents=True, exist_ok=True)
+        counter_file = self.ids_dir / f"{day}.counter"
+
+        with file_lock(counter_file):
+            try:
+                number = int(counter_file.read_text().strip())
+            except (FileNotFoundError, ValueError):
+                number = self._seed(day)
+
+            for _ in range(MAX_ATTEMPTS):
+                number += 1
+                workflow_id = f"workflow_{day}_{number:03d}"
+                try:
+                    os.close(os.open(reservations / f"{number:03d}", os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                except FileExistsError:
+                    continue
+
+                # Imported directories carry IDs without a reservation
+                if number in self._used_numbers(day, f"{number:03d}"):
+                    continue
+
+                dirname = f"{workflow_id}_{slug}" if slug else workflow_id
+                workflow_dir = self.workflows_dir / dirname
+                try:
+                    workflow_dir.mkdir()
+                except FileExistsError:
+                    continue
+
+                atomic_write_text(counter_file, str(number))
+                return workflow_id, workflow_dir
+
+        raise RuntimeError(f"Could not allocate a workflow ID for {day}")
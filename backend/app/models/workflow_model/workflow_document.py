@@ -0,0 +1,157 @@
+"""
+Step-level document model for WORKFLOW.md files.
+
+A workflow is parsed once into its steps (``## Step N: Title`` or
+``### Step N: Title``) and each step into its ``**Section:**`` blocks, with
+character offsets into the original text. Steps are addressed by number in
+O(1), and edits to any number of steps are spliced into the original text in
+a single pass: untouched steps, the frontmatter and any other blocks are
+kept byte-for-byte.
+
+Parsed documents are cached per path and revalidated by (mtime_ns, size).
+"""
+
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from app.core.cache import TTLCache
+
+STEP_HEADING = re.compile(r'^(#{2,3}) Step (\d+):[ \t]*(.*?)[ \t]*$', re.MULTILINE)
+ANY_HEADING = re.compile(r'^(#{1,6}) ', re.MULTILINE)
+SECTION_MARKER = re.compile(r'^\*\*([A-Z][^*\n]*):\*\*[ \t]*(.*)$', re.MULTILINE)
+
+# Editable step fields and the section labels they map to, in render order
+STEP_SECTIONS = {
+    'instruction': 'Instruction',
+    'skills': 'Skills',
+    'tools': 'Tools',
+    'resources': 'Resources',
+    'deliverable': 'Deliverable',
+}
+
+# Parsed documents keyed by path, stored with the stamp they were parsed at
+_documents = TTLCache(ttl_seconds=3600, max_size=128)
+
+
+@dataclass
+class WorkflowStep:
+    """One step: heading, free text before the first section, and sections."""
+    number: int
+    title: str
+    level: str
+    start: int
+    end: int
+    preamble: str = ''
+    sections: Dict[str, str] = field(default_factory=dict)
+
+    def render(self, title: str, sections: Mapping[str, str]) -> str:
+        """Render this step with a new title and section bodies."""
+        content = f"{self.level} Step {self.number}: {title}\n\n"
+        if self.preamble:
+            content += f"{self.preamble}\n\n"
+        for label, body in sections.items():
+            if body:
+                content += f"**{label}:**\n{body}\n\n"
+        return content
+
+
+class WorkflowDocument:
+    """A parsed WORKFLOW.md with addressable steps."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.steps: Dict[int, WorkflowStep] = {}
+        self._parse()
+
+    def _parse(self):
+        text = self.text
+        for match in STEP_HEADING.finditer(text):
+            level = match.group(1)
+            number = int(match.group(2))
+
+            # A step runs until the next heading of the same or a higher level
+            end = len(text)
+            for heading in ANY_HEADING.finditer(text, match.end()):
+                if len(heading.group(1)) <= len(level):
+                    end = heading.start()
+                    break
+
+            # Repeated step numbers: the first occurrence wins
+            if number in self.steps:
+                continue
+
+            step = WorkflowStep(
+                number=number,
+                title=match.group(3),
+                level=level,
+                start=match.start(),
+                end=end,
+            )
+            self._parse_sections(step, text[match.end():end])
+            self.steps[number] = step
+
+    @staticmethod
+    def _parse_sections(step: WorkflowStep, body: str):
+        markers = list(SECTION_MARKER.finditer(body))
+        step.preamble = (body[:markers[0].start()] if markers else body).strip()
+
+        for i, marker in enumerate(markers):
+            section_end = markers[i + 1].start() if i + 1 < len(markers) else len(body)
+            inline = marker.group(2)
+            content = body[marker.end():section_end]
+            step.sections[marker.group(1)] = f"{inline}{content}".strip()
+
+    @classmethod
+    def load(cls, path: Path) -> "WorkflowDocument":
+        """Parse a workflow file, reusing the cached parse while its stamp holds."""
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        key = str(path)
+
+        cached = _documents.get(key)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+
+        document = cls(path.read_text(encoding='utf-8'))
+        _documents.set(key, (stamp, document))
+        return document
+
+    def step(self, number: int) -> Optional[WorkflowStep]:
+        return self.steps.get(number)
+
+    def patch_steps(self, updates: Mapping[int, Mapping[str, str]]) -> str:
+        """
+        Apply step edits and return the new document text.
+
+        ``updates`` maps step number to ``{'title': ..., 'instruction': ...,
+        ...}``. Empty fields keep the existing section; sections this model
+        doesn't know about are kept in place. Raises KeyError for a missing
+        step.
+        """
+        replacements: List[Tuple[int, int, str]] = []
+
+        for number, update in updates.items():
+            step = self.steps.get(number)
+            if step is None:
+                raise KeyError(number)
+
+            sections = dict(step.sections)
+            for field_name, label in STEP_SECTIONS.items():
+                value = update.get(field_name)
+                if value:
+                    sections[label] = value
+
+            title = update.get('title') or step.title
+            replacements.append((step.start, step.end, step.render(title, sections)))
+
+        # Splice all edits into the original text in one pass
+        parts = []
+        cursor = 0
+        for start, end, content in sorted(replacements):
+            parts.append(self.text[cursor:start])
+            parts.append(content)
+            cursor = end
+        parts.append(self.text[cursor:])
+        return ''.join(parts)
@@ -0,0 +1,128 @@
+"""
+Persistent index of saved workflows.
+
+Parsed metadata for every workflow_*/WORKFLOW.md is kept in
+.workflow-index.json next to the workflow directories, keyed by workflow ID
+and stamped with the file's (mtime_ns, size). Reads only stat the files and
+re-parse the ones whose stamp changed, so listing cost no longer grows with
+the total size of the workflow markdown. Writers call refresh()/remove() to
+keep the index current without waiting for the next read.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.models.docs_model.vault_io import atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILENAME = ".workflow-index.json"
+INDEX_VERSION = 2
+WORKFLOW_FILENAME = "WORKFLOW.md"
+
+
+class WorkflowIndex:
+    """Stamp-validated cache of workflow list entries, persisted to disk."""
+
+    def __init__(self, workflows_dir: Path, build_entry: Callable[[Path], Dict[str, Any]]):
+        """
+        Args:
+            workflows_dir: Directory containing workflow_* subdirectories
+            build_entry: Parses a WORKFLOW.md path into a list entry
+        """
+        self.workflows_dir = workflows_dir
+        self.index_path = workflows_dir / INDEX_FILENAME
+        self._build_entry = build_entry
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _stamp(path: Path) -> Optional[List[int]]:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            self._records = {}
+            try:
+                data = json.loads(self.index_path.read_text(encoding='utf-8'))
+                if data.get('version') == INDEX_VERSION:
+                    self._records = data.get('workflows', {})
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Rebuilding unreadable workflow index: {e}")
+        return self._records
+
+    def _save(self):
+        if not self.workflows_dir.exists():
+            return
+        atomic_write_text(
+            self.index_path,
+            json.dumps({'version': INDEX_VERSION, 'workflows': self._records}, separators=(',', ':'))
+        )
+
+    def _index_one(self, records: Dict[str, Dict[str, Any]], workflow_id: str) -> bool:
+        """Bring one record in line with disk; True if the index changed."""
+        filepath = self.workflows_dir / workflow_id / WORKFLOW_FILENAME
+        stamp = self._stamp(filepath)
+
+        if stamp is None:
+            return records.pop(workflow_id, None) is not None
+
+        record = records.get(workflow_id)
+        if record and record.get('stamp') == stamp:
+            return False
+
+        try:
+            entry = self._build_entry(filepath)
+        except Exception as e:
+            logger.error(f"Error parsing workflow {workflow_id}: {e}")
+            return records.pop(workflow_id, None) is not None
+
+        records[workflow_id] = {'stamp': stamp, 'entry': entry}
+        return True
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """All workflow entries, revalidated against the files on disk."""
+        with self._lock:
+            records = self._load()
+            if not self.workflows_dir.exists():
+                return []
+
+            on_disk = {
+                d.name for d in self.workflows_dir.glob("workflow_*")
+                if (d / WORKFLOW_FILENAME).is_file()
+            }
+
+            changed = False
+            for workflow_id in set(records) - on_disk:
+                del records[workflow_id]
+                changed = True
+            for workflow_id in on_disk:
+                changed |= self._index_one(records, workflow_id)
+
+            if changed:
+                self._save()
+
+            return [records[workflow_id]['entry'] for workflow_id in records]
+
+    def refresh(self, workflow_id: str):
+        """Re-index one workflow after it was written."""
+        with self._lock:
+            records = self._load()
+            if self._index_one(records, workflow_id):
+                self._save()
+
+    def remove(self, workflow_id: str):
+        """Drop a deleted workflow from the index."""
+        with self._lock:
+            records = self._load()
+            if records.pop(workflow_id, None) is not None:
+                self._save()
@@ -0,0 +1,10 @@
+"""Shared test setup"""
+import os
+
+# Settings has required fields; tests never reach the services behind them
+for name in (
+    "DATABASE_HOST", "DATABASE_NAME", "DATABASE_USER", "DATABASE_PASSWORD",
+    "AWS_ACCESS_KEY_ID", "AWS_SECRET_ACCESS_KEY", "S3_BUCKET_NAME",
+    "ANTHROPIC_API_KEY", "SECRET_KEY",
+):
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,53 @@
+"""Activity log buffer: batched COPY, falling back to row-by-row inserts"""
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.core import activity_log
+from app.core.activity_log import ActivityLogBuffer
+
+
+class FakeConnection:
+    """Rejects COPY (when asked to) and any row whose first value is "bad" """
+
+    def __init__(self, copy_fails: bool):
+        self.copy_fails = copy_fails
+        self.rows = []
+
+    async def copy_records_to_table(self, table, records, columns):
+        if self.copy_fails:
+            raise ValueError("invalid input syntax")
+        self.rows.extend(records)
+
+    async def execute(self, query, *args):
+        if args[0] == "bad":
+            raise ValueError("invalid input syntax")
+        self.rows.append(args)
+
+
+def use_connection(monkeypatch, conn):
+    @asynccontextmanager
+    async def acquire(name):
+        yield conn
+
+    monkeypatch.setattr(activity_log.db_pools, "acquire", acquire)
+
+
+@pytest.mark.asyncio
+async def test_copy_writes_whole_batch(monkeypatch):
+    conn = FakeConnection(copy_fails=False)
+    use_connection(monkeypatch, conn)
+    buffer = ActivityLogBuffer("activity", ("action", "detail"))
+
+    await buffer._flush([("login", "a"), ("logout", "b")])
+    assert conn.rows == [("login", "a"), ("logout", "b")]
+
+
+@pytest.mark.asyncio
+async def test_failed_copy_keeps_good_rows(monkeypatch):
+    conn = FakeConnection(copy_fails=True)
+    use_connection(monkeypatch, conn)
+    buffer = ActivityLogBuffer("activity", ("action", "detail"))
+
+    await buffer._flush([("login", "a"), ("bad", "b"), ("logout", "c")])
+    assert conn.rows == [("login", "a"), ("logout", "c")]
@@ -0,0 +1,48 @@
+"""Dependency graph: picks up edits made directly in the vault"""
+import shutil
+
+import pytest
+
+from app.models.docs_model import DocSection
+from app.models.docs_model.dependency_graph import DependencyGraph
+from app.models.docs_model.docs_service import DocsService
+
+
+def write_doc(vault, section, doc_id, filename, frontmatter):
+    entry = vault / section / doc_id
+    entry.mkdir(parents=True, exist_ok=True)
+    (entry / filename).write_text(f"---\n{frontmatter}---\n\nBody\n", encoding='utf-8')
+
+
+@pytest.fixture
+def vault(tmp_path):
+    vault = tmp_path / "vault"
+    write_doc(vault, "workflows", "release", "WORKFLOW.md", "name: Release\nskills:\n  - writer\n")
+    return vault
+
+
+@pytest.fixture
+def graph(vault, tmp_path):
+    return DependencyGraph.build(DocsService(str(vault), str(tmp_path / "public")))
+
+
+def test_doc_added_outside_the_service(vault, graph):
+    assert [r['ref'] for r in graph.broken_references()] == ["writer"]
+
+    write_doc(vault, "skills", "writer", "SKILL.md", "name: Writer\n")
+
+    assert graph.broken_references() == []
+    assert [r['source']['id'] for r in graph.used_by(DocSection.SKILLS, "writer")] == ["release"]
+
+
+def test_doc_edited_outside_the_service(vault, graph):
+    write_doc(vault, "workflows", "release", "WORKFLOW.md", "name: Release\nskills:\n  - copy-editor\n")
+
+    assert [r['ref'] for r in graph.depends_on(DocSection.WORKFLOWS, "release")] == ["copy-editor"]
+
+
+def test_doc_removed_outside_the_service(vault, graph):
+    shutil.rmtree(vault / "workflows" / "release")
+
+    assert graph.node(DocSection.WORKFLOWS, "release") is None
+    assert graph.broken_references() == []
@@ -0,0 +1,43 @@
+"""Workflow ID allocation: distinct IDs, also around imported directories"""
+from app.models.workflow_model import WorkflowIdAllocator
+
+DAY = "20261019"
+
+
+def test_allocates_sequential_ids(tmp_path):
+    allocator = WorkflowIdAllocator(tmp_path)
+
+    first, first_dir = allocator.allocate("release", day=DAY)
+    second, _ = allocator.allocate("release", day=DAY)
+
+    assert (first, second) == (f"workflow_{DAY}_001", f"workflow_{DAY}_002")
+    assert first_dir == tmp_path / f"workflow_{DAY}_001_release"
+    assert first_dir.is_dir()
+
+
+def test_seeds_from_existing_directories(tmp_path):
+    (tmp_path / f"workflow_{DAY}_007_old").mkdir()
+
+    workflow_id, _ = WorkflowIdAllocator(tmp_path).allocate("new", day=DAY)
+    assert workflow_id == f"workflow_{DAY}_008"
+
+
+def test_skips_ids_taken_by_imported_directories(tmp_path):
+    allocator = WorkflowIdAllocator(tmp_path)
+    allocator.allocate("release", day=DAY)
+
+    # Imported after the counter exists, under a different slug
+    (tmp_path / f"workflow_{DAY}_002_imported").mkdir()
+
+    workflow_id, workflow_dir = allocator.allocate("release", day=DAY)
+    assert workflow_id == f"workflow_{DAY}_003"
+    assert workflow_dir.name == f"workflow_{DAY}_003_release"
+
+
+def test_longer_numbers_do_not_block_shorter_ones(tmp_path):
+    allocator = WorkflowIdAllocator(tmp_path)
+    allocator.allocate("release", day=DAY)
+    (tmp_path / f"workflow_{DAY}_0021_imported").mkdir()
+
+    workflow_id, _ = allocator.allocate("release", day=DAY)
+    assert workflow_id == f"workflow_{DAY}_002"
@@ -0,0 +1,103 @@
+"""Session store backends: memory, and Redis via an in-process fakeredis server"""
+import asyncio
+
+from fakeredis import FakeServer, aioredis as fake_aioredis
+import pytest
+
+from app.core.session_store import MemorySessionStore, RedisSessionStore, SessionStore
+
+TTL_SECONDS = 1
+
+
+@pytest.fixture
+def redis_server():
+    return FakeServer()
+
+
+def redis_store(server, ttl_seconds: int = TTL_SECONDS) -> RedisSessionStore:
+    """A store with its own client, like a separate worker"""
+    return RedisSessionStore(fake_aioredis.FakeRedis(server=server), ttl_seconds, prefix="test:")
+
+
+@pytest.fixture(params=["memory", "redis"])
+def store(request, redis_server):
+    if request.param == "memory":
+        return MemorySessionStore(TTL_SECONDS, max_sessions=10)
+    return redis_store(redis_server)
+
+
+@pytest.mark.asyncio
+async def test_get_missing(store):
+    assert await store.get("nope") is None
+
+
+@pytest.mark.asyncio
+async def test_set_get(store):
+    await store.set("s1", b"state")
+    assert await store.get("s1") == b"state"
+
+    await store.set("s1", b"newer")
+    assert await store.get("s1") == b"newer"
+
+
+@pytest.mark.asyncio
+async def test_delete(store):
+    await store.set("s1", b"state")
+
+    assert await store.delete("s1") is True
+    assert await store.get("s1") is None
+    assert await store.delete("s1") is False
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(store):
+    await store.set("s1", b"state")
+    await asyncio.sleep(TTL_SECONDS + 0.2)
+    assert await store.get("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_set_refreshes_expiry(store):
+    await store.set("s1", b"state")
+    await asyncio.sleep(TTL_SECONDS * 0.6)
+    await store.set("s1", b"state")
+    await asyncio.sleep(TTL_SECONDS * 0.6)
+    assert await store.get("s1") == b"state"
+
+
+@pytest.mark.asyncio
+async def test_memory_store_is_bounded():
+    store = MemorySessionStore(60, max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        await store.set(session_id, session_id.encode())
+
+    assert await store.get("a") is None
+    assert await store.get("c") == b"c"
+
+
+@pytest.mark.asyncio
+async def test_redis_resume_across_instances(redis_server):
+    first, second = redis_store(redis_server), redis_store(redis_server)
+
+    await first.set("s1", b"state")
+    assert await second.get("s1") == b"state"
+
+    await second.set("s1", b"resumed")
+    assert await first.get("s1") == b"resumed"
+
+    assert await second.delete("s1") is True
+    assert await first.get("s1") is None
+
+
+@pytest.mark.asyncio
+async def test_redis_key_carries_ttl(redis_server):
+    client = fake_aioredis.FakeRedis(server=redis_server)
+    store = RedisSessionStore(client, 60, prefix="test:")
+
+    await store.set("s1", b"state")
+    assert 0 < await client.ttl("test:s1") <= 60
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        SessionStore()
@@ -0,0 +1,40 @@
+-- Migration 007: Create course generation job tables
+-- Date: 2026-10-19
+-- Purpose: Persist background course generation jobs and their per-stage
+--          checkpoints (outline, each module, synthesis) so generation can
+--          resume after a crash or restart without re-running model calls
+
+CREATE TABLE IF NOT EXISTS course_generation_jobs (
+  job_id VARCHAR(64) PRIMARY KEY,
+  course_id VARCHAR(64) NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'queued',
+  stage VARCHAR(20) NOT NULL DEFAULT 'outline',
+  request JSONB NOT NULL,
+  outline JSONB,
+  synthesis JSONB,
+  modules_total INTEGER,
+  modules_completed INTEGER NOT NULL DEFAULT 0,
+  error TEXT,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  worker_id VARCHAR(255),
+  heartbeat_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  completed_at TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS course_generation_job_modules (
+  job_id VARCHAR(64) NOT NULL REFERENCES course_generation_jobs(job_id) ON DELETE CASCADE,
+  module_index INTEGER NOT NULL,
+  module JSONB NOT NULL,
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (job_id, module_index)
+);
+
+-- Workers look up queued jobs and running jobs with stale heartbeats on startup
+CREATE INDEX IF NOT EXISTS idx_course_generation_jobs_status_heartbeat
+ON course_generation_jobs(status, heartbeat_at);
+
+COMMENT ON TABLE course_generation_jobs IS 'Background course generation jobs; status is queued, running, completed or failed';
+COMMENT ON COLUMN course_generation_jobs.heartbeat_at IS 'Lease refreshed by the owning worker; running jobs with a stale heartbeat are reclaimed';
+COMMENT ON TABLE course_generation_job_modules IS 'Checkpointed modules of a generation job, one row per finished module';
@@ -0,0 +1,16 @@
+-- Migration 008: Unique index on courses.course_id
+-- Date: 2026-10-19
+-- Purpose: Allow CourseRepository.save_course to upsert with
+--          INSERT ... ON CONFLICT (course_id) DO UPDATE in one round trip
+--          instead of SELECT-then-INSERT/UPDATE
+
+-- Remove accidental duplicates first, keeping the most recent row per course_id
+DELETE FROM courses c
+USING courses newer
+WHERE c.course_id = newer.course_id
+  AND c.id < newer.id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_courses_course_id_unique
+ON courses(course_id);
+
+COMMENT ON INDEX idx_courses_course_id_unique IS 'Conflict target for course upserts';
@@ -0,0 +1,23 @@
+-- Migration 009: Denormalized summary columns on courses
+-- Date: 2026-10-19
+-- Purpose: Let course list/search return lightweight card summaries without
+--          reading the full modules JSON; module_count and uses_bedrock are
+--          maintained by CourseRepository.save_course
+
+ALTER TABLE courses
+  ADD COLUMN IF NOT EXISTS module_count INTEGER NOT NULL DEFAULT 0;
+
+ALTER TABLE courses
+  ADD COLUMN IF NOT EXISTS uses_bedrock BOOLEAN NOT NULL DEFAULT FALSE;
+
+-- Backfill from the existing JSON bodies
+UPDATE courses
+SET module_count = COALESCE(jsonb_array_length(modules::jsonb), 0),
+    uses_bedrock = COALESCE((course_metadata::jsonb ->> 'uses_bedrock')::boolean, FALSE);
+
+-- Catalog listing: newest Bedrock courses first
+CREATE INDEX IF NOT EXISTS idx_courses_uses_bedrock_created_at
+ON courses(uses_bedrock, created_at DESC);
+
+COMMENT ON COLUMN courses.module_count IS 'Number of modules in the course (denormalized from modules)';
+COMMENT ON COLUMN courses.uses_bedrock IS 'Generated by the Bedrock generator (denormalized from course_metadata.uses_bedrock)';
@@ -0,0 +1,50 @@
+-- Migration 010: Full-text search vector for courses
+-- Date: 2026-10-19
+-- Purpose: Replace ILIKE scans in CourseRepository.search_courses with a
+--          weighted tsvector over title (A), description and tags (B) and
+--          module titles (C), kept current by a trigger and GIN-indexed
+
+CREATE OR REPLACE FUNCTION courses_search_vector(
+  p_title TEXT,
+  p_description TEXT,
+  p_tags JSONB,
+  p_modules JSONB
+) RETURNS tsvector AS $$
+  SELECT
+    setweight(to_tsvector('english', COALESCE(p_title, '')), 'A') ||
+    setweight(to_tsvector('english', COALESCE(p_description, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(
+      CASE WHEN jsonb_typeof(p_tags) = 'array' THEN
+        (SELECT string_agg(tag, ' ') FROM jsonb_array_elements_text(p_tags) AS tag)
+      END, '')), 'B') ||
+    setweight(to_tsvector('english', COALESCE(
+      CASE WHEN jsonb_typeof(p_modules) = 'array' THEN
+        (SELECT string_agg(module ->> 'title', ' ') FROM jsonb_array_elements(p_modules) AS module)
+      END, '')), 'C')
+$$ LANGUAGE sql IMMUTABLE;
+
+ALTER TABLE courses
+  ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION courses_search_vector_update() RETURNS trigger AS $$
+BEGIN
+  NEW.search_vector := courses_search_vector(
+    NEW.title, NEW.description, NEW.tags::jsonb, NEW.modules::jsonb
+  );
+  RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_courses_search_vector ON courses;
+CREATE TRIGGER trg_courses_search_vector
+  BEFORE INSERT OR UPDATE OF title, description, tags, modules ON courses
+  FOR EACH ROW EXECUTE FUNCTION courses_search_vector_update();
+
+-- Backfill existing rows
+UPDATE courses
+SET search_vector = courses_search_vector(title, description, tags::jsonb, modules::jsonb);
+
+CREATE INDEX IF NOT EXISTS idx_courses_search_vector
+ON courses USING GIN (search_vector);
+
+COMMENT ON COLUMN courses.search_vector IS 'Weighted full-text vector (title, description, tags, module titles); maintained by trg_courses_search_vector';
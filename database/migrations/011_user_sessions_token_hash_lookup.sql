@@ -0,0 +1,22 @@
+-- Migration 011: Indexed HMAC lookup for user sessions
+-- Date: 2026-10-19
+-- Purpose: Session tokens are now stored as an HMAC-SHA256 hex digest
+--          instead of a bcrypt hash, so a session can be found with one
+--          indexed equality query and revoked in O(1)
+
+-- bcrypt-hashed sessions can never be looked up again; drop them
+DELETE FROM user_sessions
+WHERE token_hash LIKE '$2%';
+
+-- Make sure the column fits a 64-char hex digest
+ALTER TABLE user_sessions
+  ALTER COLUMN token_hash TYPE VARCHAR(128);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_sessions_token_hash
+ON user_sessions(token_hash);
+
+-- Used by cleanup_expired_sessions
+CREATE INDEX IF NOT EXISTS idx_user_sessions_expires_at
+ON user_sessions(expires_at);
+
+COMMENT ON COLUMN user_sessions.token_hash IS 'HMAC-SHA256 (hex) of the session JWT, keyed with SECRET_KEY';
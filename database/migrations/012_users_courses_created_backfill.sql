@@ -0,0 +1,16 @@
+-- Migration 012: Reconcile users.courses_created counter
+-- Date: 2026-10-19
+-- Purpose: get_user_by_token now reads the maintained courses_created
+--          counter instead of aggregating user_courses per request; bring the
+--          counter in line with the actual rows once
+
+UPDATE users u
+SET courses_created = counts.total
+FROM (
+  SELECT u2.user_id, COUNT(uc.course_id) AS total
+  FROM users u2
+  LEFT JOIN user_courses uc ON uc.user_id = u2.user_id
+  GROUP BY u2.user_id
+) counts
+WHERE u.user_id = counts.user_id
+  AND u.courses_created IS DISTINCT FROM counts.total;
@@ -0,0 +1,8 @@
+-- Migration 013: Prefix index for username allocation
+-- Date: 2026-10-19
+-- Purpose: Registration picks a free username with a single
+--          "username LIKE 'base%'" query; text_pattern_ops lets that prefix
+--          match use an index regardless of the database collation
+
+CREATE INDEX IF NOT EXISTS idx_users_username_pattern
+ON users(username text_pattern_ops);
@@ -0,0 +1,28 @@
+-- Migration 014: Per-user enrollment counters
+-- Date: 2026-10-19
+-- Purpose: The dashboard counted a user's course_enrollments on every load.
+--          CourseRepository now maintains these counters in the same
+--          statement/transaction as each enrollment and progress write, so a
+--          dashboard read (GET /enrollments/stats) is a primary-key lookup.
+--          Courses created stay on users.courses_created (migration 012)
+
+CREATE TABLE IF NOT EXISTS user_dashboard_stats (
+  user_email VARCHAR(255) PRIMARY KEY,
+  total_enrollments INTEGER NOT NULL DEFAULT 0,
+  courses_completed INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Backfill from existing enrollments
+INSERT INTO user_dashboard_stats (user_email, total_enrollments, courses_completed)
+SELECT user_email,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE completion_status = 'completed')
+FROM course_enrollments
+GROUP BY user_email
+ON CONFLICT (user_email) DO UPDATE SET
+  total_enrollments = EXCLUDED.total_enrollments,
+  courses_completed = EXCLUDED.courses_completed,
+  updated_at = NOW();
+
+COMMENT ON TABLE user_dashboard_stats IS 'Enrollment counters per user, maintained by CourseRepository.enroll_user, update_user_progress and bulk_update_progress';
@@ -1,4 +1,5 @@
 import express from 'express'
+import fs from 'fs'
 import path from 'path'
 import { fileURLToPath } from 'url'
 
@@ -8,8 +9,39 @@ const __dirname = path.dirname(__filename)
 const app = express()
 const PORT = process.env.PORT || 3000
 
+const FINGERPRINTED_MANIFEST = /\/(manifest\.[0-9a-f]{12}|_index\/index\.[0-9a-f]{12}|_index\/shards\/[0-9a-f]{12})\.json$/
+
+// Content manifests and index shards: serve the precompressed .br/.gz sibling written by the
+// docs sync when the client accepts it
+app.get(/^\/content\/.+\/(manifest(\.[0-9a-f]{12}|\.latest)?|_index\/index\.[0-9a-f]{12}|_index\/shards\/[0-9a-f]{12})\.json$/, (req, res, next) => {
+  const accepted = req.headers['accept-encoding'] || ''
+  const dist = path.join(__dirname, 'dist')
+  const file = path.join(dist, path.normalize(req.path))
+  if (!file.startsWith(dist + path.sep)) return next()
+
+  for (const [encoding, ext] of [['br', '.br'], ['gzip', '.gz']]) {
+    if (!accepted.includes(encoding) || !fs.existsSync(file + ext)) continue
+    res.set({
+      'Content-Type': 'application/json; charset=utf-8',
+      'Content-Encoding': encoding,
+      'Vary': 'Accept-Encoding',
+      'Cache-Control': FINGERPRINTED_MANIFEST.test(req.path)
+        ? 'public, max-age=31536000, immutable'
+        : 'no-cache'
+    })
+    return res.sendFile(file + ext)
+  }
+  next()
+})
+
 // Serve static files from the React app
-app.use(express.static(path.join(__dirname, 'dist')))
+app.use(express.static(path.join(__dirname, 'dist'), {
+  setHeaders: (res, filePath) => {
+    if (FINGERPRINTED_MANIFEST.test(filePath)) {
+      res.setHeader('Cache-Control', 'public, max-age=31536000, immutable')
+    }
+  }
+}))
 
 // The "catchall" handler: for any request that doesn't
 // match one above, send back React's index.html file.
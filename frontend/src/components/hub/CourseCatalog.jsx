@@ -408,10 +408,9 @@ export default function CourseCatalog({
   const fetchSection = async (section) => {
     try {
       setLoading(true);
-      const data = await docsService.listSection(section);
 
       // Transform from docs format to display format
-      const transformedItems = (data.items || []).map(item => ({
+      const transform = (items) => items.map(item => ({
         course_id: item.id,
         title: item.name,
         description: item.description || '',
@@ -425,6 +424,13 @@ export default function CourseCatalog({
         status: item.status || 'active'
       }));
 
+      // Show the newest page as soon as it arrives, then the whole section
+      const data = await docsService.listSectionPaged(section, (firstPage) => {
+        setCourses(transform(firstPage.items));
+        setLoading(false);
+      });
+      const transformedItems = transform(data.items || []);
+
       setCourses(transformedItems);
       console.log(`Loaded ${section} via docs-service:`, transformedItems.length);
     } catch (err) {
@@ -440,10 +446,9 @@ export default function CourseCatalog({
   const fetchWorkflows = async () => {
     try {
       setLoading(true);
-      const data = await docsService.listSection('workflows');
 
       // Transform from docs format to workflow format
-      const transformedWorkflows = (data.items || []).map(item => ({
+      const transform = (items) => items.map(item => ({
         course_id: item.id,
         title: item.name,
         description: item.description || '',
@@ -457,6 +462,13 @@ export default function CourseCatalog({
         status: item.status || 'active'
       }));
 
+      // Show the newest page as soon as it arrives, then the whole section
+      const data = await docsService.listSectionPaged('workflows', (firstPage) => {
+        setCourses(transform(firstPage.items));
+        setLoading(false);
+      });
+      const transformedWorkflows = transform(data.items || []);
+
       setCourses(transformedWorkflows);
       console.log('Loaded workflows via docs-service:', transformedWorkflows.length);
     } catch (err) {
@@ -1289,15 +1289,16 @@ function Docs() {
     loadOverviewFiles()
   }, [])
 
-  // Load manifest files on mount to get available entries
+  // Load manifest files on mount to get available entries (the first shard
+  // of each section shows while the rest load)
   useEffect(() => {
     const loadManifests = async () => {
       try {
         const [workflowsData, skillsData, mcpData, subagentsData] = await Promise.all([
-          docsService.listSection('workflows'),
-          docsService.listSection('skills'),
-          docsService.listSection('mcp'),
-          docsService.listSection('subagents')
+          docsService.listSectionPaged('workflows', page => setAvailableWorkflows(page.items)),
+          docsService.listSectionPaged('skills', page => setAvailableSkills(page.items)),
+          docsService.listSectionPaged('mcp', page => setAvailableMcp(page.items)),
+          docsService.listSectionPaged('subagents', page => setAvailableSubagents(page.items))
         ])
 
         setAvailableWorkflows(workflowsData.items || [])
@@ -1602,8 +1603,17 @@ function Docs() {
     }
 
     entry = availableList.find(e => e.id === entryId)
-    if (!entry) return
+    if (!entry) {
+      // Not in the shards loaded so far; fetch just this entry's metadata
+      docsService.getEntrySummary(section, entryId)
+        .then(summary => selectEntry(section, entryId, summary))
+        .catch(err => console.warn(`Entry not found: ${section}/${entryId}`, err))
+      return
+    }
+    selectEntry(section, entryId, entry)
+  }
 
+  const selectEntry = (section, entryId, entry) => {
     // Replace selected entry with new selection (only one at a time)
     switch (section) {
       case 'workflows':
@@ -1703,12 +1713,12 @@ function Docs() {
       setMcpOverview(mcpRes)
       setSubagentsOverview(subagentsRes)
 
-      // Reload manifests via docsService (with static fallback built-in)
+      // Reload manifests via docsService (sharded index, listSection fallback)
       const [workflowsData, skillsData, mcpData, subagentsData] = await Promise.all([
-        docsService.listSection('workflows'),
-        docsService.listSection('skills'),
-        docsService.listSection('mcp'),
-        docsService.listSection('subagents')
+        docsService.listSectionPaged('workflows'),
+        docsService.listSectionPaged('skills'),
+        docsService.listSectionPaged('mcp'),
+        docsService.listSectionPaged('subagents')
       ])
 
       setAvailableWorkflows(workflowsData.items || [])
@@ -11,6 +11,7 @@ class DocsService {
   constructor() {
     this.baseUrl = `${API_BASE}/docs`;
     this.useApi = true; // Can be toggled for static fallback
+    this._indexes = {}; // Parsed sharded indexes, keyed by fingerprinted path
   }
 
   // ================================================================
@@ -214,11 +215,106 @@ class DocsService {
   // Static Fallbacks (for when API is unavailable)
   // ================================================================
 
+  /**
+   * Fetch a section manifest. The small pointer file is revalidated on every
+   * call; the fingerprinted manifest it names never changes, so the browser
+   * cache serves it on repeat visits. Falls back to manifest.json.
+   */
+  async _fetchManifest(section) {
+    try {
+      const pointer = await fetch(`/content/${section}/manifest.latest.json`, { cache: 'no-cache' });
+      if (pointer.ok) {
+        const { manifest } = await pointer.json();
+        const response = await fetch(`/content/${section}/${manifest}`);
+        if (response.ok) return await response.json();
+      }
+    } catch (error) {
+      // Older deployments have no pointer file
+    }
+
+    const response = await fetch(`/content/${section}/manifest.json`, { cache: 'no-cache' });
+    if (!response.ok) throw new Error('Manifest not found');
+    return await response.json();
+  }
+
+  /**
+   * One page of a section from the static sharded index, newest first.
+   * Loads only the pointer, the (cached) index and one shard, so the first
+   * page costs the same however large the section is.
+   * @param {string} section
+   * @param {{page?: number, tag?: string}} [options]
+   * @returns {Promise<{section: string, count: number, page: number, pages: number, items: Array}>}
+   */
+  async listSectionPage(section, { page = 0, tag = null } = {}) {
+    const index = await this._fetchIndex(section);
+    const listing = tag ? (index.tags[tag] || { count: 0, pages: [] }) : index;
+    const shard = listing.pages[page];
+
+    let items = [];
+    if (shard) {
+      const response = await fetch(`/content/${section}/_index/${shard}`);
+      if (!response.ok) throw new Error(`Shard not found: ${section}/${shard}`);
+      items = (await response.json()).entries || [];
+    }
+    return { section, count: listing.count, page, pages: listing.pages.length, items };
+  }
+
+  /**
+   * Full metadata for one entry from its static detail file.
+   * @param {string} section
+   * @param {string} docId
+   * @returns {Promise<Object>}
+   */
+  async getEntrySummary(section, docId) {
+    const response = await fetch(`/content/${section}/_index/entries/${docId}.json`, { cache: 'no-cache' });
+    if (!response.ok) throw new Error(`Document not found: ${section}/${docId}`);
+    return await response.json();
+  }
+
+  /**
+   * Whole section from the static sharded index, newest first. onFirstPage
+   * gets the first shard as soon as it arrives so lists can render before
+   * the remaining shards load. Falls back to listSection() when the
+   * deployment has no index.
+   * @param {string} section
+   * @param {(page: {section: string, count: number, items: Array}) => void} [onFirstPage]
+   * @returns {Promise<{section: string, count: number, items: Array}>}
+   */
+  async listSectionPaged(section, onFirstPage = () => {}) {
+    let first;
+    try {
+      first = await this.listSectionPage(section);
+    } catch (error) {
+      return this.listSection(section);
+    }
+    onFirstPage(first);
+
+    const rest = await Promise.all(
+      Array.from({ length: Math.max(first.pages - 1, 0) }, (_, i) =>
+        this.listSectionPage(section, { page: i + 1 })
+      )
+    );
+    const items = first.items.concat(...rest.map(page => page.items));
+    return { section, count: first.count, items };
+  }
+
+  async _fetchIndex(section) {
+    const pointer = await fetch(`/content/${section}/manifest.latest.json`, { cache: 'no-cache' });
+    if (!pointer.ok) throw new Error('Manifest index not found');
+    const { index } = await pointer.json();
+    if (!index) throw new Error('Manifest index not found');
+
+    if (!this._indexes[index]) {
+      const response = await fetch(`/content/${section}/${index}`);
+      if (!response.ok) throw new Error('Manifest index not found');
+      this._indexes[index] = await response.json();
+    }
+    return this._indexes[index];
+  }
+
   async _staticListFallback(section) {
     try {
-      const response = await fetch(`/content/${section}/manifest.json`);
-      if (!response.ok) throw new Error('Manifest not found');
-      const data = await response.json();
+      const data = await this._fetchManifest(section);
       // Handle both {entries: [...]} and [...] formats
       const items = Array.isArray(data) ? data : (data.entries || []);
       return { section, count: items.length, items };
@@ -1,150 +1,64 @@
 #!/usr/bin/env python3
 """
-Sync workflows from vault-web to frontend/public/content/workflows
-and regenerate manifest.json
-"""
-
-import os
-import json
-import shutil
-from pathlib import Path
-from datetime import datetime
-
-
-def parse_frontmatter(content):
-    """Extract frontmatter from markdown file"""
-    if not content.startswith('---'):
-        return {}, content
-
-    try:
-        # Split on the second ---
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            return {}, content
-
-        frontmatter_text = parts[1].strip()
-        content_text = parts[2].strip()
+Sync workflows from the vault to frontend/public/content/workflows
+and regenerate the manifest artifacts.
 
-        # Parse YAML frontmatter
-        frontmatter = {}
-        current_key = None
-        current_list = []
+Runs the backend's incremental DocsService sync, so only changed workflows
+are copied and the manifest is written minified, precompressed and
+fingerprinted (manifest.<hash>.json + manifest.latest.json pointer).
+Requires the backend dependencies.
 
-        for line in frontmatter_text.split('\n'):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Check for list item
-            if line.startswith('- '):
-                if current_key:
-                    value = line[2:].strip().strip('"').strip("'")
-                    current_list.append(value)
-                continue
-
-            # Check for key: value
-            if ':' in line:
-                # Save previous list if exists
-                if current_key and current_list:
-                    frontmatter[current_key] = current_list
-                    current_list = []
-
-                key, value = line.split(':', 1)
-                current_key = key.strip()
-                value = value.strip().strip('"').strip("'")
-
-                if value:
-                    frontmatter[current_key] = value
-                else:
-                    # Start of a list
-                    current_list = []
-
-        # Save last list if exists
-        if current_key and current_list:
-            frontmatter[current_key] = current_list
+Usage:
+    python scripts/sync_workflows.py [--dry-run]
+"""
 
-        return frontmatter, content_text
+import argparse
+import sys
+from pathlib import Path
 
-    except Exception as e:
-        print(f"Error parsing frontmatter: {e}")
-        return {}, content
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root / 'backend'))
 
+from app.models.docs_model import DocSection, DocsService  # noqa: E402
 
-def sync_workflows():
-    """Sync workflows from vault-web to frontend/public/content"""
 
-    # Get project root
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
+def sync_workflows(dry_run=False):
+    """Sync workflows from the vault to frontend/public/content"""
 
-    source_dir = project_root / 'vault-web' / 'workflows'
-    target_dir = project_root / 'frontend' / 'public' / 'content' / 'workflows'
+    source_root = project_root / 'vault-web-v2'
+    if not source_root.exists():
+        source_root = project_root / 'vault-web'
 
-    if not source_dir.exists():
-        print(f"Source directory not found: {source_dir}")
+    if not (source_root / 'workflows').exists():
+        print(f"Source directory not found: {source_root / 'workflows'}")
         return
 
-    # Create target directory if it doesn't exist
-    target_dir.mkdir(parents=True, exist_ok=True)
-
-    # Collect workflow metadata
-    entries = []
-
-    # Iterate through workflow directories
-    for workflow_dir in sorted(source_dir.glob('workflow_*')):
-        if not workflow_dir.is_dir():
-            continue
-
-        workflow_id = workflow_dir.name
-        workflow_file = workflow_dir / 'WORKFLOW.md'
-
-        if not workflow_file.exists():
-            print(f"Warning: No WORKFLOW.md in {workflow_id}")
-            continue
-
-        # Read workflow file
-        with open(workflow_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Parse frontmatter
-        frontmatter, _ = parse_frontmatter(content)
-
-        # Extract metadata
-        entry = {
-            'id': frontmatter.get('workflow_id', workflow_id),
-            'name': frontmatter.get('name', workflow_id.replace('_', ' ').title()),
-            'description': frontmatter.get('description', ''),
-            'category': frontmatter.get('category', 'workflow'),
-            'tags': frontmatter.get('tags', []),
-            'difficulty': frontmatter.get('difficulty', 'intermediate')
-        }
-
-        # Ensure tags is a list
-        if isinstance(entry['tags'], str):
-            entry['tags'] = [tag.strip() for tag in entry['tags'].split(',') if tag.strip()]
-
-        entries.append(entry)
-
-        # Copy workflow directory to target
-        target_workflow_dir = target_dir / workflow_id
-        if target_workflow_dir.exists():
-            shutil.rmtree(target_workflow_dir)
-        shutil.copytree(workflow_dir, target_workflow_dir)
-
-        print(f"✓ Synced: {workflow_id}")
-
-    # Write manifest.json
-    manifest = {'entries': entries}
-    manifest_path = target_dir / 'manifest.json'
+    service = DocsService(
+        vault_path=str(source_root),
+        public_path=str(project_root / 'frontend' / 'public' / 'content')
+    )
+    result = service.sync_section(DocSection.WORKFLOWS, dry_run=dry_run)
 
-    with open(manifest_path, 'w', encoding='utf-8') as f:
-        json.dump(manifest, f, indent=2)
+    verb = "Would sync" if dry_run else "Synced"
+    for label in result.added:
+        print(f"+ {label}")
+    for label in result.updated:
+        print(f"~ {label}")
+    for label in result.removed:
+        print(f"- {label}")
+    for error in result.errors:
+        print(f"Error: {error}")
 
-    print(f"\n✓ Synced {len(entries)} workflows")
-    print(f"✓ Updated manifest: {manifest_path}")
+    print(f"\n✓ {verb} {len(result.added) + len(result.updated)} workflows "
+          f"({result.files_processed} files, {len(result.removed)} removed)")
+    if result.manifest_updated:
+        print("✓ Manifest would change" if dry_run else "✓ Updated manifest")
 
-    return entries
+    return result
 
 
 if __name__ == '__main__':
-    sync_workflows()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--dry-run', action='store_true', help='Only report what would change')
+    args = parser.parse_args()
+    sync_workflows(dry_run=args.dry_run)
@@ -246,11 +246,31 @@ class DocsService {
   // Static Fallbacks (for when API is unavailable)
   // ================================================================
 
+  /**
+   * Fetch a section manifest. The small pointer file is revalidated on every
+   * call; the fingerprinted manifest it names never changes, so the browser
+   * cache serves it on repeat visits. Falls back to manifest.json.
+   */
+  async _fetchManifest(section) {
+    try {
+      const pointer = await fetch(`/content/${section}/manifest.latest.json`, { cache: 'no-cache' });
+      if (pointer.ok) {
+        const { manifest } = await pointer.json();
+        const response = await fetch(`/content/${section}/${manifest}`);
+        if (response.ok) return await response.json();
+      }
+    } catch (error) {
+      // Older deployments have no pointer file
+    }
+
+    const response = await fetch(`/content/${section}/manifest.json`, { cache: 'no-cache' });
+    if (!response.ok) throw new Error('Manifest not found');
+    return await response.json();
+  }
+
   async _staticListFallback(section) {
     try {
-      const response = await fetch(`/content/${section}/manifest.json`);
-      if (!response.ok) throw new Error('Manifest not found');
-      const data = await response.json();
+      const data = await this._fetchManifest(section);
       // Handle both {entries: [...]} and [...] formats
       const items = Array.isArray(data) ? data : (data.entries || []);
       return { section, count: items.length, items };
@@ -14,6 +14,8 @@ class WorkflowService {
     // Convert HTTP URL to WebSocket URL
     this.wsUrl = this.apiUrl.replace(/^http/, 'ws');
     this.wsBaseUrl = `${this.wsUrl}/api/v1/workflow/ws`;
+    // Per-client session id so conversations never collide across users
+    this.sessionId = crypto.randomUUID();
   }
 
   /**
@@ -74,11 +76,11 @@ class WorkflowService {
    * @param {string} params.workflowType - 'navigate', 'educate', or 'deploy'
    * @param {string} params.taskDescription - What you want to accomplish
    * @param {string} params.context - Optional context/constraints
-   * @param {string} params.sessionId - Session identifier (default: 'default')
+   * @param {string} params.sessionId - Session identifier (default: this client's session)
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async discover({ workflowType, taskDescription, context, sessionId = 'default' }, onEvent) {
+  async discover({ workflowType, taskDescription, context, sessionId = this.sessionId }, onEvent) {
     const response = await fetch(`${this.baseUrl}/discover?session_id=${sessionId}`, {
       method: 'POST',
       headers: {
@@ -107,7 +109,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async generateOutline({ answers, sessionId = 'default' }, onEvent) {
+  async generateOutline({ answers, sessionId = this.sessionId }, onEvent) {
     const response = await fetch(`${this.baseUrl}/generate-outline?session_id=${sessionId}`, {
       method: 'POST',
       headers: {
@@ -134,7 +136,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async refine({ message, sessionId = 'default' }, onEvent) {
+  async refine({ message, sessionId = this.sessionId }, onEvent) {
     const response = await fetch(`${this.baseUrl}/refine?session_id=${sessionId}`, {
       method: 'POST',
       headers: {
@@ -160,7 +162,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async finalize({ sessionId = 'default' }, onEvent) {
+  async finalize({ sessionId = this.sessionId }, onEvent) {
     const response = await fetch(`${this.baseUrl}/finalize?session_id=${sessionId}`, {
       method: 'POST',
       headers: {
@@ -181,7 +183,7 @@ class WorkflowService {
    * @param {string} sessionId - Session identifier
    * @returns {Promise<Object>} Session status
    */
-  async getSessionStatus(sessionId = 'default') {
+  async getSessionStatus(sessionId = this.sessionId) {
     const response = await fetch(`${this.baseUrl}/session/${sessionId}`, {
       method: 'GET',
       headers: {
@@ -202,7 +204,7 @@ class WorkflowService {
    * @param {string} sessionId - Session identifier
    * @returns {Promise<Object>} Deletion confirmation
    */
-  async deleteSession(sessionId = 'default') {
+  async deleteSession(sessionId = this.sessionId) {
     const response = await fetch(`${this.baseUrl}/session/${sessionId}`, {
       method: 'DELETE',
       headers: {
@@ -293,7 +295,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async discoverWebSocket({ workflowType, taskDescription, context, sessionId = 'default' }, onEvent) {
+  async discoverWebSocket({ workflowType, taskDescription, context, sessionId = this.sessionId }, onEvent) {
     const promise = this._createWebSocket(
       `discover/${sessionId}`,
       onEvent,
@@ -316,7 +318,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async generateOutlineWebSocket({ answers, sessionId = 'default' }, onEvent) {
+  async generateOutlineWebSocket({ answers, sessionId = this.sessionId }, onEvent) {
     const promise = this._createWebSocket(
       `generate-outline/${sessionId}`,
       onEvent,
@@ -334,7 +336,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async refineWebSocket({ message, sessionId = 'default' }, onEvent) {
+  async refineWebSocket({ message, sessionId = this.sessionId }, onEvent) {
     const promise = this._createWebSocket(
       `refine/${sessionId}`,
       onEvent,
@@ -352,7 +354,7 @@ class WorkflowService {
    * @param {Function} onEvent - Callback for each event
    * @returns {Promise<void>}
    */
-  async finalizeWebSocket({ sessionId = 'default' }, onEvent) {
+  async finalizeWebSocket({ sessionId = this.sessionId }, onEvent) {
     const promise = this._createWebSocket(
       `finalize/${sessionId}`,
       onEvent,